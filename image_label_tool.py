@@ -1,17 +1,29 @@
 import os
 import csv
+import json
+import hashlib
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from PIL import Image, ImageTk
 from datetime import datetime
 import re
 import random
+import socket
+import getpass
+import struct
+import sys
 import threading
 import time
 import cv2
 import numpy as np
 import logging
 import multiprocessing
+import queue
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
 
 # Application version
 VERSION = "3.0.1"
@@ -33,8 +45,2178 @@ except ImportError:
     FigureCanvasTkAgg = None
     sns = None
 
+# Optional SQLite label store (Python builds without _sqlite3 fall back to CSV only)
+HAS_SQLITE = False
+try:
+    import sqlite3
+    HAS_SQLITE = True
+except ImportError:
+    sqlite3 = None
+
+# Optional Parquet output of the data export (JSON Lines is always written)
+HAS_PYARROW = False
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    pa = None
+    pq = None
+
 LABELS = ["(Unclassified)", "no label", "read failure", "incomplete", "unreadable"]
 
+# Number of images decoded ahead of navigation in each direction
+PREFETCH_RADIUS = 2
+
+# Histogram equalization modes offered in the toolbar -> internal mode names
+# (CLAHE on the L channel of LAB keeps colours; gray suits monochrome cameras)
+HIST_EQ_MODES = {"Color": "lab", "Mono": "gray"}
+
+# Edge length (in display pixels) of the tiles used for 1:1 and zoomed views
+TILE_SIZE = 256
+
+# Maximum number of rendered tiles kept alive (all zoom levels of the current image)
+TILE_CACHE_LIMIT = 160
+# Hidden full-size tiles kept for reuse (PhotoImage.paste) instead of being deleted
+TILE_POOL_LIMIT = 32
+# Quiet period after the last zoom/resize event before the high-quality render runs
+RENDER_SETTLE_MS = 150
+
+# Memory budget for decoded images and display renditions kept in RAM
+IMAGE_CACHE_BUDGET_BYTES = 512 * 1024 * 1024
+
+# On-disk proxies (downscaled copies) of images on slow network folders, kept locally
+# outside the image folder so they are not synced back to OneDrive/SMB
+PROXY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".image_label_tool", "proxies")
+# Proxy kind -> longest edge in pixels (smallest first)
+PROXY_SIZES = {"thumb": 256, "screen": 1920}
+
+# Persisted per-folder file listings (names, sizes, mtimes and parsed filename fields),
+# refreshed incrementally when a folder is reopened
+FOLDER_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".image_label_tool", "folder_index")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+
+# Label journal: per-action changes are appended to <revision csv>.journal and
+# compacted into the CSV snapshot after this many events / seconds and on close
+JOURNAL_FSYNC_BATCH = 16
+JOURNAL_FSYNC_INTERVAL_MS = 1000
+JOURNAL_COMPACT_EVENTS = 500
+JOURNAL_COMPACT_INTERVAL_S = 300
+# Auto detection workers hand their labels to the Tk thread (and save them) at most this often
+AUTO_DETECT_APPLY_INTERVAL_S = 5
+# How long the first edit of a folder waits for the initial snapshot the journal builds on
+JOURNAL_FIRST_SNAPSHOT_TIMEOUT_S = 5
+
+# SQLite label store kept in the image folder. Used when enabled here or when the
+# folder already has one; the revision CSVs are still written as generated views
+USE_LABEL_STORE = False
+LABEL_STORE_FILENAME = "labels.sqlite"
+
+# Binary copy of each revision CSV (<csv>.bin) for fast reopening; only used while the
+# CSV's modification time and size still match the ones recorded in it
+LABEL_SIDECAR_SUFFIX = ".bin"
+
+# Shared folders labeled from several PCs: each operator appends its changes to
+# labels_<operator>.delta.jsonl in the image folder; the files of the other operators
+# are polled and merged (latest change per field wins). Used when enabled here or
+# when the folder already has delta files
+SHARED_LABELING = False
+DELTA_POLL_MS = 2000
+# Operators whose delta file was touched within this many seconds share the unclassified work
+OPERATOR_ACTIVE_S = 300
+# Delta records this much older than a snapshot are contained in it: they are skipped when
+# merging on top of that snapshot and dropped from the operator's own file once it is written
+DELTA_COMPACT_AGE_S = 300
+
+# The stats CSV is regenerated at most this often after label changes (and on close
+# or explicit export); 0 disables the periodic regeneration
+STATS_CSV_INTERVAL_S = 60
+
+# Recount the images on every counts/progress update and report counter drift (debugging)
+VERIFY_IMAGE_COUNTS = False
+
+# Rows per write (and per Parquet row group) of the data export
+EXPORT_BATCH_ROWS = 10000
+
+# Delays (seconds) between attempts to replace a locked CSV (Excel, OneDrive sync)
+SNAPSHOT_RETRY_DELAYS = (0.5, 1, 2, 5, 10, 30)
+
+# How often (milliseconds) the Tk thread shows the outcome of background CSV writes
+SNAPSHOT_STATUS_POLL_MS = 200
+
+# Number of labeling actions that can be undone (Ctrl+Z)
+UNDO_LIMIT = 200
+
+# Session contact sheet: thumbnail edge length and maximum number of grid columns
+SESSION_SHEET_THUMB_SIZE = 256
+SESSION_SHEET_MAX_COLUMNS = 4
+
+
+class ImageCache:
+    """
+    Thread-safe LRU cache of decoded PIL images and display renditions.
+
+    Entries are keyed by (path, mtime_ns, file_size, *render_params) so a file
+    replaced on disk is never served from a stale entry, and eviction is driven
+    by the estimated pixel memory of the entries rather than their count.
+    File signatures are remembered until refresh_signatures() is called, so
+    revisiting a cached image does not touch the (network) file system at all.
+    An entry may be stored with a parent key (e.g. the pyramid of a decoded
+    image); it is dropped whenever its parent is evicted.
+    """
+
+    def __init__(self, budget_bytes=IMAGE_CACHE_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._children = {}  # parent key -> set of dependent keys
+        self._signatures = {}  # path -> (mtime_ns, size)
+        self._lock = threading.Lock()
+
+    def key(self, path, *render_params):
+        """Build the cache key for a rendition of path."""
+        return (path,) + self.signature(path) + render_params
+
+    def signature(self, path):
+        """Return the remembered (mtime_ns, size) of path, reading it on first use."""
+        signature = self._signatures.get(path)
+        if signature is None:
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            self._signatures[path] = signature
+        return signature
+
+    def refresh_signatures(self):
+        """Forget remembered file signatures so changed files are detected again."""
+        self._signatures.clear()
+
+    def __contains__(self, key):
+        # Membership test only: no hit/miss accounting, no LRU update
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, parent=None):
+        nbytes = self.estimate_nbytes(value)
+        if nbytes > self.budget_bytes:
+            return  # Never let one huge image flush the whole cache
+        with self._lock:
+            if parent is not None:
+                if parent not in self._entries:
+                    return  # Parent already evicted, the child would be orphaned
+                self._children.setdefault(parent, set()).add(key)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.budget_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        """Drop key and its dependent entries (caller holds the lock)."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+        for child in self._children.pop(key, ()):
+            self._remove(child)
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for key, computing it with factory() on a miss."""
+        value = self.get(key)
+        if value is None:
+            # Decode outside the lock so other threads are not blocked
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def evict_path(self, path):
+        """Drop every rendition of path."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self._remove(key)
+        self._signatures.pop(path, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._children.clear()
+            self.current_bytes = 0
+        self._signatures.clear()
+
+    def stats(self):
+        """Return hit/miss counters and memory usage."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'budget_bytes': self.budget_bytes
+            }
+
+    @staticmethod
+    def estimate_nbytes(value):
+        """Estimate the memory held by a cached value."""
+        if isinstance(value, Image.Image):
+            return value.width * value.height * len(value.getbands())
+        if isinstance(value, (tuple, list)):
+            return sum(ImageCache.estimate_nbytes(item) for item in value)
+        return getattr(value, 'nbytes', 64)
+
+
+class ProxyCache:
+    """
+    Persistent on-disk cache of downscaled renditions ("proxies") of a folder's images.
+
+    For every image a thumbnail and a screen-sized copy (PROXY_SIZES) are written to
+    a local per-folder directory, keyed by (relative path, file size, mtime), and
+    recorded in a JSON manifest together with the original image size. Proxies are
+    built on a background thread after a folder is opened; the fitted view reads a
+    proxy instead of the original whenever it is large enough.
+    """
+
+    MANIFEST = "manifest.json"
+    SAVE_EVERY = 50  # Persist the manifest every N built images
+
+    def __init__(self, root_dir=PROXY_CACHE_DIR, sizes=PROXY_SIZES):
+        self.root_dir = root_dir
+        self.sizes = sorted(sizes.items(), key=lambda item: item[1])
+        self.folder = None
+        self.cache_dir = None
+        self._manifest = {}  # relpath -> {"mtime_ns", "size", "original", "proxies"}
+        self._dirty = 0
+        self._lock = threading.Lock()
+        self._generation = 0  # Bumped on open_folder()/cancel() to stop a running build
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="proxy")
+
+    def open_folder(self, folder):
+        """Switch to folder, stopping any build and loading its manifest."""
+        self.cancel()
+        folder = os.path.abspath(folder)
+        digest = hashlib.sha1(os.path.normcase(folder).encode("utf-8")).hexdigest()[:16]
+        with self._lock:
+            self.folder = folder
+            self.cache_dir = os.path.join(self.root_dir, digest)
+            self._dirty = 0
+            try:
+                with open(os.path.join(self.cache_dir, self.MANIFEST), "r", encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                self._manifest = {}
+
+    def lookup(self, path, signature, box):
+        """
+        Return (proxy_path, original_size) for the smallest proxy of path that fits box
+        (canvas width, height) at full quality, or None if there is no usable proxy.
+        signature is the current (mtime_ns, size) of the original file.
+        """
+        with self._lock:
+            entry = self._entry(path)
+            if entry is None or (entry["mtime_ns"], entry["size"]) != tuple(signature):
+                return None
+            original_width, original_height = entry["original"]
+            fit_scale = min(box[0] / original_width, box[1] / original_height, 1.0)
+            needed_width = int(original_width * fit_scale)
+            for kind, _ in self.sizes:
+                proxy = entry["proxies"].get(kind)
+                if proxy and proxy[1] >= needed_width:
+                    return os.path.join(self.cache_dir, proxy[0]), (original_width, original_height)
+        return None
+
+    def proxy_path(self, path, kind):
+        """Return the file of a given proxy kind for path, if one was built."""
+        with self._lock:
+            entry = self._entry(path)
+            proxy = entry["proxies"].get(kind) if entry else None
+            return os.path.join(self.cache_dir, proxy[0]) if proxy else None
+
+    def build(self, paths):
+        """Create missing or stale proxies for paths on the background thread."""
+        with self._lock:
+            generation = self._generation
+        return self._executor.submit(self._build_all, list(paths), generation)
+
+    def cancel(self):
+        with self._lock:
+            self._generation += 1
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.save_manifest()
+
+    def save_manifest(self):
+        """Write the manifest atomically (temp file + rename)."""
+        with self._lock:
+            if not self.cache_dir or not self._dirty:
+                return
+            data = json.dumps(self._manifest)
+            self._dirty = 0
+            cache_dir = self.cache_dir
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            manifest_path = os.path.join(cache_dir, self.MANIFEST)
+            temp_path = manifest_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(temp_path, manifest_path)
+        except OSError as e:
+            print(f"Could not save proxy manifest: {e}")
+
+    def _entry(self, path):
+        if self.folder is None:
+            return None
+        return self._manifest.get(os.path.relpath(os.path.abspath(path), self.folder))
+
+    def _build_all(self, paths, generation):
+        for path in paths:
+            if generation != self._generation:
+                return  # Folder changed or build cancelled
+            try:
+                self._build_one(path, generation)
+            except Exception as e:
+                print(f"Proxy build failed for {os.path.basename(path)}: {e}")
+            if self._dirty >= self.SAVE_EVERY:
+                self.save_manifest()
+        self.save_manifest()
+
+    def _build_one(self, path, generation):
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entry(path)
+            if entry is not None and (entry["mtime_ns"], entry["size"]) == signature:
+                return
+            relpath = os.path.relpath(os.path.abspath(path), self.folder)
+            cache_dir = self.cache_dir
+        stale_files = [proxy[0] for proxy in entry["proxies"].values()] if entry else []
+
+        img = Image.open(path)
+        original_size = img.size
+        largest = self.sizes[-1][1]
+        if img.format == 'JPEG':
+            # Decode at reduced resolution; the screen proxy never needs every pixel
+            img.draft(img.mode, (largest, largest))
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+
+        name = hashlib.sha1(f"{relpath}|{signature[0]}|{signature[1]}".encode("utf-8")).hexdigest()[:20]
+        extension = ".jpg" if img.mode in ("RGB", "L") else ".png"
+        os.makedirs(cache_dir, exist_ok=True)
+        proxies = {}
+        # Largest first, each proxy is scaled down from the previous one
+        for kind, edge in reversed(self.sizes):
+            img.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            filename = f"{name}_{kind}{extension}"
+            temp_path = os.path.join(cache_dir, filename + ".tmp")
+            img.save(temp_path, format="JPEG" if extension == ".jpg" else "PNG", quality=90)
+            os.replace(temp_path, os.path.join(cache_dir, filename))
+            proxies[kind] = [filename, img.width, img.height]
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._manifest[relpath] = {"mtime_ns": signature[0], "size": signature[1],
+                                       "original": list(original_size), "proxies": proxies}
+            self._dirty += 1
+        for filename in stale_files:
+            if filename not in (proxy[0] for proxy in proxies.values()):
+                try:
+                    os.remove(os.path.join(cache_dir, filename))
+                except OSError:
+                    pass
+
+
+class ImageRecordStore:
+    """
+    Per-image label state of one folder, stored by column.
+
+    Each image path is registered once and gets an integer ID; its label is an
+    int8 code into a small table of label names, its OCR readable / False NoRead
+    values are bits of one flag byte, and the trigger ID and session (as an int32
+    code into the interned session IDs) come from describe(path) at registration.
+    Comments are kept in a sparse dict by ID.
+
+    labels, ocr_readable, false_noread and comments are dict-like views keyed by
+    path, so the rest of the tool reads and writes them like the plain dicts they
+    replace. Registration and writes take a lock: worker threads label images too.
+
+    The images of all_image_paths are marked as listed; label and flag counts over
+    them are adjusted on every write, so the counts panels never scan the images.
+    """
+
+    _OCR_SET, _OCR, _FNR_SET, _FNR, _LISTED = 1, 2, 4, 8, 16
+    NO_TRIGGER = -1
+
+    def __init__(self, describe):
+        self.describe = describe  # path -> (session_id, id_number)
+        self.listener = None  # listener(path) after each write (None: everything cleared)
+        self._lock = threading.Lock()
+        self.labels = _LabelColumn(self)
+        self.ocr_readable = _FlagColumn(self, self._OCR_SET, self._OCR)
+        self.false_noread = _FlagColumn(self, self._FNR_SET, self._FNR)
+        self.comments = _CommentColumn(self)
+        self.clear()
+
+    def clear(self):
+        """Forget every image (on folder switch)."""
+        with self._lock:
+            self._ids = {}  # path -> image ID
+            self._paths = []
+            self._label_codes = array("b")  # -1: no label stored
+            self._flags = bytearray()
+            self._triggers = array("q")
+            self._session_codes = array("i")
+            self._session_ids = []
+            self._session_code_of = {}
+            self._comments = {}  # image ID -> comment
+            self._label_names = list(LABELS)
+            self._label_code_of = {name: code for code, name in enumerate(self._label_names)}
+            for column in (self.labels, self.ocr_readable, self.false_noread):
+                column._len = 0
+            self._reset_listed(None)
+        if self.listener is not None:
+            self.listener(None)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def id_of(self, path):
+        """Image ID of a registered path, or None."""
+        return self._ids.get(path)
+
+    def path_of(self, image_id):
+        return self._paths[image_id]
+
+    def add_paths(self, paths):
+        """Register paths (in display order, so scans follow it); returns their IDs."""
+        with self._lock:
+            return [self._add(path) for path in paths]
+
+    def list_paths(self, paths):
+        """Make paths (all_image_paths) the listed images and recount them."""
+        with self._lock:
+            for image_id, flags in enumerate(self._flags):
+                if flags & self._LISTED:
+                    self._flags[image_id] = flags & ~self._LISTED
+            for path in paths:
+                self._flags[self._add(path)] |= self._LISTED
+            self._reset_listed(paths)
+            self._recount()
+
+    def load(self, rows):
+        """
+        Store (path, label, ocr_readable, false_noread, comment) rows in one batch (CSV
+        load): the counters are recomputed once and the listener is told once (None).
+        """
+        with self._lock:
+            try:
+                for path, label, ocr_readable, false_noread, comment in rows:
+                    image_id = self._add(path)
+                    self._label_codes[image_id] = self._label_code(label)
+                    flags = (self._flags[image_id] & self._LISTED) | self._OCR_SET | self._FNR_SET
+                    if ocr_readable:
+                        flags |= self._OCR
+                    if false_noread:
+                        flags |= self._FNR
+                    self._flags[image_id] = flags
+                    if comment:
+                        self._comments[image_id] = comment
+                    else:
+                        self._comments.pop(image_id, None)
+            finally:
+                self._recount()
+        if self.listener is not None:
+            self.listener(None)
+
+    def list_more(self, added, source):
+        """Add paths to the listed images, which source now holds."""
+        with self._lock:
+            self._list(added)
+            self._listed_source = source
+
+    def lists(self, paths):
+        """Whether the listed images are those of the list paths."""
+        return paths is self._listed_source and len(paths) == self._listed
+
+    def listed_counts(self):
+        """(listed images, {label: listed images with it}, OCR readable, False NoRead)."""
+        with self._lock:
+            label_counts = {name: self._listed_label_counts[code]
+                            for code, name in enumerate(self._label_names)}
+            return self._listed, label_counts, self._listed_ocr, self._listed_fnr
+
+    def _reset_listed(self, source):
+        # Caller holds the lock
+        self._listed_source = source
+        self._listed = self._listed_ocr = self._listed_fnr = 0
+        self._listed_label_counts = [0] * 128
+
+    def _recount(self):
+        # Caller holds the lock; column sizes and listed counters from the columns
+        label_codes = np.frombuffer(self._label_codes, dtype=np.int8)
+        flags = np.frombuffer(self._flags, dtype=np.uint8)
+        self.labels._len = int(np.count_nonzero(label_codes >= 0))
+        self.ocr_readable._len = int(np.count_nonzero(flags & self._OCR_SET))
+        self.false_noread._len = int(np.count_nonzero(flags & self._FNR_SET))
+        listed = (flags & self._LISTED) != 0
+        listed_codes = label_codes[listed]
+        self._listed_label_counts = np.bincount(listed_codes[listed_codes >= 0], minlength=128).tolist()
+        self._listed = int(np.count_nonzero(listed))
+        self._listed_ocr = int(np.count_nonzero(flags[listed] & self._OCR))
+        self._listed_fnr = int(np.count_nonzero(flags[listed] & self._FNR))
+
+    def _list(self, paths):
+        # Caller holds the lock
+        for path in paths:
+            image_id = self._add(path)
+            if not self._flags[image_id] & self._LISTED:
+                self._flags[image_id] |= self._LISTED
+                self._count(image_id, 1)
+
+    def _count(self, image_id, sign):
+        # Caller holds the lock; adds (sign 1) or removes (-1) the image from the counts
+        flags = self._flags[image_id]
+        if not flags & self._LISTED:
+            return
+        code = self._label_codes[image_id]
+        if code >= 0:
+            self._listed_label_counts[code] += sign
+        if flags & self._OCR:
+            self._listed_ocr += sign
+        if flags & self._FNR:
+            self._listed_fnr += sign
+        self._listed += sign
+
+    def arrays(self, listed_only=False):
+        """
+        NumPy copies of the label code, flag and session code columns (aligned, one
+        entry per image; only the listed images if listed_only), with the label names
+        and session IDs the codes refer to.
+        """
+        with self._lock:
+            label_codes = np.frombuffer(self._label_codes, dtype=np.int8).copy()
+            flags = np.frombuffer(self._flags, dtype=np.uint8).copy()
+            session_codes = np.frombuffer(self._session_codes, dtype=np.intc).copy()
+            label_names, session_ids = list(self._label_names), list(self._session_ids)
+        if listed_only:
+            listed = (flags & self._LISTED) != 0
+            label_codes, flags, session_codes = label_codes[listed], flags[listed], session_codes[listed]
+        return label_codes, flags, session_codes, label_names, session_ids
+
+    def columns(self):
+        """
+        Copy of every column, for readers on other threads: (paths, label_names,
+        label_codes, flags, triggers, session_ids, session_codes, comments).
+        """
+        with self._lock:
+            return (list(self._paths), list(self._label_names), array("b", self._label_codes),
+                    bytes(self._flags), array("q", self._triggers), list(self._session_ids),
+                    array("i", self._session_codes), dict(self._comments))
+
+    def session_of(self, path):
+        """Session ID of path as parsed at registration (registers it if needed)."""
+        image_id = self._ids.get(path)
+        if image_id is None:
+            image_id = self.add_paths([path])[0]
+        return self._session_ids[self._session_codes[image_id]]
+
+    def trigger_of(self, path):
+        """Numeric trigger ID of path, or None if its name has none."""
+        image_id = self._ids.get(path)
+        if image_id is None:
+            image_id = self.add_paths([path])[0]
+        trigger = self._triggers[image_id]
+        return None if trigger == self.NO_TRIGGER else trigger
+
+    def _add(self, path):
+        # Caller holds the lock
+        image_id = self._ids.get(path)
+        if image_id is not None:
+            return image_id
+        session_id, id_number = self.describe(path)
+        session_code = self._session_code_of.get(session_id)
+        if session_code is None:
+            session_code = self._session_code_of[session_id] = len(self._session_ids)
+            self._session_ids.append(session_id)
+        image_id = len(self._paths)
+        self._ids[path] = image_id
+        self._paths.append(path)
+        self._label_codes.append(-1)
+        self._flags.append(0)
+        self._triggers.append(self.NO_TRIGGER if id_number is None else id_number)
+        self._session_codes.append(session_code)
+        return image_id
+
+    def _label_code(self, label):
+        # Caller holds the lock
+        code = self._label_code_of.get(label)
+        if code is None:
+            if len(self._label_names) > 127:
+                raise ValueError(f"Too many distinct labels to store {label!r}")
+            code = self._label_code_of[label] = len(self._label_names)
+            self._label_names.append(label)
+        return code
+
+
+class _RecordColumn(MutableMapping):
+    """Dict-like view of one ImageRecordStore column, keyed by image path"""
+
+    def __init__(self, store):
+        self._store = store
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        store = self._store
+        paths = store._paths
+        return (paths[image_id] for image_id in range(len(paths)) if self._has(image_id))
+
+    def __contains__(self, path):
+        image_id = self._store._ids.get(path)
+        return image_id is not None and self._has(image_id)
+
+    def __getitem__(self, path):
+        image_id = self._store._ids.get(path)
+        if image_id is None or not self._has(image_id):
+            raise KeyError(path)
+        return self._value(image_id)
+
+    def get(self, path, default=None):
+        image_id = self._store._ids.get(path)
+        if image_id is None or not self._has(image_id):
+            return default
+        return self._value(image_id)
+
+    def __setitem__(self, path, value):
+        store = self._store
+        with store._lock:
+            image_id = store._add(path)
+            if not self._has(image_id):
+                self._len += 1
+            store._count(image_id, -1)
+            self._set(image_id, value)
+            store._count(image_id, 1)
+            if store.listener is not None:
+                store.listener(path)
+
+    def __delitem__(self, path):
+        store = self._store
+        with store._lock:
+            image_id = store._ids.get(path)
+            if image_id is None or not self._has(image_id):
+                raise KeyError(path)
+            self._len -= 1
+            store._count(image_id, -1)
+            self._unset(image_id)
+            store._count(image_id, 1)
+            if store.listener is not None:
+                store.listener(path)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class _LabelColumn(_RecordColumn):
+    def _has(self, image_id):
+        return self._store._label_codes[image_id] >= 0
+
+    def _value(self, image_id):
+        return self._store._label_names[self._store._label_codes[image_id]]
+
+    def _set(self, image_id, value):
+        self._store._label_codes[image_id] = self._store._label_code(value)
+
+    def _unset(self, image_id):
+        self._store._label_codes[image_id] = -1
+
+
+class _FlagColumn(_RecordColumn):
+    def __init__(self, store, set_bit, value_bit):
+        super().__init__(store)
+        self._set_bit = set_bit
+        self._value_bit = value_bit
+
+    def _has(self, image_id):
+        return bool(self._store._flags[image_id] & self._set_bit)
+
+    def _value(self, image_id):
+        return bool(self._store._flags[image_id] & self._value_bit)
+
+    def _set(self, image_id, value):
+        flags = self._store._flags[image_id] | self._set_bit
+        self._store._flags[image_id] = flags | self._value_bit if value else flags & ~self._value_bit
+
+    def _unset(self, image_id):
+        self._store._flags[image_id] &= ~(self._set_bit | self._value_bit)
+
+
+class _CommentColumn(_RecordColumn):
+    """Sparse: only non-empty comments are stored, an empty one removes the entry"""
+
+    def __setitem__(self, path, value):
+        if value:
+            super().__setitem__(path, value)
+        else:
+            self.pop(path, None)
+
+    def __len__(self):
+        return len(self._store._comments)
+
+    def __iter__(self):
+        paths = self._store._paths
+        return (paths[image_id] for image_id in sorted(self._store._comments))
+
+    def _has(self, image_id):
+        return image_id in self._store._comments
+
+    def _value(self, image_id):
+        return self._store._comments[image_id]
+
+    def _set(self, image_id, value):
+        self._store._comments[image_id] = value
+
+    def _unset(self, image_id):
+        del self._store._comments[image_id]
+
+
+# Results of determine_session_classification, as indexed by session_classes()
+SESSION_CLASSES = ["read failure", "FalseNoRead", "unreadable", "no label", "unlabeled"]
+
+
+def session_classes(label_codes, flags, session_codes, label_names, session_count):
+    """
+    Classify every session at once from aligned per-image NumPy arrays (see
+    ImageRecordStore.arrays()), with the rules of determine_session_classification.
+
+    Returns (per_label, ocr_readable, false_noread, classes): per_label[s, c] counts
+    the images of session s with label code c (column 0 also holds the images without
+    a label), ocr_readable / false_noread count the flagged images per session, and
+    classes[s] indexes SESSION_CLASSES, or is -1 when no image of s is classified.
+    """
+    label_count = max(len(label_names), 1)
+    label_codes = np.maximum(label_codes, 0).astype(np.intp)  # No label entry: unclassified
+    session_codes = session_codes.astype(np.intp)
+    per_label = np.bincount(session_codes * label_count + label_codes,
+                            minlength=session_count * label_count).reshape(session_count, label_count)
+    ocr_readable = np.bincount(session_codes[(flags & ImageRecordStore._OCR) != 0], minlength=session_count)
+    false_noread_mask = (flags & ImageRecordStore._FNR) != 0
+    false_noread = np.bincount(session_codes[false_noread_mask], minlength=session_count)
+
+    def label_column(name):
+        return per_label[:, label_names.index(name)] if name in label_names else np.zeros(session_count, np.intp)
+
+    read_failure = label_codes == (label_names.index("read failure") if "read failure" in label_names else -1)
+    flagged_read_failures = np.bincount(session_codes[read_failure & false_noread_mask], minlength=session_count)
+    genuine_read_failures = label_column("read failure") - flagged_read_failures
+    classified = per_label.sum(axis=1) - per_label[:, 0]
+    classes = np.select(
+        [classified == 0, genuine_read_failures > 0, flagged_read_failures > 0,
+         label_column("unreadable") + label_column("incomplete") > 0, label_column("no label") == classified],
+        [-1, 0, 1, 2, 3], default=4)
+    return per_label, ocr_readable, false_noread, classes
+
+
+class LabelExporter:
+    """
+    Streams the labels to per-image and per-session tables for downstream jobs.
+
+    Built from ImageRecordStore.columns() plus the session labels computed for
+    save_csv, so it can run on a background thread while labeling goes on. Rows
+    are produced and written EXPORT_BATCH_ROWS at a time to <base>_images.jsonl
+    and <base>_sessions.jsonl, and to typed .parquet files when pyarrow is
+    installed; per-session counters are the only state that grows with the data.
+    Each file is written to a temp name and renamed when complete.
+    """
+
+    SESSION_COUNTS = [("(Unclassified)", "unclassified_images"), ("no label", "no_label_images"),
+                      ("read failure", "read_failure_images"), ("incomplete", "incomplete_images"),
+                      ("unreadable", "unreadable_images")]
+
+    def __init__(self, columns, session_labels, relative_path):
+        self.columns = columns
+        self.session_labels = session_labels  # session_id -> session label
+        self.relative_path = relative_path  # absolute image path -> path stored in the export
+
+    def image_rows(self):
+        """Per-image rows, in batches of column lists."""
+        paths, label_names, label_codes, flags, triggers, session_ids, session_codes, comments = self.columns
+        for start in range(0, len(paths), EXPORT_BATCH_ROWS):
+            ids = range(start, min(start + EXPORT_BATCH_ROWS, len(paths)))
+            yield {
+                "image_path": [self.relative_path(paths[i]) for i in ids],
+                "label": [label_names[label_codes[i]] if label_codes[i] >= 0 else "(Unclassified)" for i in ids],
+                "ocr_readable": [bool(flags[i] & ImageRecordStore._OCR) for i in ids],
+                "false_noread": [bool(flags[i] & ImageRecordStore._FNR) for i in ids],
+                "comment": [comments.get(i, "") for i in ids],
+                "session_id": [session_ids[session_codes[i]] for i in ids],
+                "trigger_id": [None if triggers[i] == ImageRecordStore.NO_TRIGGER else triggers[i] for i in ids],
+            }
+
+    def session_rows(self):
+        """Per-session aggregates, in batches of column lists (sessions in display order)."""
+        paths, label_names, label_codes, flags, triggers, session_ids, session_codes, comments = self.columns
+        session_codes = np.frombuffer(session_codes, dtype=np.intc)
+        per_label, ocr_readable, false_noread, _ = session_classes(
+            np.frombuffer(label_codes, dtype=np.int8), np.frombuffer(flags, dtype=np.uint8),
+            session_codes, label_names, len(session_ids))
+        # Per-session count columns; labels other than SESSION_COUNTS count as unclassified
+        images = per_label.sum(axis=1)
+        label_columns = {label: per_label[:, label_names.index(label)].tolist() if label in label_names
+                         else [0] * len(session_ids) for label, _ in self.SESSION_COUNTS}
+        other_labels = [code for code, name in enumerate(label_names) if name not in dict(self.SESSION_COUNTS)]
+        label_columns["(Unclassified)"] = (per_label[:, 0] + per_label[:, other_labels].sum(axis=1)).tolist()
+        session_trigger = np.full(len(session_ids), ImageRecordStore.NO_TRIGGER, dtype=np.int64)
+        session_trigger[session_codes] = np.frombuffer(triggers, dtype=np.int64)
+        session_trigger = session_trigger.tolist()
+        images, ocr_readable, false_noread = images.tolist(), ocr_readable.tolist(), false_noread.tolist()
+
+        batch = None
+        for code, session_id in enumerate(session_ids):
+            if images[code] == 0:
+                continue
+            if batch is None:
+                batch = {name: [] for name in ("session_id", "trigger_id", "session_label", "session_ocr_readable",
+                                               "images", "ocr_readable_images", "false_noread_images")}
+                for _, column in self.SESSION_COUNTS:
+                    batch[column] = []
+            trigger = session_trigger[code]
+            batch["session_id"].append(session_id)
+            batch["trigger_id"].append(None if trigger == ImageRecordStore.NO_TRIGGER else trigger)
+            batch["session_label"].append(self.session_labels.get(session_id, "no label"))
+            batch["session_ocr_readable"].append(ocr_readable[code] > 0)
+            batch["images"].append(images[code])
+            batch["ocr_readable_images"].append(ocr_readable[code])
+            batch["false_noread_images"].append(false_noread[code])
+            for label, column in self.SESSION_COUNTS:
+                batch[column].append(label_columns[label][code])
+            if len(batch["session_id"]) >= EXPORT_BATCH_ROWS:
+                yield batch
+                batch = None
+        if batch is not None:
+            yield batch
+
+    def write(self, base_path, parquet=HAS_PYARROW):
+        """Write <base_path>_images / _sessions tables; returns the files written."""
+        written = []
+        for table, batches in (("images", self.image_rows()), ("sessions", self.session_rows())):
+            path = f"{base_path}_{table}.jsonl"
+            self._write_jsonl(path, batches)
+            written.append(path)
+        if parquet:
+            for table, batches in (("images", self.image_rows()), ("sessions", self.session_rows())):
+                path = f"{base_path}_{table}.parquet"
+                self._write_parquet(path, batches, self._parquet_schema(table))
+                written.append(path)
+        return written
+
+    @staticmethod
+    def _write_jsonl(path, batches):
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8", newline="\n") as f:
+                for batch in batches:
+                    names = list(batch)
+                    f.writelines(json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n"
+                                 for row in zip(*batch.values()))
+            os.replace(temp_path, path)
+        except Exception:
+            LabelExporter._discard(temp_path)
+            raise
+
+    @staticmethod
+    def _write_parquet(path, batches, schema):
+        temp_path = path + ".tmp"
+        try:
+            writer = pq.ParquetWriter(temp_path, schema)
+            try:
+                for batch in batches:
+                    writer.write_table(pa.Table.from_pydict(batch, schema=schema))
+            finally:
+                writer.close()
+            os.replace(temp_path, path)
+        except Exception:
+            LabelExporter._discard(temp_path)
+            raise
+
+    @staticmethod
+    def _discard(temp_path):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+    @classmethod
+    def _parquet_schema(cls, table):
+        if table == "images":
+            return pa.schema([("image_path", pa.string()), ("label", pa.string()),
+                              ("ocr_readable", pa.bool_()), ("false_noread", pa.bool_()),
+                              ("comment", pa.string()), ("session_id", pa.string()), ("trigger_id", pa.int64())])
+        return pa.schema([("session_id", pa.string()), ("trigger_id", pa.int64()),
+                          ("session_label", pa.string()),
+                          ("session_ocr_readable", pa.bool_()), ("images", pa.int32()),
+                          ("ocr_readable_images", pa.int32()), ("false_noread_images", pa.int32())]
+                         + [(column, pa.int32()) for _, column in cls.SESSION_COUNTS])
+
+
+class FilenameRecord:
+    """
+    Fields of an image filename (XXXXXXXXXX_XXXX_XXX_timestamp.jpg), parsed once.
+
+    FilenameRecord.of(path) splits the name the first time a path is seen and
+    memoizes the record, so sorting, session grouping, trigger ID lookups and the
+    log cross-reference no longer split the same names over and over. Repeated
+    values (camera, timestamp, session ID) are interned. The date is only parsed
+    when asked for. forget() drops the memo on folder switch.
+    """
+
+    __slots__ = ("trigger", "trigger_id", "sub_image", "camera", "timestamp", "session_id", "sort_key", "_date")
+
+    _records = {}
+    _NO_DATE = object()
+
+    def __init__(self, filename):
+        stem_parts = os.path.splitext(filename)[0].split('_')
+        self.trigger = stem_parts[0]
+        self.trigger_id = self._number(self.trigger)
+        self.sub_image = self._number(stem_parts[1]) if len(stem_parts) >= 2 else None
+        self.camera = sys.intern(stem_parts[2]) if len(stem_parts) >= 3 else None
+        self.timestamp = sys.intern(stem_parts[-1]) if len(stem_parts) >= 2 else None
+        # Group ID: ID (first part) + timestamp (last part)
+        self.session_id = sys.intern(f"{self.trigger}_{self.timestamp}" if self.timestamp is not None
+                                     else self.trigger)
+        # Sort key (trigger ID, sub-image count) from the name with its extension, 0 when not numeric
+        parts = filename.split('_')
+        if len(parts) >= 2:
+            self.sort_key = (int(parts[0]) if parts[0].isdigit() else 0,
+                             int(parts[1]) if parts[1].isdigit() else 0)
+        else:
+            self.sort_key = (0, 0)
+        self._date = self._NO_DATE
+
+    @staticmethod
+    def _number(text):
+        try:
+            return int(text)
+        except ValueError:
+            return None
+
+    @classmethod
+    def of(cls, path):
+        """The record of path (a full path or a bare filename)."""
+        record = cls._records.get(path)
+        if record is None:
+            # Worker threads may parse the same name twice; both records are equal
+            record = cls._records[path] = cls(os.path.basename(path))
+        return record
+
+    @classmethod
+    def forget(cls):
+        cls._records = {}
+
+    def date(self, parse):
+        """The date of the filename, computed by parse() on first use."""
+        if self._date is self._NO_DATE:
+            self._date = parse()
+        return self._date
+
+
+class SessionIndex:
+    """
+    Images grouped by session: session ID -> paths in display order.
+
+    Built once per folder and extended with the files found later, so the
+    statistics do not regroup every image on each update. It remembers which
+    path list it describes and how long that list was; describes() tells the
+    caller when all_image_paths was replaced or shrunk behind its back, and the
+    index is then rebuilt. listener(session_ids) is told which sessions gained
+    images (None: all of them).
+    """
+
+    def __init__(self, session_of, sort_key):
+        self.session_of = session_of
+        self.sort_key = sort_key
+        self.listener = None
+        self.sessions = {}
+        self._source = None
+        self._count = 0
+
+    def rebuild(self, paths):
+        """Group every path of paths (already in display order)."""
+        self.sessions = {}
+        self._group(paths)
+        self._source = paths
+        self._count = len(paths)
+        if self.listener is not None:
+            self.listener(None)
+
+    def add(self, added, source):
+        """Group the added paths, which are now part of the list source."""
+        touched = self._group(added)
+        for session_id in touched:
+            # Files added to an existing session are not necessarily its last ones
+            self.sessions[session_id].sort(key=self.sort_key)
+        self._source = source
+        self._count += len(added)
+        if self.listener is not None:
+            self.listener(touched)
+
+    def _group(self, paths):
+        """Append paths to their sessions; returns the sessions they were added to."""
+        touched = set()
+        for path in paths:
+            session_id = self.session_of(path)
+            if session_id:
+                session_paths = self.sessions.get(session_id)
+                if session_paths is None:
+                    self.sessions[session_id] = [path]
+                else:
+                    session_paths.append(path)
+                touched.add(session_id)
+        return touched
+
+    def describes(self, paths):
+        return paths is self._source and len(paths) == self._count
+
+
+class SessionLabelCache:
+    """
+    Session labels and per-category session counters, updated by reclassifying
+    only the sessions whose images changed.
+
+    classify(paths) returns (session label or None if no image is classified,
+    any image OCR readable, every image False NoRead) for the images of one
+    session, as the full calculate_* scans would. Label edits call mark_path()
+    (from any thread); the sessions they belong to are reclassified on the
+    next refresh() and their old state is subtracted from the counters.
+    When everything must be reclassified (new folder, CSV load), classify_all()
+    yields (session_id, state) for all sessions in one batch instead.
+    label_images counts the images of the sessions per session label (None: no
+    image classified yet).
+    """
+
+    def __init__(self, index, classify, classify_all=None):
+        self.index = index
+        self.classify = classify
+        self.classify_all = classify_all
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._everything = True
+        self._state = {}  # session_id -> ((label, ocr_readable, all_false_noread), images)
+        self.labels = {}  # session_id -> label, for sessions with a classified image
+        self.label_counts = {}
+        self.label_images = {}
+        self.ocr_readable_sessions = 0
+        self.false_noread_sessions = 0
+        self.ocr_readable_non_failure_sessions = 0
+        index.listener = self.mark_sessions
+
+    def mark_path(self, path):
+        """The label state of path changed (None: possibly every image)."""
+        self.mark_sessions(None if path is None else (self.index.session_of(path),))
+
+    def mark_sessions(self, session_ids):
+        with self._lock:
+            if session_ids is None:
+                self._everything = True
+            else:
+                self._dirty.update(session_ids)
+
+    def refresh(self):
+        """Reclassify the sessions marked since the last refresh."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            everything, self._everything = self._everything, False
+        if everything:
+            self._state, self.labels, self.label_counts, self.label_images = {}, {}, {}, {}
+            self.ocr_readable_sessions = self.false_noread_sessions = self.ocr_readable_non_failure_sessions = 0
+            if self.classify_all is None:
+                dirty = self.index.sessions
+            else:
+                for session_id, state in self.classify_all():
+                    self._state[session_id] = (state, len(self.index.sessions[session_id]))
+                    self._count(*self._state[session_id], 1)
+                    if state[0] is not None:
+                        self.labels[session_id] = state[0]
+                dirty = ()
+        for session_id in dirty:
+            old = self._state.pop(session_id, None)
+            if old is not None:
+                self._count(*old, -1)
+            session_paths = self.index.sessions.get(session_id)
+            if not session_paths:
+                self.labels.pop(session_id, None)
+                continue
+            state = self.classify(session_paths)
+            self._state[session_id] = (state, len(session_paths))
+            self._count(state, len(session_paths), 1)
+            if state[0] is None:
+                self.labels.pop(session_id, None)
+            else:
+                self.labels[session_id] = state[0]
+        return self
+
+    def _count(self, state, images, sign):
+        label, ocr_readable, all_false_noread = state
+        if label is not None:
+            self.label_counts[label] = self.label_counts.get(label, 0) + sign
+        self.label_images[label] = self.label_images.get(label, 0) + sign * images
+        self.ocr_readable_sessions += sign * ocr_readable
+        self.false_noread_sessions += sign * all_false_noread
+        if ocr_readable and label != "read failure":
+            self.ocr_readable_non_failure_sessions += sign
+
+
+class FolderIndex:
+    """
+    Persisted listing of one folder's image files, in display order.
+
+    Every file keeps its size, mtime and the fields describe(path) parsed from its
+    name (sort key first), so reopening a folder does not parse every filename
+    again. The index is stored locally per folder (like the proxies) and refreshed
+    with one stat() of the folder: only when the folder's mtime changed is it
+    scanned with os.scandir, and only the added files are stat'ed and parsed.
+    The revision_*.csv names seen by the same scan are kept as well.
+    """
+
+    VERSION = 1
+    # Folder mtimes closer than this to the scan may hide files created during it
+    MTIME_MARGIN_NS = 2 * 10**9
+
+    def __init__(self, describe, root_dir=FOLDER_INDEX_DIR):
+        self.describe = describe  # path -> [sort_key, session_id, id_number]
+        self.root_dir = root_dir
+        self.folder = None
+        self.index_path = None
+        self._entries = {}  # name -> [size, mtime_ns, sort_key, session_id, id_number]
+        self._order = []  # names in display order
+        self._paths = []  # absolute paths in display order
+        self._revisions = []
+        self._dir_mtime_ns = None
+        self._scanned_ns = 0
+
+    def open(self, folder):
+        """Switch to folder, loading its saved index and bringing it up to date."""
+        self.folder = os.path.normpath(os.path.abspath(folder))
+        digest = hashlib.sha1(os.path.normcase(self.folder).encode("utf-8")).hexdigest()[:16]
+        self.index_path = os.path.join(self.root_dir, f"{digest}.json")
+        self._entries, self._order, self._revisions = {}, [], []
+        self._dir_mtime_ns, self._scanned_ns = None, 0
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION and data.get("folder") == self.folder:
+                self._order = data["names"]
+                self._entries = dict(zip(self._order, data["entries"]))
+                self._revisions = data["revisions"]
+                self._dir_mtime_ns = data["dir_mtime_ns"]
+                self._scanned_ns = data["scanned_ns"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        self._update_paths()
+        return self.refresh()
+
+    def refresh(self):
+        """Rescan the folder if it changed; returns (added paths, removed paths)."""
+        dir_mtime_ns = os.stat(self.folder).st_mtime_ns
+        if dir_mtime_ns == self._dir_mtime_ns and dir_mtime_ns < self._scanned_ns - self.MTIME_MARGIN_NS:
+            return [], []
+        scanned_ns = time.time_ns()
+
+        names = set()
+        revisions = []
+        fresh = []
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    names.add(name)
+                    if name not in self._entries:
+                        fresh.append(entry)
+                elif name.startswith("revision_") and name.endswith(".csv"):
+                    revisions.append(name)
+
+        added = []
+        for entry in fresh:
+            try:
+                stat = entry.stat()
+            except OSError:
+                names.discard(entry.name)  # Removed while scanning
+                continue
+            sort_key, session_id, id_number = self.describe(os.path.join(self.folder, entry.name))
+            # Lists, not tuples: entries loaded from JSON are compared with these when sorting
+            self._entries[entry.name] = [stat.st_size, stat.st_mtime_ns, list(sort_key), session_id, id_number]
+            added.append(entry.name)
+        removed = [name for name in self._entries if name not in names]
+        for name in removed:
+            del self._entries[name]
+
+        changed = bool(added or removed) or sorted(revisions) != sorted(self._revisions)
+        self._revisions = revisions
+        self._dir_mtime_ns = dir_mtime_ns
+        self._scanned_ns = scanned_ns
+        if added or removed:
+            self._order = sorted(self._entries, key=lambda name: (self._entries[name][2], name))
+            self._update_paths()
+        if changed:
+            self.save()
+        added_set = set(added)
+        return ([path for name, path in zip(self._order, self._paths) if name in added_set],
+                [os.path.join(self.folder, name) for name in removed])
+
+    def paths(self):
+        """Absolute, normalized image paths in display order."""
+        return self._paths
+
+    def revision_files(self):
+        return list(self._revisions)
+
+    def entry(self, path):
+        """[size, mtime_ns, sort_key, session_id, id_number] of an indexed file, or None."""
+        return self._entries.get(os.path.basename(path))
+
+    def id_range(self):
+        """(min, max) of the numeric IDs in the filenames, or None if there are none."""
+        ids = [fields[4] for fields in self._entries.values() if fields[4] is not None]
+        return (min(ids), max(ids)) if ids else None
+
+    def save(self):
+        """Write the index atomically (temp file + rename)."""
+        data = {"version": self.VERSION, "folder": self.folder, "dir_mtime_ns": self._dir_mtime_ns,
+                "scanned_ns": self._scanned_ns, "revisions": self._revisions, "names": self._order,
+                "entries": [self._entries[name] for name in self._order]}
+        try:
+            os.makedirs(self.root_dir, exist_ok=True)
+            temp_path = self.index_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"Could not save folder index: {e}")
+
+    def _update_paths(self):
+        prefix = os.path.join(self.folder, "")
+        self._paths = [prefix + name for name in self._order]
+
+
+class LabelJournal:
+    """
+    Append-only log of per-image changes (label, OCR readable, False NoRead, comment),
+    one JSON object per line, kept next to the revision CSV as <csv>.journal.
+
+    Appending is O(1) regardless of the number of images; lines are flushed to the
+    OS immediately and fsync'd in batches of fsync_batch. The CSV remains the
+    snapshot: when a snapshot is taken the journal is rotated to <journal>.old,
+    which is deleted once that snapshot is safely on disk (compaction). Loading
+    replays <journal>.old and then the journal on top of the snapshot.
+    """
+
+    FIELDS = ("label", "ocr_readable", "false_noread", "comment")
+
+    def __init__(self, path, fsync_batch=JOURNAL_FSYNC_BATCH):
+        self.path = path
+        self.fsync_batch = fsync_batch
+        self.pending_sync = 0  # Lines written but not yet fsync'd
+        self.event_count = 0  # Lines since the last compaction
+        self.rotation = 0  # Incremented by every rotate()
+        self._file = None
+        self._lock = threading.Lock()  # rotate() runs on the Tk thread, discard_rotated() on the writer
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                self.event_count = sum(1 for _ in f)
+
+    def append(self, relative_path, **fields):
+        """Append one change; returns the record written."""
+        record = {"path": relative_path, "time": round(time.time(), 3)}
+        record.update(fields)
+        if self._file is None:
+            self._file = self._open_for_append(self.path)
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.pending_sync += 1
+        self.event_count += 1
+        if self.pending_sync >= self.fsync_batch:
+            self.sync()
+        return record
+
+    def sync(self):
+        """Force written lines to disk."""
+        if self._file is not None and self.pending_sync:
+            os.fsync(self._file.fileno())
+            self.pending_sync = 0
+
+    def rotate(self):
+        """
+        Move the current events aside because a snapshot containing them is being written.
+        Returns the rotation number to pass to discard_rotated() once the write succeeded.
+        """
+        with self._lock:
+            self.close()
+            rotated_path = self.path + ".old"
+            if os.path.exists(self.path):
+                if os.path.exists(rotated_path):
+                    # The previous snapshot is not on disk yet: keep both sets of events
+                    with open(self.path, 'r', encoding='utf-8') as src, \
+                            self._open_for_append(rotated_path) as dst:
+                        dst.write(src.read())
+                        dst.flush()
+                        os.fsync(dst.fileno())
+                    os.remove(self.path)
+                else:
+                    os.replace(self.path, rotated_path)
+            self.event_count = 0
+            self.rotation += 1
+            return self.rotation
+
+    def discard_rotated(self, rotation):
+        """Delete the rotated events if no later rotation added events the snapshot lacks."""
+        with self._lock:
+            if rotation == self.rotation and os.path.exists(self.path + ".old"):
+                os.remove(self.path + ".old")
+
+    @staticmethod
+    def _open_for_append(path):
+        # Start on a fresh line if a previous run was interrupted mid-write
+        needs_newline = False
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        f = open(path, 'a', encoding='utf-8')
+        if needs_newline:
+            f.write("\n")
+        return f
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def replay(path):
+        """Yield the records of the rotated and the current journal in order, skipping torn lines."""
+        for journal_path in (path + ".old", path):
+            if not os.path.exists(journal_path):
+                continue
+            with open(journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Interrupted write
+                    if isinstance(record, dict) and "path" in record:
+                        yield record
+
+
+class LabelSidecar:
+    """
+    Compact binary copy of a revision CSV, written next to it as <csv>.bin.
+
+    Layout: magic, the CSV's st_mtime_ns and st_size, row count and section
+    lengths, then the distinct labels, one label code byte and one flag byte
+    (bit 0 OCR readable, bit 1 False NoRead) per row, and the NUL-separated
+    relative paths and comments. Everything is read with a single read();
+    the CSV stays the source of truth and a sidecar that no longer matches
+    the CSV's mtime/size is ignored.
+    """
+
+    MAGIC = b"ILTBIN1\n"
+    HEADER = struct.Struct("<qqIIII")  # mtime_ns, size, rows, labels/paths/comments bytes
+    OCR_READABLE = 1
+    FALSE_NOREAD = 2
+
+    @classmethod
+    def write(cls, csv_path, rows):
+        """Write the sidecar for the data rows (header row excluded) just written to csv_path."""
+        label_table = {}
+        codes = array('B')
+        flags = array('B')
+        for row in rows:
+            code = label_table.setdefault(row[1], len(label_table))
+            if code > 255:  # One code byte per row
+                raise ValueError("too many distinct labels for the binary snapshot")
+            codes.append(code)
+            flags.append((cls.OCR_READABLE if row[2] else 0) | (cls.FALSE_NOREAD if row[3] else 0))
+        labels_blob = "\0".join(label_table).encode('utf-8')
+        paths_blob = "\0".join(row[0] for row in rows).encode('utf-8')
+        comments_blob = "\0".join(str(row[4]) for row in rows).encode('utf-8')
+
+        stat = os.stat(csv_path)
+        sidecar_path = csv_path + LABEL_SIDECAR_SUFFIX
+        temp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(cls.MAGIC)
+            f.write(cls.HEADER.pack(stat.st_mtime_ns, stat.st_size, len(rows),
+                                    len(labels_blob), len(paths_blob), len(comments_blob)))
+            f.write(labels_blob)
+            codes.tofile(f)
+            flags.tofile(f)
+            f.write(paths_blob)
+            f.write(comments_blob)
+        os.replace(temp_path, sidecar_path)
+
+    @classmethod
+    def read(cls, csv_path):
+        """
+        Return (relative_paths, labels, ocr_readable, false_noread, comments) column lists,
+        or None if there is no sidecar or it does not belong to the current CSV.
+        """
+        try:
+            stat = os.stat(csv_path)
+            with open(csv_path + LABEL_SIDECAR_SUFFIX, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        offset = len(cls.MAGIC) + cls.HEADER.size
+        if len(data) < offset or not data.startswith(cls.MAGIC):
+            return None
+        mtime_ns, size, count, labels_len, paths_len, comments_len = cls.HEADER.unpack_from(data, len(cls.MAGIC))
+        if (mtime_ns, size) != (stat.st_mtime_ns, stat.st_size):
+            return None  # The CSV was rewritten (or edited) after the sidecar
+        if len(data) != offset + labels_len + 2 * count + paths_len + comments_len:
+            return None
+        if count == 0:
+            return [], [], [], [], []
+
+        label_table = data[offset:offset + labels_len].decode('utf-8').split("\0")
+        offset += labels_len
+        codes = data[offset:offset + count]
+        flags = data[offset + count:offset + 2 * count]
+        offset += 2 * count
+        paths = data[offset:offset + paths_len].decode('utf-8').split("\0")
+        comments = data[offset + paths_len:].decode('utf-8').split("\0")
+        if len(paths) != count or len(comments) != count:
+            return None
+        labels = [label_table[code] for code in codes]
+        ocr_readable = [bool(flag & cls.OCR_READABLE) for flag in flags]
+        false_noread = [bool(flag & cls.FALSE_NOREAD) for flag in flags]
+        return paths, labels, ocr_readable, false_noread, comments
+
+
+class SharedLabelDeltas:
+    """
+    Per-operator append-only delta files for labeling one folder from several PCs.
+
+    This operator's changes are appended (through a LabelJournal) to its own
+    labels_<operator>.delta.jsonl in the image folder; nobody else writes to that
+    file. poll() reads only the bytes appended to the other files since the last
+    poll and merges them: for every (image, field) the change with the latest
+    timestamp wins, ties going to the higher operator id. The first poll reads
+    all files, including this operator's own from earlier runs; records older
+    than covered_until are already part of the loaded snapshot and skipped.
+
+    Once a snapshot holding this operator's changes is written, snapshot_written()
+    lets the next poll drop the records older than it by DELTA_COMPACT_AGE_S from
+    the own file (the other operators notice the rewrite and read it again).
+
+    Unclassified work is split by session: each session belongs to one of the
+    active operators (delta file touched within OPERATOR_ACTIVE_S).
+    """
+
+    PREFIX = "labels_"
+    SUFFIX = ".delta.jsonl"
+
+    def __init__(self, folder, operator):
+        self.folder = folder
+        self.operator = operator
+        self.path = os.path.join(folder, f"{self.PREFIX}{operator}{self.SUFFIX}")
+        self._journal = LabelJournal(self.path)
+        self._offsets = {}  # delta file -> (file id, bytes already merged)
+        self._latest = {}  # (relative path, field) -> (time, operator) of the winning change
+        self._last_touch = 0
+        self.covered_until = 0  # Records older than this are in the snapshot labels were loaded from
+        self._compact_before = None  # Set by snapshot_written() (writer thread), applied by poll()
+
+    @classmethod
+    def exist_in(cls, folder):
+        return any(name.startswith(cls.PREFIX) and name.endswith(cls.SUFFIX) for name in os.listdir(folder))
+
+    def append(self, relative_path, **fields):
+        """Record a change made by this operator."""
+        record = self._journal.append(relative_path, **fields)
+        for field in fields:
+            self._latest[(relative_path, field)] = (record["time"], self.operator)
+
+    def snapshot_written(self, captured):
+        """A snapshot holding this operator's changes up to time captured is on disk."""
+        self._compact_before = captured - DELTA_COMPACT_AGE_S
+
+    def poll(self):
+        """Return the merged records (winning fields only) appended since the last poll."""
+        self._journal.sync()
+        if self._compact_before is not None:
+            before, self._compact_before = self._compact_before, None
+            self._compact(before)
+        self._touch()
+        merged = []
+        for name in os.listdir(self.folder):
+            if not (name.startswith(self.PREFIX) and name.endswith(self.SUFFIX)):
+                continue
+            delta_path = os.path.join(self.folder, name)
+            operator = name[len(self.PREFIX):-len(self.SUFFIX)]
+            for record in self._read_new(delta_path):
+                if record.get("time", 0) < self.covered_until:
+                    continue
+                winning = {"path": record["path"]}
+                for field in LabelJournal.FIELDS:
+                    if field not in record:
+                        continue
+                    key = (record["path"], field)
+                    stamp = (record.get("time", 0), operator)
+                    if key not in self._latest or stamp > self._latest[key]:
+                        self._latest[key] = stamp
+                        winning[field] = record[field]
+                if len(winning) > 1:
+                    merged.append(winning)
+        return merged
+
+    def active_operators(self):
+        """Sorted ids of the operators whose delta file was touched recently (always including this one)."""
+        now = time.time()
+        operators = {self.operator}
+        for name in os.listdir(self.folder):
+            if name.startswith(self.PREFIX) and name.endswith(self.SUFFIX):
+                try:
+                    if now - os.path.getmtime(os.path.join(self.folder, name)) <= OPERATOR_ACTIVE_S:
+                        operators.add(name[len(self.PREFIX):-len(self.SUFFIX)])
+                except OSError:
+                    continue
+        return sorted(operators)
+
+    def owner_of(self, session_id, operators):
+        """The operator among operators responsible for the unclassified images of a session."""
+        return operators[zlib.crc32(session_id.encode("utf-8")) % len(operators)]
+
+    def close(self):
+        self._journal.close()
+
+    def _compact(self, before):
+        # Only this operator writes its file, so it can be rewritten without the older records
+        self._journal.close()
+        try:
+            with open(self.path, 'rb') as f:
+                lines = f.read().splitlines(keepends=True)
+        except FileNotFoundError:
+            return
+        kept = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Interrupted write
+            if isinstance(record, dict) and record.get("time", 0) >= before:
+                kept.append(line if line.endswith(b"\n") else line + b"\n")
+        if len(kept) == len(lines):
+            return
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.writelines(kept)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def _touch(self):
+        # The delta file's mtime doubles as this operator's heartbeat
+        if time.time() - self._last_touch >= OPERATOR_ACTIVE_S / 4:
+            self._last_touch = time.time()
+            with open(self.path, 'a', encoding='utf-8'):
+                pass
+            os.utime(self.path)
+
+    def _read_new(self, delta_path):
+        file_id, offset = self._offsets.get(delta_path, (None, 0))
+        try:
+            stat = os.stat(delta_path)
+            if stat.st_ino != file_id or stat.st_size < offset:
+                offset = 0  # New or compacted by its operator: merging it again changes nothing
+            file_id = stat.st_ino
+            if stat.st_size <= offset:
+                self._offsets[delta_path] = (file_id, offset)
+                return []
+            with open(delta_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except OSError:
+            return []
+        # Only complete lines; a line still being written is read on the next poll
+        end = data.rfind(b"\n") + 1
+        self._offsets[delta_path] = (file_id, offset + end)
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Interrupted write
+            if isinstance(record, dict) and "path" in record:
+                records.append(record)
+        return records
+
+
+class SnapshotWriter:
+    """
+    Dedicated thread that writes CSV snapshots (revision and stats files) off the Tk thread.
+
+    submit() never blocks: rows submitted for a target replace rows still waiting for
+    it, so a burst of saves collapses into one write, and only one write is in flight
+    at a time. Rows go to a temp file in the target's folder which is then atomically
+    renamed over the target; if the target is locked (Excel, OneDrive sync) the write
+    is retried after SNAPSHOT_RETRY_DELAYS. on_written callbacks run on the writer
+    thread after a successful write; their errors are only logged. The outcome of each write is queued; drain_statuses() hands it to
+    on_status(target, error) on the calling thread. The writer thread never calls
+    Tk itself: Tkinter would block it until the Tk thread serves events, while the
+    Tk thread may be waiting in flush() for the writer.
+    """
+
+    def __init__(self, on_status=None, retry_delays=SNAPSHOT_RETRY_DELAYS):
+        self.on_status = on_status
+        self.retry_delays = retry_delays
+        self._statuses = queue.Queue()  # (target, error message or None)
+        self._pending = OrderedDict()  # target -> (rows, on_written)
+        self._retries = {}  # target -> (failed attempts, time of next attempt)
+        self._in_flight = None
+        self._stopping = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, target, rows, on_written=None):
+        with self._cond:
+            self._pending[target] = (rows, on_written)
+            self._cond.notify_all()
+
+    def pending(self, target):
+        """Whether rows for target are waiting to be written or being written."""
+        with self._cond:
+            return target in self._pending or self._in_flight == target
+
+    def flush(self, timeout=None):
+        """Wait until everything submitted has been written; False on timeout."""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def shutdown(self, timeout=10):
+        """Finish pending writes (up to timeout) and stop the thread."""
+        done = self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        return done
+
+    def _next_target(self):
+        # Caller holds the lock; returns a target that is due, waiting otherwise
+        while not self._stopping:
+            now = time.time()
+            for target in self._pending:
+                if self._retries.get(target, (0, 0))[1] <= now:
+                    return target
+            waits = [self._retries[t][1] - now for t in self._pending if t in self._retries]
+            self._cond.wait(min(waits) if waits else None)
+        return None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                target = self._next_target()
+                if target is None:
+                    return
+                rows, on_written = self._pending.pop(target)
+                self._in_flight = target
+            error = None
+            try:
+                self._write(target, rows)
+            except OSError as e:
+                error = e
+            except Exception as e:
+                error = e
+                print(f"ERROR: Unexpected error saving {os.path.basename(target)}: {e}")
+            if error is None and on_written is not None:
+                # The snapshot is on disk: a failing follow-up must not rewrite it
+                try:
+                    on_written()
+                except Exception as e:
+                    print(f"WARNING: Cleanup after saving {os.path.basename(target)} failed: {e}")
+            with self._cond:
+                self._in_flight = None
+                if error is None:
+                    self._retries.pop(target, None)
+                    delay = None
+                elif isinstance(error, OSError):
+                    attempts = self._retries.get(target, (0, 0))[0]
+                    delay = self.retry_delays[min(attempts, len(self.retry_delays) - 1)]
+                    self._retries[target] = (attempts + 1, time.time() + delay)
+                    # Retry these rows unless newer ones were submitted meanwhile
+                    self._pending.setdefault(target, (rows, on_written))
+                else:
+                    delay = None  # Retrying cannot fix bad data
+                self._cond.notify_all()
+            message = None
+            if error is not None:
+                message = str(error) if delay is None else f"{error} - retrying in {delay}s"
+            self._statuses.put((target, message))
+
+    def drain_statuses(self):
+        """Pass the queued write outcomes to on_status (call from the Tk thread)."""
+        while True:
+            try:
+                target, message = self._statuses.get_nowait()
+            except queue.Empty:
+                return
+            if self.on_status is not None:
+                self.on_status(target, message)
+
+    @staticmethod
+    def _write(target, rows):
+        temp_path = f"{target}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerows(rows)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, target)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+class LabelStore:
+    """
+    SQLite (WAL mode) mirror of the per-image label state of one folder.
+
+    One row per image keyed by the path relative to the folder, with indexed
+    session_id, trigger_id, label and flag columns so questions like "which
+    sessions have read failures" are answered from an index instead of a scan
+    over all images. Changes are written in batches, one transaction each.
+    The meta table records which revision CSV the rows correspond to, so a
+    folder is only re-imported when its CSV was written without the store.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS images ("
+        " path TEXT PRIMARY KEY, session_id TEXT, trigger_id TEXT, label TEXT,"
+        " ocr_readable INTEGER NOT NULL DEFAULT 0, false_noread INTEGER NOT NULL DEFAULT 0,"
+        " comment TEXT NOT NULL DEFAULT '')",
+        "CREATE INDEX IF NOT EXISTS idx_images_session ON images(session_id)",
+        "CREATE INDEX IF NOT EXISTS idx_images_trigger ON images(trigger_id)",
+        "CREATE INDEX IF NOT EXISTS idx_images_label ON images(label, false_noread, session_id)",
+        "CREATE INDEX IF NOT EXISTS idx_images_ocr ON images(ocr_readable, session_id)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    )
+    UPSERT = ("INSERT OR REPLACE INTO images (path, session_id, trigger_id, label, ocr_readable,"
+              " false_noread, comment) VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for statement in self.SCHEMA:
+                self._conn.execute(statement)
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    def get_meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def upsert(self, records):
+        """
+        Write (path, session_id, trigger_id, label, ocr_readable, false_noread, comment)
+        records in one transaction.
+        """
+        with self._conn:
+            self._conn.executemany(self.UPSERT, records)
+
+    def replace_all(self, records, revision):
+        """Replace every row (import of a revision CSV) in one transaction."""
+        with self._conn:
+            self._conn.execute("DELETE FROM images")
+            self._conn.executemany(self.UPSERT, records)
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('revision', ?)",
+                               (revision,))
+
+    def rows(self):
+        """Yield (path, label, ocr_readable, false_noread, comment) for every image."""
+        yield from self._conn.execute(
+            "SELECT path, label, ocr_readable, false_noread, comment FROM images")
+
+    def sessions(self, label=None, false_noread=None, ocr_readable=None):
+        """Sorted session ids having at least one image matching all given conditions."""
+        conditions, params = ["session_id IS NOT NULL"], []
+        for column, value in (("label", label), ("false_noread", false_noread),
+                              ("ocr_readable", ocr_readable)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(int(value) if isinstance(value, bool) else value)
+        query = f"SELECT DISTINCT session_id FROM images WHERE {' AND '.join(conditions)} ORDER BY session_id"
+        return [row[0] for row in self._conn.execute(query, params)]
+
+    def label_counts(self):
+        """Number of images per label."""
+        return dict(self._conn.execute("SELECT label, COUNT(*) FROM images GROUP BY label"))
+
+    def close(self):
+        self._conn.close()
+
+
+class ImagePrefetcher:
+    """Decode and pre-scale neighbouring images on background worker threads.
+
+    Frames are produced by render_func(path, params) and handed back to the
+    Tk thread through take(). Work that falls outside the latest scheduled
+    window (index jump, resize, filter change) is cancelled before it runs.
+    """
+
+    def __init__(self, render_func, max_workers=2, radius=PREFETCH_RADIUS):
+        self.render_func = render_func
+        self.radius = radius
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._futures = {}  # (path, params) -> Future
+
+    def schedule(self, paths, index, params):
+        """Prefetch the neighbours of paths[index], nearest (and forward) first."""
+        wanted = []
+        for distance in range(1, self.radius + 1):
+            for neighbor in (index + distance, index - distance):
+                if 0 <= neighbor < len(paths):
+                    wanted.append((paths[neighbor], params))
+
+        with self._lock:
+            # Cancel anything outside the new window (index jump, resize, filter change)
+            for key in list(self._futures):
+                if key not in wanted:
+                    self._futures.pop(key).cancel()
+            for key in wanted:
+                if key not in self._futures:
+                    self._futures[key] = self._executor.submit(self._run, key)
+
+    def take(self, path, params):
+        """Return the prepared frame for path, or None if it is not available."""
+        with self._lock:
+            future = self._futures.pop((path, params), None)
+        if future is None:
+            return None
+        if not future.running() and not future.done():
+            # Still queued: cheaper to decode now than to wait behind other work
+            future.cancel()
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def cancel(self):
+        """Drop all queued and prepared frames (e.g. after a filter change)."""
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+            self._futures.clear()
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, key):
+        with self._lock:
+            if key not in self._futures:
+                return None  # Superseded before a worker picked it up
+        path, params = key
+        return self.render_func(path, params)
+
+
+class PyramidBuilder:
+    """
+    Build power-of-two reductions (1/2, 1/4, ...) of decoded images on a background
+    thread. The levels are stored in the ImageCache as a child of the decoded image,
+    so they are evicted together with it. Only the latest request is kept queued:
+    flicking through images never builds pyramids for images already left behind.
+    """
+
+    def __init__(self, cache, min_size=TILE_SIZE):
+        self.cache = cache
+        self.min_size = min_size  # Stop once a level's shorter side would drop below this
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyramid")
+        self._lock = threading.Lock()
+        self._future = None
+        self._pending_key = None
+
+    @staticmethod
+    def pyramid_key(source_key):
+        return source_key + ('pyramid',)
+
+    def levels(self, source_key):
+        """Return the built levels for source_key (largest first), or None."""
+        return self.cache.get(self.pyramid_key(source_key))
+
+    def request(self, source_key, load):
+        """Build the pyramid of the image load() returns, unless it exists or is queued."""
+        if self.pyramid_key(source_key) in self.cache:
+            return
+        with self._lock:
+            if self._pending_key == source_key and self._future is not None and not self._future.done():
+                return
+            if self._future is not None:
+                self._future.cancel()
+            self._pending_key = source_key
+            self._future = self._executor.submit(self._build, source_key, load)
+
+    def cancel(self):
+        with self._lock:
+            if self._future is not None:
+                self._future.cancel()
+            self._future = None
+            self._pending_key = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _build(self, source_key, load):
+        try:
+            level = load()
+            levels = []
+            while min(level.size) >= 2 * self.min_size:
+                level = level.reduce(2)  # 2x2 box average, much cheaper than a resample
+                levels.append(level)
+            if levels:
+                self.cache.put(self.pyramid_key(source_key), tuple(levels), parent=source_key)
+        except Exception as e:
+            print(f"Image pyramid build failed: {e}")
+
+    @staticmethod
+    def nearest_level(source, levels, zoom):
+        """
+        Pick the smallest level that is still at least as large as the displayed image,
+        so a tile is never upscaled from a reduced level and never downscaled by 2x or more.
+        """
+        best = source
+        for level in levels or ():
+            if level.width < source.width * zoom:
+                break
+            best = level
+        return best
+
+
+class TileRenderer:
+    """
+    Draw a zoomed image on a Tk canvas as a grid of tiles, rendering only the tiles
+    that intersect the visible region.
+
+    Rendered tiles (PhotoImage + canvas item) are cached per zoom level: tiles of
+    other zoom levels are hidden rather than deleted, so zooming back is instant,
+    and the oldest tiles are dropped once TILE_CACHE_LIMIT is reached. Memory is
+    bounded by the viewport instead of by image size x zoom.
+
+    In draft mode tiles are resampled with NEAREST/BILINEAR; draft tiles are
+    re-rendered with LANCZOS the next time they are shown outside draft mode.
+    When pyramid levels are given, zoomed-out tiles are resampled from the nearest
+    level instead of the full-resolution source. Evicted full-size tiles are kept
+    hidden in a small pool and refilled in place, so panning does not allocate a
+    new Tk image and canvas item for every tile.
+    """
+
+    def __init__(self, canvas, tile_size=TILE_SIZE, cache_limit=TILE_CACHE_LIMIT):
+        self.canvas = canvas
+        self.tile_size = tile_size
+        self.cache_limit = cache_limit
+        self.source = None
+        self.zoom = 1.0
+        self.origin = (0, 0)  # Canvas coordinates of the image's top-left corner
+        self._source_key = None
+        self.draft = False
+        self._level = None  # Pyramid level tiles are resampled from
+        self._tiles = OrderedDict()  # (zoom, col, row) -> (PhotoImage, canvas item id, draft)
+        self._pool = []  # (PhotoImage, canvas item id) of hidden tiles ready for reuse
+
+    def set_image(self, source, source_key, zoom, origin, draft=False, levels=None):
+        """Show source (original resolution) at zoom with its top-left corner at origin."""
+        if source_key != self._source_key or origin != self.origin:
+            self.clear()
+        elif zoom != self.zoom:
+            # Keep tiles of the previous zoom level around, but out of sight
+            for (tile_zoom, _, _), (_, item, _) in self._tiles.items():
+                if tile_zoom != zoom:
+                    self.canvas.itemconfigure(item, state="hidden")
+        self.source = source
+        self._source_key = source_key
+        self.zoom = zoom
+        self.origin = origin
+        self.draft = draft
+        self._level = PyramidBuilder.nearest_level(source, levels, zoom)
+
+    def clear(self):
+        """Remove every tile from the canvas."""
+        self.canvas.delete("tile")
+        self._tiles.clear()
+        self._pool.clear()
+        self.source = None
+        self._source_key = None
+
+    def display_size(self):
+        width, height = self.source.size
+        return max(1, int(width * self.zoom)), max(1, int(height * self.zoom))
+
+    def update_visible(self):
+        """Render (or reveal) the tiles covering the visible part of the canvas."""
+        if self.source is None:
+            return
+        display_width, display_height = self.display_size()
+        left = self.canvas.canvasx(0) - self.origin[0]
+        top = self.canvas.canvasy(0) - self.origin[1]
+        right = left + self.canvas.winfo_width()
+        bottom = top + self.canvas.winfo_height()
+
+        ts = self.tile_size
+        first_col, last_col = max(0, int(left // ts)), min((display_width - 1) // ts, int(right // ts))
+        first_row, last_row = max(0, int(top // ts)), min((display_height - 1) // ts, int(bottom // ts))
+
+        visible = 0
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                key = (self.zoom, col, row)
+                tile = self._tiles.get(key)
+                if tile is not None and tile[2] and not self.draft:
+                    # Replace the quick preview tile with the high-quality one
+                    del self._tiles[key]
+                    self._recycle(tile[0], tile[1])
+                    tile = None
+                if tile is None:
+                    self._tiles[key] = self._render_tile(col, row, display_width, display_height)
+                    self._tiles.move_to_end(key)
+                else:
+                    self.canvas.itemconfigure(tile[1], state="normal")
+                    self._tiles.move_to_end(key)
+                visible += 1
+
+        # Drop least recently shown tiles, never the ones on screen
+        while len(self._tiles) > max(self.cache_limit, visible):
+            _, (photo, item, _) = self._tiles.popitem(last=False)
+            self._recycle(photo, item)
+
+    def _recycle(self, photo, item):
+        """Hide a tile that is no longer needed, keeping full-size ones for reuse."""
+        if (len(self._pool) < TILE_POOL_LIMIT
+                and (photo.width(), photo.height()) == (self.tile_size, self.tile_size)):
+            self.canvas.itemconfigure(item, state="hidden")
+            self._pool.append((photo, item))
+        else:
+            self.canvas.delete(item)
+
+    def _render_tile(self, col, row, display_width, display_height):
+        ts = self.tile_size
+        x0, y0 = col * ts, row * ts
+        x1, y1 = min(x0 + ts, display_width), min(y0 + ts, display_height)
+        if self.zoom == 1.0:
+            tile_img = self.source.crop((x0, y0, x1, y1))
+        else:
+            # Resample straight from the matching region of the pyramid level (sub-pixel box, no seams)
+            level = self._level
+            scale_x = self.zoom * self.source.width / level.width
+            scale_y = self.zoom * self.source.height / level.height
+            box = (x0 / scale_x, y0 / scale_y, x1 / scale_x, y1 / scale_y)
+            if not self.draft:
+                resample = Image.Resampling.LANCZOS
+            elif self.zoom > 1.0:
+                resample = Image.Resampling.NEAREST
+            else:
+                resample = Image.Resampling.BILINEAR  # NEAREST aliases badly when shrinking
+            tile_img = level.resize((x1 - x0, y1 - y0), resample, box=box)
+        x, y = self.origin[0] + x0, self.origin[1] + y0
+        if self._pool and tile_img.size == (ts, ts):
+            # Refill a pooled tile in place (all tiles of one source share the same mode)
+            photo, item = self._pool.pop()
+            photo.paste(tile_img)
+            self.canvas.coords(item, x, y)
+            self.canvas.itemconfigure(item, state="normal")
+        else:
+            photo = ImageTk.PhotoImage(tile_img)
+            item = self.canvas.create_image(x, y, anchor="nw", image=photo, tags=("tile",))
+        return photo, item, self.draft
+
+
+class RenderScheduler:
+    """
+    Coalesce bursts of render requests (wheel zoom, window resize) into one redraw.
+
+    request() paints a cheap preview at the next idle point - once per burst of
+    events - and restarts a timer; the high-quality render runs only after no new
+    request has arrived for settle_ms. All callbacks run on the Tk thread.
+    """
+
+    def __init__(self, root, preview_func, final_func, settle_ms=RENDER_SETTLE_MS):
+        self.root = root
+        self.preview_func = preview_func
+        self.final_func = final_func
+        self.settle_ms = settle_ms
+        self._preview_job = None
+        self._final_job = None
+
+    def request(self, preview_now=False):
+        """Ask for a redraw; preview_now paints the preview before returning."""
+        if preview_now:
+            self._cancel_preview()
+            self.preview_func()
+        elif self._preview_job is None:
+            self._preview_job = self.root.after_idle(self._run_preview)
+        if self._final_job is not None:
+            self.root.after_cancel(self._final_job)
+        self._final_job = self.root.after(self.settle_ms, self._run_final)
+
+    def pending(self):
+        return self._preview_job is not None or self._final_job is not None
+
+    def cancel(self):
+        """Drop any queued preview or final render (e.g. a full redraw is happening anyway)."""
+        self._cancel_preview()
+        if self._final_job is not None:
+            self.root.after_cancel(self._final_job)
+            self._final_job = None
+
+    def _cancel_preview(self):
+        if self._preview_job is not None:
+            self.root.after_cancel(self._preview_job)
+            self._preview_job = None
+
+    def _run_preview(self):
+        self._preview_job = None
+        self.preview_func()
+
+    def _run_final(self):
+        self._final_job = None
+        self._cancel_preview()
+        self.final_func()
+
+
 class ImageLabelTool:
     def generate_sessions_tree(self):
         """Create a Sessions Tree export grouped by session class and session ID."""
@@ -50,10 +2232,7 @@ class ImageLabelTool:
             messagebox.showinfo("Sessions Tree", "No images are currently loaded. Select a folder first.")
             return
 
-        sessions = defaultdict(list)
-        for image_path in self.all_image_paths:
-            session_id = self.get_session_number(image_path) or "unknown"
-            sessions[session_id].append(image_path)
+        sessions = dict(self._session_groups())  # Copy: new files may arrive while copying
 
         if not sessions:
             messagebox.showinfo("Sessions Tree", "No sessions were detected in the selected folder.")
@@ -193,14 +2372,7 @@ class ImageLabelTool:
         self.root.configure(bg="#FAFAFA")  # Very light gray background
         self.root.minsize(800, 500)  # Ultra-compact minimum window size
         self.root.geometry("1000x600")  # Ultra-compact window size
-        self.image_paths = []
-        self.current_index = 0
-        self.labels = {}
-        self.ocr_readable = {}  # Track OCR readable status per image
-        self.false_noread = {}  # Track False NoRead status per image
-        self.comments = {}  # Track comments for each image
-        self.folder_path = None
-        self.csv_filename = None
+        self._init_label_state()
         self.scale_1to1 = False  # Track if we're in 1:1 scale mode
         self.current_scale_factor = 1.0  # Track current scale factor
         self.zoom_level = 1.0  # Track zoom level for manual zoom
@@ -210,6 +2382,21 @@ class ImageLabelTool:
         # Track previously seen files for new file detection
         self.previously_seen_files = set()
         
+        # Decoded images and fitted renditions shared by the viewer and prefetch workers
+        self.image_cache = ImageCache()
+        
+        # Background decoding of the next/previous images for fast navigation
+        self.prefetcher = ImagePrefetcher(self._render_fitted_image)
+        
+        # Reduced copies of the decoded image for cheap zoom steps
+        self.pyramid_builder = PyramidBuilder(self.image_cache)
+        
+        # Local downscaled copies of (network) images for the fitted view
+        self.proxy_cache = ProxyCache()
+        
+        # Show the outcome of background CSV snapshot writes in the status bar
+        self._poll_snapshot_status()
+        
         # Session index tracking - removed, no longer used
         # self.session_indices = {}  # Maps session_id to session_index
         # self.next_session_index = 1  # Next index to assign to a newly classified session
@@ -233,6 +2420,55 @@ class ImageLabelTool:
         
         self.setup_ui()
 
+    def _init_label_state(self):
+        """
+        Per-image label state and its persistence (no Tk widgets): record store, session
+        index, folder index, CSV snapshots, journal, undo/redo, label store, shared deltas.
+        Called by __init__; tests build the same state on an app without a window.
+        """
+        self.image_paths = []
+        self.current_index = 0
+        # Label / OCR readable / False NoRead / comment per image, stored by column
+        self.records = ImageRecordStore(self._describe_image_record)
+        self._reset_image_records()
+        self.session_index = None  # Images grouped by session, built per folder
+        self._session_labels = None  # Session labels and counters of the session index
+        self.folder_path = None
+        self.csv_filename = None
+        self.loaded_revision = None  # Revision CSV the labels of the folder were loaded from
+        
+        # Saved listing of the folder's images with their parsed filename fields
+        self.folder_index = FolderIndex(self._describe_image_file)
+        
+        # CSV snapshots are written by a background thread; status goes to the status bar
+        self.snapshot_writer = SnapshotWriter(on_status=self._on_snapshot_status)
+        self._failed_snapshots = set()  # Targets whose last write attempt failed
+        self._snapshot_status_job = None
+        
+        # Append-only log of label changes between CSV snapshots
+        self.label_journal = None
+        self._journal_sync_job = None
+        self._last_compaction = time.time()
+        
+        # Undo/redo of labeling actions: each action is a list of (path, old fields, new fields)
+        self._undo_stack = deque(maxlen=UNDO_LIMIT)
+        self._redo_stack = []
+        self._pending_undo = []  # Changes of the action in progress (closed by save_changes)
+        self._replaying_undo = False
+        
+        # Stats CSV regeneration is throttled to STATS_CSV_INTERVAL_S
+        self._stats_csv_dirty = False
+        self._stats_csv_job = None
+        self._export_running = False  # Data export in the background
+        
+        # Optional SQLite mirror of the labels; changed paths are written in batches
+        self.label_store = None
+        self._store_dirty = set()
+        
+        # Delta files of the operators labeling the same shared folder
+        self.shared_deltas = None
+        self._delta_poll_job = None
+
     def setup_logging(self):
         """Set up logging for barcode detection activities"""
         # Create logs directory if it doesn't exist
@@ -391,7 +2627,15 @@ class ImageLabelTool:
                                                    command=self.on_histogram_eq_changed,
                                                    bg="#E8E8E8", font=("Arial", 9, "bold"),
                                                    selectcolor="white", padx=5, pady=2)
-        self.histogram_eq_checkbox.pack(side=tk.LEFT, padx=(0, 10))
+        self.histogram_eq_checkbox.pack(side=tk.LEFT, padx=(0, 2))
+        
+        # Histogram equalization mode (color luminance or single-channel grayscale)
+        self.histogram_eq_mode_var = tk.StringVar(value="Color")
+        self.histogram_eq_mode_menu = tk.OptionMenu(toolbar_frame, self.histogram_eq_mode_var,
+                                                    *HIST_EQ_MODES.keys(),
+                                                    command=lambda value: self.on_histogram_eq_changed())
+        self.histogram_eq_mode_menu.config(bg="#E8E8E8", font=("Arial", 9), relief="flat", highlightthickness=0)
+        self.histogram_eq_mode_menu.pack(side=tk.LEFT, padx=(0, 10))
 
         # Export button for current filter
         self.btn_gen_filter_folder = tk.Button(toolbar_frame, text="Gen Filter Folder", 
@@ -412,7 +2656,28 @@ class ImageLabelTool:
                                             command=self.generate_sessions_csv,
                                             bg="#FF5722", fg="white", font=("Arial", 10, "bold"),
                                             padx=8, pady=3, relief="flat")
-        self.btn_gen_sessions_csv.pack(side=tk.LEFT, padx=(0, 10))
+        self.btn_gen_sessions_csv.pack(side=tk.LEFT, padx=(0, 5))
+
+        # Write the statistics CSV now instead of waiting for the periodic update
+        self.btn_export_stats = tk.Button(toolbar_frame, text="Export Stats", 
+                                        command=self.export_stats_csv,
+                                        bg="#795548", fg="white", font=("Arial", 10, "bold"),
+                                        padx=8, pady=3, relief="flat")
+        self.btn_export_stats.pack(side=tk.LEFT, padx=(0, 5))
+
+        # Per-image and per-session tables (JSON Lines / Parquet) for downstream analysis
+        self.btn_export_data = tk.Button(toolbar_frame, text="Export Data", 
+                                       command=self.export_label_tables,
+                                       bg="#607D8B", fg="white", font=("Arial", 10, "bold"),
+                                       padx=8, pady=3, relief="flat")
+        self.btn_export_data.pack(side=tk.LEFT, padx=(0, 5))
+
+        # Contact sheet of the current session for labeling all sub-images at once
+        self.btn_session_sheet = tk.Button(toolbar_frame, text="Session Sheet (Ctrl+G)", 
+                                         command=self.show_session_sheet,
+                                         bg="#00897B", fg="white", font=("Arial", 10, "bold"),
+                                         padx=8, pady=3, relief="flat")
+        self.btn_session_sheet.pack(side=tk.LEFT, padx=(0, 10))
 
         # Main content area - horizontal layout (now without left panel)
         content_frame = tk.Frame(main_frame, bg="#FAFAFA")
@@ -449,10 +2714,21 @@ class ImageLabelTool:
         self.canvas = tk.Canvas(image_frame, bg="#FAFAFA", relief="solid", bd=2)
         
         # Scrollbars
-        self.h_scrollbar = tk.Scrollbar(image_frame, orient="horizontal", command=self.canvas.xview)
-        self.v_scrollbar = tk.Scrollbar(image_frame, orient="vertical", command=self.canvas.yview)
+        self.h_scrollbar = tk.Scrollbar(image_frame, orient="horizontal", command=self.on_scrollbar_x)
+        self.v_scrollbar = tk.Scrollbar(image_frame, orient="vertical", command=self.on_scrollbar_y)
         self.canvas.configure(xscrollcommand=self.h_scrollbar.set, yscrollcommand=self.v_scrollbar.set)
         
+        # Zoomed views are drawn tile by tile, only where the canvas is visible
+        self.tile_renderer = TileRenderer(self.canvas)
+        # Persistent canvas item for the fitted view, refilled in place when the size allows
+        self.tk_img = None
+        self._tk_img_format = None  # (size, mode) of the image held by tk_img
+        self._fitted_item = None
+        self._scrollregion = None
+        self.render_scheduler = RenderScheduler(self.root,
+                                                lambda: self._render_current_image(draft=True),
+                                                self._render_current_image)
+        
         # Grid layout for canvas and scrollbars
         self.canvas.grid(row=0, column=0, sticky="nsew")
         self.h_scrollbar.grid(row=1, column=0, sticky="ew")
@@ -477,6 +2753,12 @@ class ImageLabelTool:
                              font=("Arial", 12), fg="#424242")  # Smaller font
         self.status.pack(pady=(5, 2))  # Reduced from (10, 5) to (5, 2)
         
+        # Result of the last background CSV save (errors stay visible until a save succeeds)
+        self.save_status_var = tk.StringVar()
+        self.save_status_label = tk.Label(center_panel, textvariable=self.save_status_var, bg="#FAFAFA",
+                                          font=("Arial", 9), fg="#757575")
+        self.save_status_label.pack(pady=(0, 2))
+        
         # Navigation and radio buttons for labels (below image) - compact spacing
         self.label_var = tk.StringVar(value=LABELS[0])
         
@@ -882,6 +3164,18 @@ class ImageLabelTool:
         self.root.bind('<Control-d>', self.session_diagnostic_shortcut)
         self.root.bind('<Control-D>', self.session_diagnostic_shortcut)
         
+        # Session contact sheet shortcut
+        self.root.bind('<Control-g>', self.session_sheet_shortcut)
+        self.root.bind('<Control-G>', self.session_sheet_shortcut)
+        
+        # Undo / redo of labeling actions
+        self.root.bind('<Control-z>', self.undo_shortcut)
+        self.root.bind('<Control-Z>', self.undo_shortcut)
+        self.root.bind('<Control-Shift-z>', self.redo_shortcut)
+        self.root.bind('<Control-Shift-Z>', self.redo_shortcut)
+        self.root.bind('<Control-y>', self.redo_shortcut)
+        self.root.bind('<Control-Y>', self.redo_shortcut)
+        
         # Set focus to root window to capture keyboard events
         self.root.focus_set()
         
@@ -968,6 +3262,29 @@ class ImageLabelTool:
             self.root.after_cancel(self.auto_timer_job)
             self.auto_timer_job = None
         
+        # Fold the journaled changes into the CSV snapshot
+        if self.label_journal is not None and self.label_journal.event_count:
+            self.save_csv()
+        self._close_label_journal()
+        self._close_shared_deltas()
+        self._flush_stats_csv()
+        self._close_label_store()
+        if not self.snapshot_writer.shutdown(timeout=10):
+            # Nothing is lost: the journal is only discarded after a successful write
+            print("WARNING: CSV snapshot could not be written before closing; "
+                  "changes remain in the label journal and are replayed on next load")
+        if self._snapshot_status_job is not None:
+            self.root.after_cancel(self._snapshot_status_job)
+            self._snapshot_status_job = None
+        
+        # Stop background image decoding
+        self.prefetcher.shutdown()
+        self.pyramid_builder.shutdown()
+        self.proxy_cache.shutdown()
+        cache_stats = self.image_cache.stats()
+        self.logger.info(f"Image cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                         f"{cache_stats['entries']} entries ({cache_stats['bytes'] // (1024 * 1024)} MB)")
+        
         # Close the application
         self.root.destroy()
 
@@ -975,35 +3292,44 @@ class ImageLabelTool:
         folder = filedialog.askdirectory()
         if not folder:
             return
+        # Journaled changes of the previous folder stay on disk and are replayed on reopen
+        self._close_label_journal()
+        self._close_shared_deltas()
+        self._flush_stats_csv()
+        # Undo history holds paths of the previous folder
+        self._undo_stack.clear()
+        self._redo_stack = []
+        self._pending_undo = []
         self.folder_path = folder
         
+        # Images of the previous folder will not be shown again
+        self.prefetcher.cancel()
+        self.pyramid_builder.cancel()
+        self.image_cache.clear()
+        self.proxy_cache.open_folder(folder)
+        self._open_label_store(folder)
+        
         # Update the folder path display
         self.folder_path_var.set(f"Current folder: {folder}")
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.csv_filename = os.path.join(folder, f"revision_{timestamp}.csv")
         
-        # Load all image files from the directory
-        all_files = [f for f in os.listdir(folder)
-                     if f.lower().endswith((".png", ".jpg", ".jpeg", ".bmp", ".gif"))]
-        
-        self.all_image_paths = []
-        for f in all_files:
-            # Normalize all image paths consistently
-            image_path = os.path.normpath(os.path.join(folder, f))
-            self.all_image_paths.append(image_path)
-
-        # Custom sort by trigger ID and sub-image count
-        self.all_image_paths.sort(key=self.get_image_sort_key)
+        # Load all image files from the directory: normalized paths sorted by trigger ID
+        # and sub-image count, from the saved index (only new files are parsed)
+        FilenameRecord.forget()
+        self.folder_index.open(folder)
+        self.all_image_paths = list(self.folder_index.paths())
         self.current_index = 0
-        self.labels = {}  # Reset labels for new folder
-        self.false_noread = {}  # Reset false_noread for new folder
-        self.comments = {}  # Reset comments for new folder
+        self._reset_image_records(self.all_image_paths)  # Reset labels for new folder
+        self.session_index = SessionIndex(self.get_session_number, self.get_image_sort_key)
+        self.session_index.rebuild(self.all_image_paths)
         
         # Initialize previously seen files with current files
         self.previously_seen_files = set(self.all_image_paths)
         
         self.load_csv()  # Try to load existing CSV if any
+        self._open_shared_deltas(folder)  # Merge the changes of other operators on top
         self.auto_detect_total_groups()  # Auto-detect total number of sessions from filenames
         self.apply_filter()  # Apply current filter to show appropriate images
         
@@ -1014,34 +3340,117 @@ class ImageLabelTool:
         
         # Set initial state for Jump to functionality after UI is fully initialized
         self.root.after_idle(self.update_jump_button_state)
+        
+        # Build local proxies in the background, starting with the images shown first
+        shown = set(self.image_paths)
+        self.proxy_cache.build(self.image_paths + [p for p in self.all_image_paths if p not in shown])
+
+    def _describe_image_file(self, image_path):
+        """Fields of an image file kept in the folder index: sort key, session ID, numeric ID"""
+        record = FilenameRecord.of(image_path)
+        return record.sort_key, record.session_id, record.trigger_id
+
+    def _describe_image_record(self, image_path):
+        """(session ID, numeric ID) of an image, from the folder index when it has the file"""
+        index = getattr(self, 'folder_index', None)
+        entry = index.entry(image_path) if index is not None and index.folder else None
+        if entry is not None and os.path.dirname(image_path) == index.folder:
+            return entry[3], entry[4]
+        _, session_id, id_number = self._describe_image_file(image_path)
+        return session_id, id_number
+
+    def _reset_image_records(self, image_paths=()):
+        """Empty the record store and register image_paths (in display order)"""
+        self.records.listener = self._on_record_changed
+        self.records.clear()
+        self.records.list_paths(image_paths)
+        self.labels = self.records.labels
+        self.ocr_readable = self.records.ocr_readable
+        self.false_noread = self.records.false_noread
+        self.comments = self.records.comments
+
+    def _session_groups(self):
+        """Session ID -> image paths of all_image_paths (read-only), from the session index"""
+        index = self._synced_session_index()
+        if index is None:
+            # First use, or the image list was replaced without updating the index
+            index = self.session_index = SessionIndex(self.get_session_number, self.get_image_sort_key)
+            index.rebuild(getattr(self, 'all_image_paths', []))
+        return index.sessions
+
+    def _uses_record_store(self):
+        """Whether the label dicts are the record store's views (plain dicts in some tests)"""
+        records = getattr(self, 'records', None)
+        return (records is not None and self.labels is records.labels and self.ocr_readable is records.ocr_readable
+                and self.false_noread is records.false_noread and self.comments is records.comments)
+
+    def _session_label_cache(self):
+        """
+        The session label cache brought up to date, or None when the label dicts are
+        not the record store's (their changes are not observed: callers scan instead)
+        """
+        if not self._uses_record_store():
+            return None
+        self._session_groups()  # The index must describe the current all_image_paths
+        cache = getattr(self, '_session_labels', None)
+        if cache is None or cache.index is not self.session_index:
+            cache = self._session_labels = SessionLabelCache(self.session_index, self._classify_session,
+                                                             self._classify_all_sessions)
+        return cache.refresh()
+
+    def _classify_all_sessions(self):
+        """(session ID, _classify_session() state) of every session of all_image_paths, vectorized"""
+        paths = self.all_image_paths
+        if not self.records.lists(paths):
+            self.records.list_paths(paths)
+        label_codes, flags, session_codes, label_names, session_ids = self.records.arrays(listed_only=True)
+        per_label, ocr_readable, false_noread, classes = session_classes(
+            label_codes, flags, session_codes, label_names, len(session_ids))
+        images = per_label.sum(axis=1)
+        labels = [None] + SESSION_CLASSES  # classes -1 -> None
+        for code, count, ocr_count, false_noread_count, session_class in zip(
+                np.flatnonzero(images).tolist(), images[images > 0].tolist(), ocr_readable[images > 0].tolist(),
+                false_noread[images > 0].tolist(), classes[images > 0].tolist()):
+            session_id = session_ids[code]
+            if session_id:
+                yield session_id, (labels[session_class + 1], ocr_count > 0, false_noread_count == count)
+
+    def _classify_session(self, session_paths):
+        """(session label or None, any image OCR readable, all images False NoRead) of one session"""
+        if any(self.labels.get(path, "(Unclassified)") != "(Unclassified)" for path in session_paths):
+            label = self.determine_session_classification(None, session_image_paths=session_paths)
+        else:
+            label = None  # Not counted as a session until an image is classified
+        return (label, any(self.ocr_readable.get(path, False) for path in session_paths),
+                all(self.false_noread.get(path, False) for path in session_paths))
+
+    def _on_record_changed(self, path):
+        """Record store listener (any thread): reclassify the session of path on next use"""
+        cache = getattr(self, '_session_labels', None)
+        if cache is not None:
+            cache.mark_path(path)
+
+    def _synced_session_index(self):
+        """The session index if it describes the current all_image_paths, else None"""
+        index = getattr(self, 'session_index', None)
+        if index is not None and index.describes(getattr(self, 'all_image_paths', [])):
+            return index
+        return None
+
+    def _indexed_folder(self):
+        """The folder index if it describes the current folder, else None"""
+        index = getattr(self, 'folder_index', None)
+        if index is not None and self.folder_path and index.folder == os.path.normpath(os.path.abspath(self.folder_path)):
+            return index
+        return None
 
     def get_image_sort_key(self, image_path):
         """
         Extract sorting key from image filename for proper ordering.
         Expected format: XXXXXXXXXX_XXXX_XXX_timestamp.jpg
-        Returns tuple (trigger_id, sub_image_count) for sorting.
+        Returns tuple (trigger_id, sub_image_count) for sorting, (0, 0) if parsing fails.
         """
-        try:
-            filename = os.path.basename(image_path)
-            # Split by underscore to get parts
-            parts = filename.split('_')
-            
-            if len(parts) >= 2:
-                # First part: trigger ID (remove leading zeros for numeric comparison)
-                trigger_id_str = parts[0]
-                trigger_id = int(trigger_id_str) if trigger_id_str.isdigit() else 0
-                
-                # Second part: sub-image count
-                sub_image_str = parts[1]
-                sub_image_count = int(sub_image_str) if sub_image_str.isdigit() else 0
-                
-                return (trigger_id, sub_image_count)
-            else:
-                # Fallback to filename if parsing fails
-                return (0, 0)
-        except (ValueError, IndexError):
-            # Fallback to filename sorting if parsing fails
-            return (0, 0)
+        return FilenameRecord.of(image_path).sort_key
 
     def update_log_file_button_state(self):
         """Enable/disable the log file selection and refresh buttons based on folder selection"""
@@ -1073,8 +3482,12 @@ class ImageLabelTool:
                 self.log_results_text.config(state=tk.DISABLED)
 
     def show_image(self):
+        # A full redraw supersedes any queued zoom/resize render
+        self.render_scheduler.cancel()
         if not self.image_paths:
+            self.tile_renderer.clear()
             self.canvas.delete("all")
+            self._fitted_item = None
             self.status_var.set("No images loaded.")
             self.scale_info_var.set("")
             return
@@ -1088,41 +3501,90 @@ class ImageLabelTool:
             return
             
         path = self.image_paths[self.current_index]
-        img = Image.open(path)
-        original_width, original_height = img.size
-            # Debug: uncomment for troubleshooting
-            # print(f"📂 LOAD DEBUG: Loaded image {os.path.basename(path)} size ({original_width}x{original_height})")
+        original_width, original_height = self._render_current_image()
         
-        # Apply histogram equalization if enabled
-        if hasattr(self, 'histogram_eq_enabled') and self.histogram_eq_enabled.get():
-            img = self.apply_histogram_equalization(img)
-            # Debug: uncomment for troubleshooting
-            # new_width, new_height = img.size
-            # print(f"📂 LOAD DEBUG: After histogram equalization size ({new_width}x{new_height})")        # Clear any previous content and set normal background
+        label = self.labels.get(path, LABELS[0])
+        self.label_var.set(label)
+        
+        # Update OCR readable checkbox status
+        ocr_status = self.ocr_readable.get(path, False)
+        self.ocr_readable_var.set(ocr_status)
+        
+        # Update False NoRead checkbox status
+        false_noread_status = self.false_noread.get(path, False)
+        self.false_noread_var.set(false_noread_status)
+        
+        # Update False NoRead checkbox enabled/disabled state
+        self.update_false_noread_checkbox_state()
+        
+        # Update comment field with current image's comment
+        if hasattr(self, 'comment_text'):
+            comment_text = self.comments.get(path, "")
+            # Temporarily disable event bindings to prevent triggering on_comment_change during programmatic updates
+            self.comment_text.unbind('<KeyRelease>')
+            self.comment_text.unbind('<FocusOut>')
+            
+            # Clear and set the Text widget content
+            self.comment_text.delete("1.0", tk.END)
+            self.comment_text.insert("1.0", comment_text)
+            
+            # Re-bind the events after programmatic update is complete
+            self.comment_text.bind('<KeyRelease>', self.on_comment_change)
+            self.comment_text.bind('<FocusOut>', self.on_comment_change)
+            
+            # Update comment field state based on classification and filter status
+            self.update_comment_field_state()
+        
+        # Update current image filename in comment section
+        if hasattr(self, 'current_image_filename_var'):
+            filename = os.path.basename(path)
+            self.current_image_filename_var.set(f"📄 {filename}")
+        
+        self.status_var.set(f"{os.path.basename(path)} ({self.current_index+1}/{len(self.image_paths)}) - {original_width}x{original_height}px")
+        
+        # Update progress and label status
+        self.update_progress_display()
+        self.update_current_label_status()
+        
+        # Update navigation buttons
+        self.update_navigation_buttons()
+        self.update_current_label_status()
+        
+        # Update navigation buttons
+        self.update_navigation_buttons()
+        
+        # Start preparing the neighbouring images for the next keypress
+        self._schedule_prefetch()
+
+    def _render_current_image(self, draft=False):
+        """
+        Draw the current image on the canvas at the current zoom/fit and update the scale
+        display. Only touches the canvas, so zoom and resize can redraw without refreshing
+        the label panel. With draft=True a cheap preview is painted (see RenderScheduler).
+        Returns the original (width, height) of the image.
+        """
+        path = self.image_paths[self.current_index]
+        
+        # Set normal background (the canvas items themselves are reused, not deleted)
         self.canvas.configure(bg="black")
-        self.canvas.delete("all")
         
-        # Get canvas dimensions (reduced for ultra-compact layout)
-        canvas_width = max(350, self.canvas.winfo_width())  # Reduced from 400
-        canvas_height = max(250, self.canvas.winfo_height())  # Reduced from 300
-        if canvas_width <= 1 or canvas_height <= 1:
-            canvas_width, canvas_height = 350, 350  # Smaller default size
+        canvas_width, canvas_height = self._get_canvas_size()
         
         if self.scale_1to1:
+            eq_mode = self._get_hist_eq_mode()
+            img = self._get_decoded_image(path, eq_mode)
+            original_width, original_height = img.size
+            decoded_key = self.image_cache.key(path, 'decoded', eq_mode)
+            pyramid_levels = self.pyramid_builder.levels(decoded_key)
+            if pyramid_levels is None:
+                self.pyramid_builder.request(decoded_key, lambda: img)
+            
             # Show image at 1:1 scale with current zoom level
+            # (only the visible tiles are resampled, see TileRenderer)
             scale_factor = self.zoom_level
             new_width = int(original_width * scale_factor)
             new_height = int(original_height * scale_factor)
             
-            if scale_factor != 1.0:
-                display_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                # Debug: uncomment for troubleshooting
-                # print(f"🔧 RESIZE DEBUG: {original_width}x{original_height} * {scale_factor:.3f} = {new_width}x{new_height} -> actual {display_img.size}")
-            else:
-                display_img = img
-                # Debug: uncomment for troubleshooting  
-                # print(f"🔧 RESIZE DEBUG: No resize needed, keeping {display_img.size}")
-            
             self.current_scale_factor = scale_factor
             scale_text = f"Scale: {scale_factor:.2f}\n({scale_factor*100:.1f}%)"
             
@@ -1134,7 +3596,7 @@ class ImageLabelTool:
             # Set scroll region with padding
             scroll_width = new_width + 2 * padding_x
             scroll_height = new_height + 2 * padding_y
-            self.canvas.configure(scrollregion=(0, 0, scroll_width, scroll_height))
+            self._set_scrollregion((0, 0, scroll_width, scroll_height))
             
             # Store expected dimensions for centering verification
             self._expected_scroll_width = scroll_width
@@ -1160,6 +3622,23 @@ class ImageLabelTool:
                 self.h_scrollbar.grid_remove()
                 self.v_scrollbar.grid_remove()
         else:
+            self.tile_renderer.clear()
+            
+            params = self._fitted_render_params()
+            prepared = self.image_cache.get(self.image_cache.key(path, 'fitted') + params)
+            if prepared is None and draft and getattr(self, '_fitted_display', None):
+                # Stretch the last fitted rendition of this image to the new size
+                prepared = self._preview_fitted_image(path, params)
+            if prepared is None:
+                # Use the frame prepared by the prefetch workers when available
+                prepared = self.prefetcher.take(path, params)
+            if prepared is None:
+                prepared = self._render_fitted_image(path, params)
+            display_img, (original_width, original_height) = prepared
+            self._fitted_display = (path, display_img)
+            # No pyramid here: it needs the full-resolution original, which the fitted view
+            # avoids (reduced decode, local proxy). It is built when the 1:1 view is entered.
+            
             # Calculate scale factor needed to fit image (fitted mode)
             scale_x = canvas_width / original_width
             scale_y = canvas_height / original_height
@@ -1167,85 +3646,159 @@ class ImageLabelTool:
             self.current_scale_factor = scale_factor
             self.zoom_level = scale_factor  # Sync zoom level with fitted scale
             
-            # Resize image to fit available space while maintaining aspect ratio
-            display_img = img.copy()
-            display_img.thumbnail((canvas_width, canvas_height), Image.Resampling.LANCZOS)
-            
             scale_text = f"Scale: {scale_factor:.2f}\n({scale_factor*100:.1f}%)\nFitted to window"
             
             # Reset scroll region for fitted mode and center the image
             img_width, img_height = display_img.size
-            self.canvas.configure(scrollregion=(0, 0, canvas_width, canvas_height))
+            self._set_scrollregion((0, 0, canvas_width, canvas_height))
             # Hide scrollbars in fitted mode
             self.h_scrollbar.grid_remove()
             self.v_scrollbar.grid_remove()
         
-        self.tk_img = ImageTk.PhotoImage(display_img)
-        
-        # Center the image in the canvas
-        img_width, img_height = display_img.size
         if self.scale_1to1:
             # For 1:1 mode, place image with padding offset for proper centering
             # Debug: uncomment for troubleshooting
             # print(f"🖼️  IMAGE DEBUG: Placing image at ({self.image_padding_x}, {self.image_padding_y})")
-            self.canvas.create_image(self.image_padding_x, self.image_padding_y, anchor="nw", image=self.tk_img)
+            if self._fitted_item is not None:
+                self.canvas.itemconfigure(self._fitted_item, state="hidden")
+            self.tile_renderer.set_image(img, (path, eq_mode), scale_factor,
+                                         (self.image_padding_x, self.image_padding_y), draft=draft,
+                                         levels=pyramid_levels)
+            self.tile_renderer.update_visible()
         else:
             # For fitted mode, center the image
             center_x = canvas_width // 2
             center_y = canvas_height // 2
-            self.canvas.create_image(center_x, center_y, anchor="center", image=self.tk_img)
+            self._show_fitted_image(display_img, center_x, center_y)
         
         self.scale_info_var.set(scale_text)
+        return original_width, original_height
+
+    def _show_fitted_image(self, display_img, x, y):
+        """Show display_img centered at (x, y), reusing the PhotoImage and canvas item"""
+        image_format = (display_img.size, display_img.mode)
+        if self.tk_img is not None and self._tk_img_format == image_format:
+            # Same geometry: update the pixels of the existing Tk image in place
+            self.tk_img.paste(display_img)
+        else:
+            self.tk_img = ImageTk.PhotoImage(display_img)
+            self._tk_img_format = image_format
         
-        label = self.labels.get(path, LABELS[0])
-        self.label_var.set(label)
-        
-        # Update OCR readable checkbox status
-        ocr_status = self.ocr_readable.get(path, False)
-        self.ocr_readable_var.set(ocr_status)
-        
-        # Update False NoRead checkbox status
-        false_noread_status = self.false_noread.get(path, False)
-        self.false_noread_var.set(false_noread_status)
-        
-        # Update False NoRead checkbox enabled/disabled state
-        self.update_false_noread_checkbox_state()
-        
-        # Update comment field with current image's comment
-        if hasattr(self, 'comment_text'):
-            comment_text = self.comments.get(path, "")
-            # Temporarily disable event bindings to prevent triggering on_comment_change during programmatic updates
-            self.comment_text.unbind('<KeyRelease>')
-            self.comment_text.unbind('<FocusOut>')
-            
-            # Clear and set the Text widget content
-            self.comment_text.delete("1.0", tk.END)
-            self.comment_text.insert("1.0", comment_text)
-            
-            # Re-bind the events after programmatic update is complete
-            self.comment_text.bind('<KeyRelease>', self.on_comment_change)
-            self.comment_text.bind('<FocusOut>', self.on_comment_change)
-            
-            # Update comment field state based on classification and filter status
-            self.update_comment_field_state()
-        
-        # Update current image filename in comment section
-        if hasattr(self, 'current_image_filename_var'):
-            filename = os.path.basename(path)
-            self.current_image_filename_var.set(f"📄 {filename}")
-        
-        self.status_var.set(f"{os.path.basename(path)} ({self.current_index+1}/{len(self.image_paths)}) - {original_width}x{original_height}px")
-        
-        # Update progress and label status
-        self.update_progress_display()
-        self.update_current_label_status()
-        
-        # Update navigation buttons
-        self.update_navigation_buttons()
-        self.update_current_label_status()
-        
-        # Update navigation buttons
-        self.update_navigation_buttons()
+        if self._fitted_item is None:
+            self._fitted_item = self.canvas.create_image(x, y, anchor="center", image=self.tk_img,
+                                                         tags=("fitted",))
+        else:
+            self.canvas.coords(self._fitted_item, x, y)
+            self.canvas.itemconfigure(self._fitted_item, image=self.tk_img, state="normal")
+
+    def _set_scrollregion(self, region):
+        """Reconfigure the canvas scroll region only when the geometry actually changed"""
+        if region != self._scrollregion:
+            self.canvas.configure(scrollregion=region)
+            self._scrollregion = region
+
+    def _preview_fitted_image(self, path, params):
+        """Quickly rescale the last fitted rendition of path to params (draft pass only)"""
+        shown_path, shown_img = self._fitted_display
+        if shown_path != path:
+            return None
+        canvas_width, canvas_height, _ = params
+        original_size = self._get_image_size(path)
+        fit_scale = min(canvas_width / original_size[0], canvas_height / original_size[1], 1.0)
+        size = (max(1, int(original_size[0] * fit_scale)), max(1, int(original_size[1] * fit_scale)))
+        return shown_img.resize(size, Image.Resampling.BILINEAR), original_size
+
+    def request_render(self, preview_now=False):
+        """Redraw the current image through the render scheduler (zoom, resize)"""
+        if self.image_paths:
+            self.render_scheduler.request(preview_now)
+
+    def _get_canvas_size(self):
+        """Return the usable canvas size for image display"""
+        # Get canvas dimensions (reduced for ultra-compact layout)
+        canvas_width = max(350, self.canvas.winfo_width())  # Reduced from 400
+        canvas_height = max(250, self.canvas.winfo_height())  # Reduced from 300
+        if canvas_width <= 1 or canvas_height <= 1:
+            canvas_width, canvas_height = 350, 350  # Smaller default size
+        return canvas_width, canvas_height
+
+    def _get_hist_eq_mode(self):
+        """Return the active histogram equalization mode ('lab'/'gray'), or None when disabled"""
+        if not (hasattr(self, 'histogram_eq_enabled') and self.histogram_eq_enabled.get()):
+            return None
+        if hasattr(self, 'histogram_eq_mode_var'):
+            return HIST_EQ_MODES.get(self.histogram_eq_mode_var.get(), "lab")
+        return "lab"
+
+    def _fitted_render_params(self):
+        """Return the parameters that determine a fitted rendition (read on the Tk thread)"""
+        canvas_width, canvas_height = self._get_canvas_size()
+        return (canvas_width, canvas_height, self._get_hist_eq_mode())
+
+    def _get_decoded_image(self, path, eq_mode=None):
+        """Return the full-resolution image (optionally equalized) from the image cache"""
+        def decode():
+            if eq_mode:
+                # Equalize the cached plain decode instead of reading the file again
+                return self.apply_histogram_equalization(self._get_decoded_image(path), eq_mode)
+            img = Image.open(path)
+            img.load()
+            return img
+        return self.image_cache.get_or_create(self.image_cache.key(path, 'decoded', eq_mode), decode)
+
+    def _get_image_size(self, path):
+        """Return the original (width, height) of an image without decoding it twice"""
+        def read_size():
+            with Image.open(path) as img:
+                return img.size
+        return self.image_cache.get_or_create(self.image_cache.key(path, 'size'), read_size)
+
+    def _render_fitted_image(self, path, params):
+        """
+        Decode an image and scale it to fit the canvas, going through the image cache.
+        Safe to call from worker threads: it must not touch any Tk object.
+        Returns (display_img, (original_width, original_height)).
+        """
+        canvas_width, canvas_height, eq_mode = params
+        
+        def render():
+            if eq_mode:
+                # Equalize the (cached) downscaled rendition, never the full-resolution image,
+                # so toggling Hist EQ only costs one CLAHE pass on a canvas-sized image
+                display_img, original_size = self._render_fitted_image(path, (canvas_width, canvas_height, None))
+                return self.apply_histogram_equalization(display_img, eq_mode), original_size
+            
+            # A local proxy is much cheaper to read than the original on a network share
+            proxy = self.proxy_cache.lookup(path, self.image_cache.signature(path),
+                                            (canvas_width, canvas_height))
+            if proxy is not None:
+                proxy_path, original_size = proxy
+                img = Image.open(proxy_path)
+            else:
+                img = Image.open(path)
+                original_size = img.size
+            self.image_cache.put(self.image_cache.key(path, 'size'), original_size)
+            
+            # For JPEGs, let the decoder scale by 1/2, 1/4 or 1/8 (DCT scaling) while
+            # staying at least as large as the fitted size, instead of decoding every pixel
+            if img.format == 'JPEG':
+                fit_scale = min(canvas_width / img.width, canvas_height / img.height)
+                if fit_scale < 1.0:
+                    img.draft(img.mode, (max(1, int(img.width * fit_scale)),
+                                         max(1, int(img.height * fit_scale))))
+            
+            # Resize image to fit available space while maintaining aspect ratio.
+            # img is private to this call, so it is scaled in place without a full-size copy.
+            img.thumbnail((canvas_width, canvas_height), Image.Resampling.LANCZOS)
+            return img, original_size
+        return self.image_cache.get_or_create(self.image_cache.key(path, 'fitted') + params, render)
+
+    def _schedule_prefetch(self):
+        """Queue background decoding of the images around the current index"""
+        if not self.image_paths or self.current_index >= len(self.image_paths):
+            return
+        # Navigation always returns to fit mode, so only fitted frames are prefetched
+        self.prefetcher.schedule(self.image_paths, self.current_index, self._fitted_render_params())
 
     def blink_status_text(self):
         """Create a subtle blink effect on the status text (normal -> bold -> normal)"""
@@ -1295,18 +3848,25 @@ class ImageLabelTool:
         # Start searching from the next image after current
         start_index = (self.current_index + 1) % len(self.image_paths)
         
+        # On a shared folder, first look in the sessions assigned to this operator
+        operators = self.shared_deltas.active_operators() if self.shared_deltas is not None else []
+        passes = [True, False] if len(operators) > 1 else [False]
+        
         # Search for the next unclassified image
-        for i in range(len(self.image_paths)):
-            check_index = (start_index + i) % len(self.image_paths)
-            path = self.image_paths[check_index]
-            
-            # Check if image is unclassified
-            if path not in self.labels or self.labels[path] == "(Unclassified)":
-                self.current_index = check_index
-                self.show_image()
-                # Add subtle text blink for navigation feedback
-                self.blink_status_text()
-                return
+        for own_sessions_only in passes:
+            for i in range(len(self.image_paths)):
+                check_index = (start_index + i) % len(self.image_paths)
+                path = self.image_paths[check_index]
+                
+                # Check if image is unclassified
+                if path not in self.labels or self.labels[path] == "(Unclassified)":
+                    if own_sessions_only and not self._is_assigned_to_me(path, operators):
+                        continue
+                    self.current_index = check_index
+                    self.show_image()
+                    # Add subtle text blink for navigation feedback
+                    self.blink_status_text()
+                    return
         
         # If no unclassified images found, show a message
         messagebox.showinfo("Navigation", "No unclassified images found.")
@@ -1341,35 +3901,21 @@ class ImageLabelTool:
             messagebox.showwarning("Jump to Trigger ID", "Please enter a valid numeric Trigger ID.")
             return
         
-        # Search for the first image with the matching trigger ID
+        # Search for the first image with the matching trigger ID (leading zeros ignored)
         for i, path in enumerate(self.image_paths):
-            filename = os.path.basename(path)
-            filename_without_ext = os.path.splitext(filename)[0]
-            parts = filename_without_ext.split('_')
-            if len(parts) >= 1:
-                # Extract trigger ID (first part before underscore)
-                file_trigger_id_str = parts[0]
-                # Normalize the file trigger ID (remove leading zeros if numeric)
-                try:
-                    if file_trigger_id_str.isdigit():
-                        file_trigger_id = str(int(file_trigger_id_str))
-                    else:
-                        file_trigger_id = file_trigger_id_str
-                except ValueError:
-                    file_trigger_id = file_trigger_id_str
-                # Check if this trigger ID matches
-                if file_trigger_id == normalized_trigger_id:
-                    self.current_index = i
-                    self.show_image()
-                    # Clear the input field after successful jump
-                    self.jump_trigger_var.set("")
-                    comment_text = self.comments.get(self.image_paths[self.current_index], "")
-                    self.comment_text.delete("1.0", tk.END)
-                    self.comment_text.insert("1.0", comment_text)
-                    # Re-bind comment change events
-                    self.comment_text.bind('<KeyRelease>', self.on_comment_change)
-                    self.comment_text.bind('<FocusOut>', self.on_comment_change)
-                    return
+            record = FilenameRecord.of(path)
+            if record.trigger_id is not None and str(record.trigger_id) == normalized_trigger_id:
+                self.current_index = i
+                self.show_image()
+                # Clear the input field after successful jump
+                self.jump_trigger_var.set("")
+                comment_text = self.comments.get(self.image_paths[self.current_index], "")
+                self.comment_text.delete("1.0", tk.END)
+                self.comment_text.insert("1.0", comment_text)
+                # Re-bind comment change events
+                self.comment_text.bind('<KeyRelease>', self.on_comment_change)
+                self.comment_text.bind('<FocusOut>', self.on_comment_change)
+                return
         if normalized_trigger_id is None:
             normalized_trigger_id = trigger_id_input
         messagebox.showinfo("Jump to Trigger ID", 
@@ -1379,8 +3925,8 @@ class ImageLabelTool:
         if not self.image_paths:
             return
         path = self.image_paths[self.current_index]
-        self.labels[path] = value
-        self.save_csv()
+        self.set_image_fields(path, **self._label_fields(path, value))
+        self.save_changes()
         self.update_counts()
         
         # Set image to fit-to-window mode after classification
@@ -1396,8 +3942,8 @@ class ImageLabelTool:
             return
         path = self.image_paths[self.current_index]
         
-        self.labels[path] = self.label_var.get()
-        self.save_csv()
+        self.set_image_fields(path, **self._label_fields(path, self.label_var.get()))
+        self.save_changes()
         self.update_counts()
         self.update_session_stats()
         self.update_total_stats()
@@ -1451,6 +3997,40 @@ class ImageLabelTool:
                 
                 self.show_image()
 
+    def _label_fields(self, path, value):
+        """Fields to set for labeling path as value, in one undoable change"""
+        # False NoRead only applies to read failures
+        if value != "read failure" and self.false_noread.get(path, False):
+            return {"label": value, "false_noread": False}
+        return {"label": value}
+
+    def apply_labels(self, paths, value):
+        """Set one classification on several images with a single save and stats refresh"""
+        paths = [path for path in paths if self.labels.get(path, LABELS[0]) != value]
+        if not paths:
+            return
+        for path in paths:
+            self.set_image_fields(path, **self._label_fields(path, value))
+        self.save_changes()
+        self.update_counts()
+        self.update_session_stats()
+        self.update_total_stats()
+        
+        if not self.image_paths:
+            return
+        current_path = self.image_paths[self.current_index]
+        if self.filter_var.get() != "All images":
+            # Relabeled images may have left (or entered) the filtered list
+            self.apply_filter()
+            if current_path in self.image_paths:
+                self.current_index = self.image_paths.index(current_path)
+                self.show_image()
+        elif current_path in paths:
+            self.show_image()
+        else:
+            self.update_progress_display()
+            self.update_current_label_status()
+
     def on_ocr_checkbox_changed(self):
         """Handle OCR readable checkbox changes - mutually exclusive with False NoRead"""
         if not self.image_paths:
@@ -1460,10 +4040,10 @@ class ImageLabelTool:
         # If OCR is being checked, uncheck False NoRead (mutual exclusivity)
         if self.ocr_readable_var.get():
             self.false_noread_var.set(False)
-            self.false_noread[path] = False
+            self.set_image_fields(path, false_noread=False)
         
-        self.ocr_readable[path] = self.ocr_readable_var.get()
-        self.save_csv()
+        self.set_image_fields(path, ocr_readable=self.ocr_readable_var.get())
+        self.save_changes()
         self.update_counts()
         self.update_session_stats()
         self.update_total_stats()
@@ -1479,10 +4059,10 @@ class ImageLabelTool:
         # If False NoRead is being checked, uncheck OCR (mutual exclusivity)
         if self.false_noread_var.get():
             self.ocr_readable_var.set(False)
-            self.ocr_readable[path] = False
+            self.set_image_fields(path, ocr_readable=False)
         
-        self.false_noread[path] = self.false_noread_var.get()
-        self.save_csv()
+        self.set_image_fields(path, false_noread=self.false_noread_var.get())
+        self.save_changes()
         self.update_counts()
         self.update_session_stats()
         self.update_total_stats()
@@ -1505,10 +4085,11 @@ class ImageLabelTool:
             self.false_noread_checkbox.config(state='disabled')
             if self.false_noread_var.get():  # If it was checked, uncheck it
                 self.false_noread_var.set(False)
-                # Also update the stored value
-                self.false_noread[current_path] = False
-                # Save the change
-                self.save_csv()
+                # Also update the stored value (labeling clears it already; undo/redo restores
+                # the state of an action and must not add one)
+                if not self._replaying_undo and self.false_noread.get(current_path, False):
+                    self.set_image_fields(current_path, false_noread=False)
+                    self.save_changes()
 
     def on_histogram_eq_changed(self):
         """Handle histogram equalization checkbox changes"""
@@ -1732,6 +4313,170 @@ class ImageLabelTool:
                                   command=copy_to_clipboard)
             copy_button.pack(side=tk.RIGHT)
 
+    def session_sheet_shortcut(self, event=None):
+        """Keyboard shortcut: Ctrl+G for the session contact sheet"""
+        if getattr(self, 'comment_has_focus', False):
+            return
+        self.show_session_sheet()
+
+    def get_session_image_paths(self, image_path):
+        """Return all images of the session image_path belongs to, in display order"""
+        return list(self._session_groups().get(self.get_session_number(image_path), []))
+
+    def _load_session_thumbnail(self, path):
+        """
+        Return a small rendition of path for the contact sheet, preferring the on-disk proxy.
+        Safe to call from worker threads: it must not touch any Tk object.
+        """
+        def load():
+            thumb_path = self.proxy_cache.proxy_path(path, "thumb")
+            img = Image.open(thumb_path if thumb_path and os.path.exists(thumb_path) else path)
+            if img.format == 'JPEG':
+                img.draft(img.mode, (SESSION_SHEET_THUMB_SIZE, SESSION_SHEET_THUMB_SIZE))
+            img.thumbnail((SESSION_SHEET_THUMB_SIZE, SESSION_SHEET_THUMB_SIZE), Image.Resampling.LANCZOS)
+            return img
+        return self.image_cache.get_or_create(self.image_cache.key(path, 'thumb'), load)
+
+    def show_session_sheet(self):
+        """
+        Show every image of the current session as a grid of thumbnails. A label can be
+        applied to the selected tile (Q/W/E/R, right-click) or to the whole session
+        (Shift+Q/W/E/R or the buttons) with a single save. Thumbnails are loaded in the background.
+        """
+        if not self.image_paths:
+            messagebox.showinfo("Session Sheet", "No images are currently loaded. Select a folder first.")
+            return
+        
+        current_path = self.image_paths[self.current_index]
+        session_id = self.get_session_number(current_path)
+        session_paths = self.get_session_image_paths(current_path)
+        
+        sheet_window = tk.Toplevel(self.root)
+        sheet_window.title(f"Session {session_id} - {len(session_paths)} images")
+        sheet_window.configure(bg="#263238")
+        
+        label_colors = {"(Unclassified)": "#B0BEC5", "no label": "#81C784", "read failure": "#E57373",
+                        "incomplete": "#FFB74D", "unreadable": "#BA68C8"}
+        shortcut_labels = {"q": "no label", "w": "read failure", "e": "incomplete", "r": "unreadable"}
+        columns = min(SESSION_SHEET_MAX_COLUMNS, len(session_paths))
+        
+        grid_frame = tk.Frame(sheet_window, bg="#263238")
+        grid_frame.pack(padx=8, pady=8)
+        
+        tiles = []  # (frame, image label, caption label) per session image
+        photos = {}  # Keep PhotoImage references alive
+        selected = [session_paths.index(current_path) if current_path in session_paths else 0]
+        closed = threading.Event()
+        
+        def refresh_tiles():
+            for i, (frame, _, caption) in enumerate(tiles):
+                label = self.labels.get(session_paths[i], LABELS[0])
+                caption.config(text=f"{os.path.basename(session_paths[i])}\n{label}",
+                               bg=label_colors.get(label, "#B0BEC5"))
+                frame.config(bg="#FFEB3B" if i == selected[0] else "#263238")
+        
+        def select(index):
+            selected[0] = index
+            refresh_tiles()
+        
+        def label_tile(index, value):
+            select(index)
+            self.apply_labels([session_paths[index]], value)
+            refresh_tiles()
+        
+        def label_session(value):
+            self.apply_labels(session_paths, value)
+            refresh_tiles()
+        
+        def open_in_viewer(index):
+            path = session_paths[index]
+            if path in self.image_paths:
+                self.current_index = self.image_paths.index(path)
+                self.reset_to_fit_mode()
+                self.show_image()
+        
+        def show_tile_menu(event, index):
+            select(index)
+            menu = tk.Menu(sheet_window, tearoff=0)
+            for value in LABELS:
+                menu.add_command(label=value, command=lambda v=value: label_tile(index, v))
+            menu.tk_popup(event.x_root, event.y_root)
+        
+        for i, path in enumerate(session_paths):
+            frame = tk.Frame(grid_frame, bg="#263238", padx=3, pady=3)
+            frame.grid(row=i // columns, column=i % columns, padx=4, pady=4)
+            image_label = tk.Label(frame, text="Loading...", bg="#37474F", fg="white",
+                                   width=SESSION_SHEET_THUMB_SIZE // 8, height=SESSION_SHEET_THUMB_SIZE // 20)
+            image_label.pack()
+            caption = tk.Label(frame, font=("Arial", 9), justify=tk.CENTER)
+            caption.pack(fill=tk.X)
+            for widget in (frame, image_label, caption):
+                widget.bind('<Button-1>', lambda e, index=i: select(index))
+                widget.bind('<Double-Button-1>', lambda e, index=i: open_in_viewer(index))
+                widget.bind('<Button-3>', lambda e, index=i: show_tile_menu(e, index))
+            tiles.append((frame, image_label, caption))
+        
+        # Whole-session buttons
+        button_frame = tk.Frame(sheet_window, bg="#263238")
+        button_frame.pack(fill=tk.X, padx=8, pady=(0, 8))
+        tk.Label(button_frame, text="Whole session:", bg="#263238", fg="white",
+                 font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=(0, 5))
+        for key, value in shortcut_labels.items():
+            tk.Button(button_frame, text=f"{value} (Shift+{key.upper()})", bg=label_colors[value],
+                      font=("Arial", 9, "bold"), relief="flat", padx=6,
+                      command=lambda v=value: label_session(v)).pack(side=tk.LEFT, padx=2)
+        tk.Label(sheet_window, text="Click: select  |  Q/W/E/R: label tile  |  Right-click: label menu  |  "
+                                   "Double-click: open in viewer  |  Arrows: move", 
+                 bg="#263238", fg="#B0BEC5", font=("Arial", 9)).pack(pady=(0, 6))
+        
+        def on_key(event):
+            key = event.keysym.lower()
+            if key in shortcut_labels:
+                if event.state & 0x1:  # Shift held
+                    label_session(shortcut_labels[key])
+                else:
+                    label_tile(selected[0], shortcut_labels[key])
+            elif event.keysym in ("Left", "Right", "Up", "Down"):
+                step = {"Left": -1, "Right": 1, "Up": -columns, "Down": columns}[event.keysym]
+                new_index = selected[0] + step
+                if 0 <= new_index < len(session_paths):
+                    select(new_index)
+            elif event.keysym == "Return":
+                open_in_viewer(selected[0])
+            elif event.keysym == "Escape":
+                on_close()
+        
+        def on_close():
+            closed.set()
+            sheet_window.destroy()
+        
+        sheet_window.bind('<Key>', on_key)
+        sheet_window.protocol("WM_DELETE_WINDOW", on_close)
+        refresh_tiles()
+        sheet_window.focus_set()
+        
+        def show_thumbnail(index, img):
+            # Runs on the Tk thread
+            if closed.is_set():
+                return
+            photos[index] = ImageTk.PhotoImage(img)
+            tiles[index][1].config(image=photos[index], text="", width=0, height=0)
+        
+        def load_thumbnails():
+            # Start with the selected image, then the rest of the session
+            order = [selected[0]] + [i for i in range(len(session_paths)) if i != selected[0]]
+            for index in order:
+                if closed.is_set():
+                    return
+                try:
+                    img = self._load_session_thumbnail(session_paths[index])
+                except Exception as e:
+                    print(f"Session sheet thumbnail failed for {os.path.basename(session_paths[index])}: {e}")
+                    continue
+                self.root.after(0, show_thumbnail, index, img)
+        
+        threading.Thread(target=load_thumbnails, daemon=True).start()
+
     def on_total_changed(self, event=None):
         """Called when the total sessions field changes"""
         self.update_total_stats()
@@ -1765,16 +4510,11 @@ class ImageLabelTool:
             # Get text from Text widget instead of StringVar
             comment_text = self.comment_text.get("1.0", tk.END).strip()
             
-            # Store comment for current image
-            if comment_text:
-                self.comments[current_path] = comment_text
-            else:
-                # Remove empty comments
-                if current_path in self.comments:
-                    del self.comments[current_path]
-            
-            # Save CSV immediately when comment changes
-            self.save_csv()
+            # Store comment for current image (an empty comment is removed)
+            if comment_text != self.comments.get(current_path, ""):
+                self.set_image_fields(current_path, comment=comment_text)
+                # Journal the change immediately (one appended line, not a CSV rewrite)
+                self.save_changes()
 
     def on_comment_focus_in(self, event=None):
         """Called when comment text widget gains focus"""
@@ -2183,16 +4923,10 @@ class ImageLabelTool:
                 # Extract trigger IDs from filenames (format: XXXXXXXXXX_XXXX_XXX_timestamp.jpg)
                 # The trigger ID is the first part before the first underscore, with leading zeros removed
                 for filename in image_files:
-                    # Extract the first part before underscore
-                    parts = filename.split('_')
-                    if parts and len(parts[0]) >= 10:  # Should be 10 digits
-                        trigger_id_str = parts[0]
-                        # Convert to integer to remove leading zeros, then back to string
-                        try:
-                            trigger_id = str(int(trigger_id_str))
-                            saved_image_ids.add(trigger_id)
-                        except ValueError:
-                            continue  # Skip if not a valid number
+                    # Same normalized paths as all_image_paths, so their parsed names are reused
+                    record = FilenameRecord.of(os.path.abspath(os.path.join(self.folder_path, filename)))
+                    if len(record.trigger) >= 10 and record.trigger_id is not None:  # Should be 10 digits
+                        saved_image_ids.add(str(record.trigger_id))
             except Exception:
                 # If we can't read the folder, continue without cross-reference
                 pass
@@ -2553,7 +5287,10 @@ class ImageLabelTool:
         return None
     
     def extract_date_from_filename(self, filename):
-        """Extract date from a single filename"""
+        """Extract date from a single filename (parsed once per name)"""
+        return FilenameRecord.of(filename).date(lambda: self._parse_date_from_filename(filename))
+
+    def _parse_date_from_filename(self, filename):
         try:
             import re
             
@@ -2765,8 +5502,7 @@ class ImageLabelTool:
             return {'no_code_count': 0, 'read_failure_count': 0, 'ocr_readable_count': 0, 'total_sessions': 0, 'actual_sessions': 0, 'total_entered': 0}
             
         # Calculate session labels and consistent category counts
-        session_labels_dict = self.calculate_session_labels()
-        session_counts = self.calculate_session_category_counts(session_labels_dict)
+        session_counts = self.calculate_session_category_counts()
         ocr_readable_count = self.calculate_sessions_with_ocr_readable()
 
         # Get actual sessions count (number of sessions found in images)
@@ -3079,6 +5815,8 @@ class ImageLabelTool:
         
         # Reset to first image and update display
         self.current_index = 0
+        # Frames prefetched for the previous filter order are stale now
+        self.prefetcher.cancel()
         self.show_image()
         self.update_counts()
         self.update_session_stats()
@@ -3092,12 +5830,17 @@ class ImageLabelTool:
         # Reset parcel indices when loading
         self.parcel_indices = {}
         self.next_parcel_index = 1
+        self.loaded_revision = None
         
         if not self.csv_filename or not os.path.exists(self.csv_filename):
             # Try to find existing revision CSV files in the folder
             if self.folder_path:
-                existing_csvs = [f for f in os.listdir(self.folder_path) 
-                               if f.startswith("revision_") and f.endswith(".csv")]
+                index = self._indexed_folder()
+                if index is not None:
+                    existing_csvs = index.revision_files()
+                else:
+                    existing_csvs = [f for f in os.listdir(self.folder_path) 
+                                   if f.startswith("revision_") and f.endswith(".csv")]
                 if existing_csvs:
                     # Parse timestamps and find the most recent one
                     most_recent_file = None
@@ -3117,14 +5860,26 @@ class ImageLabelTool:
                     
                     if most_recent_file:
                         existing_csv = os.path.join(self.folder_path, most_recent_file)
-                        self._load_csv_file(existing_csv)
+                        self.loaded_revision = existing_csv
+                        if self.label_store is not None and self.label_store.get_meta("revision") == most_recent_file:
+                            # The store already holds this revision and every change made since
+                            self._load_label_store()
+                        else:
+                            self._load_csv_file(existing_csv)
+                            self._import_into_label_store(most_recent_file)
             return
+        self.loaded_revision = self.csv_filename
         self._load_csv_file(self.csv_filename)
 
     def _load_csv_file(self, filepath):
         """Helper method to load CSV file"""
         # max_session_index = 0  # Session index tracking removed
         
+        if self._load_label_sidecar(filepath):
+            self._replay_label_journal(filepath)
+            return
+        
+        rows = []  # Stored in the record store as one batch
         with open(filepath, newline='', encoding='utf-8') as f:
             reader = csv.reader(f)
             header = next(reader, None)  # Read header
@@ -3162,27 +5917,11 @@ class ImageLabelTool:
                     
                     # Read Comment if available (5th column, index 4)
                     comment = ""
-                    if len(row) >= 5:
-                        comment = row[4].strip()
-                    
-                    # Convert relative path back to absolute path if needed
-                    if hasattr(self, 'folder_path') and self.folder_path:
-                        if os.path.isabs(stored_path):
-                            # Already absolute path (backward compatibility)
-                            image_path = stored_path
-                        else:
-                            # Relative path - convert to absolute
-                            image_path = os.path.join(self.folder_path, stored_path)
-                            # Normalize the path to handle any inconsistencies
-                            image_path = os.path.normpath(image_path)
-                    else:
-                        # No folder_path available, use as-is
-                        image_path = stored_path
+                    if len(row) >= 5:
+                        comment = row[4].strip()
                     
-                    self.labels[image_path] = image_label
-                    self.ocr_readable[image_path] = ocr_readable
-                    self.false_noread[image_path] = false_noread
-                    self.comments[image_path] = comment
+                    image_path = self._resolve_csv_path(stored_path)
+                    rows.append((image_path, image_label, ocr_readable, false_noread, comment))
                     
                     # Session index loading logic removed - no longer used
                     # if len(row) >= 8 and row[7]:  # session_index is now 8th column (index 7)
@@ -3197,65 +5936,445 @@ class ImageLabelTool:
         
         # Session index tracking removed
         # self.next_session_index = max_session_index + 1
+        
+        self._load_label_rows(rows)
+        self._replay_label_journal(filepath)
+
+    def _load_label_rows(self, rows):
+        """Set (path, label, ocr_readable, false_noread, comment) rows loaded from a revision file"""
+        if self._uses_record_store():
+            self.records.load(rows)
+            return
+        for image_path, image_label, ocr_readable, false_noread, comment in rows:
+            self.labels[image_path] = image_label
+            self.ocr_readable[image_path] = ocr_readable
+            self.false_noread[image_path] = false_noread
+            self.comments[image_path] = comment
+
+    def _replay_label_journal(self, filepath):
+        """Re-apply the changes journaled after the snapshot filepath was written"""
+        for record in LabelJournal.replay(filepath + ".journal"):
+            self._apply_journal_record(self._resolve_csv_path(record["path"]), record)
+
+    def _load_label_sidecar(self, filepath):
+        """Load the labels from the binary copy of the CSV if it is still current"""
+        columns = LabelSidecar.read(filepath)
+        if columns is None:
+            return False
+        stored_paths, labels, ocr_readable, false_noread, comments = columns
+        if self.folder_path:
+            # Same result as _resolve_csv_path() for the normalized relative paths we write
+            prefix = os.path.join(os.path.normpath(self.folder_path), "")
+            image_paths = [self._resolve_csv_path(p) if os.path.isabs(p) or p.startswith("..") else prefix + p
+                           for p in stored_paths]
+        else:
+            image_paths = stored_paths
+        self._load_label_rows(zip(image_paths, labels, ocr_readable, false_noread,
+                                  (comment.strip() for comment in comments)))
+        return True
+
+    def _resolve_csv_path(self, stored_path):
+        """Convert a path stored in the revision CSV/journal to the absolute image path"""
+        # Convert relative path back to absolute path if needed
+        if hasattr(self, 'folder_path') and self.folder_path:
+            if os.path.isabs(stored_path):
+                # Already absolute path (backward compatibility)
+                return stored_path
+            # Relative path - convert to absolute, normalized to handle any inconsistencies
+            return os.path.normpath(os.path.join(self.folder_path, stored_path))
+        # No folder_path available, use as-is
+        return stored_path
+
+    def _csv_relative_path(self, path):
+        """Return path relative to the selected folder, as stored in the revision CSV"""
+        if hasattr(self, 'folder_path') and self.folder_path:
+            try:
+                # Normalize both paths before calculating relative path
+                normalized_path = os.path.normpath(path)
+                normalized_folder = os.path.normpath(self.folder_path)
+                return os.path.relpath(normalized_path, normalized_folder)
+            except ValueError:
+                # If relpath fails (e.g., different drives), use just the filename
+                return os.path.basename(path)
+        return os.path.basename(path)
+
+    def _apply_journal_record(self, path, record):
+        """Apply the fields of one journal record to the in-memory label dictionaries"""
+        if "label" in record:
+            self.labels[path] = record["label"]
+        if "ocr_readable" in record:
+            self.ocr_readable[path] = bool(record["ocr_readable"])
+        if "false_noread" in record:
+            self.false_noread[path] = bool(record["false_noread"])
+        if "comment" in record:
+            if record["comment"]:
+                self.comments[path] = record["comment"]
+            else:
+                self.comments.pop(path, None)
+
+    def set_image_fields(self, path, **fields):
+        """
+        Change the label / ocr_readable / false_noread / comment of one image and record
+        the change in the label journal. Call save_changes() once the action is complete.
+        """
+        unknown = set(fields) - set(LabelJournal.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown image fields: {sorted(unknown)}")
+        if not self._replaying_undo:
+            self._pending_undo.append((path, self._get_image_fields(path, fields), dict(fields)))
+        self._apply_journal_record(path, fields)
+        self._mark_store_dirty([path])
+        journal = self._get_label_journal()
+        if journal is not None:
+            journal.append(self._csv_relative_path(path), **fields)
+        if self.shared_deltas is not None:
+            self.shared_deltas.append(self._csv_relative_path(path), **fields)
+
+    def _get_image_fields(self, path, names):
+        """Current values of the given fields of one image, as set_image_fields() takes them"""
+        current = {}
+        for name in names:
+            if name == "label":
+                current[name] = self.labels.get(path, LABELS[0])
+            elif name == "ocr_readable":
+                current[name] = bool(self.ocr_readable.get(path, False))
+            elif name == "false_noread":
+                current[name] = bool(self.false_noread.get(path, False))
+            else:
+                current[name] = self.comments.get(path, "")
+        return current
+
+    def _close_undo_action(self):
+        """Push the changes made since the last save_changes() as one undoable action"""
+        action = [(path, old, new) for path, old, new in self._pending_undo if old != new]
+        self._pending_undo = []
+        if not action:
+            return
+        top = self._undo_stack[-1] if self._undo_stack else None
+        if (top is not None and len(top) == 1 and len(action) == 1 and top[0][0] == action[0][0]
+                and set(top[0][2]) == set(action[0][2]) == {"comment"}):
+            # Typing a comment saves on every key; undo it as one edit
+            self._undo_stack[-1] = [(top[0][0], top[0][1], action[0][2])]
+        else:
+            self._undo_stack.append(action)
+        self._redo_stack.clear()
+
+    def undo_shortcut(self, event=None):
+        """Keyboard shortcut: Ctrl+Z undoes the last labeling action"""
+        if getattr(self, 'comment_has_focus', False):
+            return  # Let the comment field handle its own text
+        self.undo()
+
+    def redo_shortcut(self, event=None):
+        """Keyboard shortcut: Ctrl+Y / Ctrl+Shift+Z redoes the last undone action"""
+        if getattr(self, 'comment_has_focus', False):
+            return
+        self.redo()
+
+    def undo(self):
+        """Revert the last labeling action (label, flags, comment), wherever it was made"""
+        self._close_undo_action()
+        if not self._undo_stack:
+            self.save_status_var.set("Nothing to undo")
+            return
+        action = self._undo_stack.pop()
+        self._redo_stack.append(action)
+        self._replay_undo_action([(path, old) for path, old, _ in reversed(action)])
+        self.save_status_var.set(f"↩ Undone: {self._describe_undo_action(action)}")
+
+    def redo(self):
+        """Re-apply the last undone labeling action"""
+        self._close_undo_action()
+        if not self._redo_stack:
+            self.save_status_var.set("Nothing to redo")
+            return
+        action = self._redo_stack.pop()
+        self._undo_stack.append(action)
+        self._replay_undo_action([(path, new) for path, _, new in action])
+        self.save_status_var.set(f"↪ Redone: {self._describe_undo_action(action)}")
+
+    def _replay_undo_action(self, changes):
+        """Apply (path, fields) changes like a normal edit and show the image they belong to"""
+        self._replaying_undo = True
+        try:
+            for path, fields in changes:
+                self.set_image_fields(path, **fields)
+            self.save_changes()
+            
+            self.update_counts()
+            self.update_session_stats()
+            self.update_total_stats()
+            # Go back to the image, even if auto-advance has moved on since
+            path = changes[-1][0]
+            if path not in self.image_paths and self.filter_var.get() != "All images":
+                self.apply_filter()
+            if path in self.image_paths:
+                self.current_index = self.image_paths.index(path)
+            self.update_progress_display()
+            self.show_image()
+        finally:
+            self._replaying_undo = False
+
+    def _describe_undo_action(self, action):
+        names = sorted({os.path.basename(path) for path, _, _ in action})
+        fields = sorted({field for _, _, new in action for field in new})
+        target = names[0] if len(names) == 1 else f"{len(names)} images"
+        return f"{', '.join(fields)} of {target}"
+
+    def save_changes(self):
+        """
+        Persist the changes made through set_image_fields(). Each action only appends to
+        the journal; the full CSV snapshot is rewritten when the journal is compacted.
+        """
+        self._close_undo_action()
+        self._flush_label_store()
+        journal = self._get_label_journal()
+        if journal is None:
+            self.save_csv()
+            return
+        if (journal.event_count >= JOURNAL_COMPACT_EVENTS or
+                time.time() - self._last_compaction >= JOURNAL_COMPACT_INTERVAL_S):
+            self.save_csv()
+        elif journal.pending_sync and self._journal_sync_job is None:
+            # fsync the tail of a burst even if the batch never fills up
+            self._journal_sync_job = self.root.after(JOURNAL_FSYNC_INTERVAL_MS, self._sync_label_journal)
+
+    def _get_label_journal(self):
+        """Return the journal belonging to the current revision CSV (None without a folder)"""
+        if not getattr(self, 'csv_filename', None):
+            return None
+        journal_path = self.csv_filename + ".journal"
+        if self.label_journal is None or self.label_journal.path != journal_path:
+            self._close_label_journal()
+            if not os.path.exists(self.csv_filename):
+                # Journal entries always apply on top of a snapshot, so write the first one now
+                # (a new file, so this wait is short and happens once per folder)
+                if not self.snapshot_writer.pending(self.csv_filename):
+                    self.save_csv()
+                    if not self.snapshot_writer.flush(timeout=JOURNAL_FIRST_SNAPSHOT_TIMEOUT_S):
+                        print(f"WARNING: {os.path.basename(self.csv_filename)} not written yet; "
+                              "labels are saved as full snapshots until it is")
+                if not os.path.exists(self.csv_filename):
+                    # load_csv would never find a journal without its CSV: until the snapshot is
+                    # on disk every save submits a full snapshot (retried by the writer) instead
+                    return None
+            self.label_journal = LabelJournal(journal_path)
+        return self.label_journal
+
+    def _sync_label_journal(self):
+        self._journal_sync_job = None
+        if self.label_journal is not None:
+            self.label_journal.sync()
+
+    def _close_label_journal(self):
+        if self._journal_sync_job is not None:
+            self.root.after_cancel(self._journal_sync_job)
+            self._journal_sync_job = None
+        if self.label_journal is not None:
+            self.label_journal.close()
+            self.label_journal = None
+
+    def _open_shared_deltas(self, folder):
+        """Start exchanging label changes with other operators if the folder is shared"""
+        self._close_shared_deltas()
+        try:
+            if not (SHARED_LABELING or SharedLabelDeltas.exist_in(folder)):
+                return
+            operator = re.sub(r'[^A-Za-z0-9-]+', '-', f"{socket.gethostname()}-{getpass.getuser()}")
+            self.shared_deltas = SharedLabelDeltas(folder, operator)
+        except OSError as e:
+            print(f"WARNING: Shared labeling disabled for {folder}: {e}")
+            self.shared_deltas = None
+            return
+        if self.loaded_revision is not None:
+            try:
+                # Changes that old were merged by whoever wrote the snapshot just loaded
+                self.shared_deltas.covered_until = os.path.getmtime(self.loaded_revision) - DELTA_COMPACT_AGE_S
+            except OSError:
+                pass
+        # The folder is being loaded: merge everything now, the UI is refreshed afterwards
+        self._merge_shared_deltas()
+        self._delta_poll_job = self.root.after(DELTA_POLL_MS, self._poll_shared_deltas)
+
+    def _close_shared_deltas(self):
+        if self._delta_poll_job is not None:
+            self.root.after_cancel(self._delta_poll_job)
+            self._delta_poll_job = None
+        if self.shared_deltas is not None:
+            self.shared_deltas.close()
+            self.shared_deltas = None
+
+    def _merge_shared_deltas(self):
+        """Apply the winning changes appended to the delta files since the last poll"""
+        try:
+            records = self.shared_deltas.poll()
+        except OSError as e:
+            print(f"WARNING: Cannot read shared label deltas: {e}")
+            return set()
+        changed = set()
+        for record in records:
+            path = self._resolve_csv_path(record["path"])
+            self._apply_journal_record(path, record)
+            changed.add(path)
+        self._mark_store_dirty(changed)
+        return changed
+
+    def _poll_shared_deltas(self):
+        """Show the changes other operators made since the last poll (Tk thread)"""
+        self._delta_poll_job = None
+        if self.shared_deltas is None:
+            return
+        changed = self._merge_shared_deltas()
+        if changed:
+            self.request_stats_csv()
+            self.update_counts()
+            self.update_session_stats()
+            self.update_total_stats()
+            self.update_progress_display()
+            current_path = self.image_paths[self.current_index] if self.image_paths else None
+            if current_path in changed and not getattr(self, 'comment_has_focus', False):
+                self.show_image()
+        self._delta_poll_job = self.root.after(DELTA_POLL_MS, self._poll_shared_deltas)
+
+    def _is_latest_revision(self, csv_path):
+        """Whether no revision CSV in the folder of csv_path sorts after it (the one load_csv picks)"""
+        name = os.path.basename(csv_path)
+        return all(other <= name for other in os.listdir(os.path.dirname(csv_path))
+                   if re.fullmatch(r"revision_\d{8}_\d{6}\.csv", other))
+
+    def _is_assigned_to_me(self, path, operators):
+        """Whether the session of path is part of this operator's share of the unclassified work"""
+        session_id = self.get_session_number(path)
+        return not session_id or self.shared_deltas.owner_of(session_id, operators) == self.shared_deltas.operator
+
+    def _open_label_store(self, folder):
+        """Open the folder's SQLite label store if enabled (or already present)"""
+        self._close_label_store()
+        if not HAS_SQLITE:
+            return
+        store_path = os.path.join(folder, LABEL_STORE_FILENAME)
+        if not (USE_LABEL_STORE or os.path.exists(store_path)):
+            return
+        try:
+            self.label_store = LabelStore(store_path)
+        except sqlite3.Error as e:
+            print(f"WARNING: Cannot open label store {store_path}: {e}")
+            self.label_store = None
+
+    def _close_label_store(self):
+        if self.label_store is not None:
+            self._flush_label_store()
+            self.label_store.close()
+            self.label_store = None
+
+    def _label_store_record(self, path):
+        """Row of the label store for one image"""
+        record = FilenameRecord.of(path)
+        trigger_id = str(record.trigger_id) if record.trigger_id is not None else record.trigger
+        return (self._csv_relative_path(path), record.session_id, trigger_id,
+                self.labels.get(path), int(bool(self.ocr_readable.get(path, False))),
+                int(bool(self.false_noread.get(path, False))), self.comments.get(path, ""))
+
+    def _mark_store_dirty(self, paths):
+        """Queue images whose label state changed for the next label store write (any thread)"""
+        if self.label_store is not None:
+            self._store_dirty.update(paths)
+
+    def _flush_label_store(self, revision=None):
+        """Write the queued images to the label store in one transaction"""
+        if self.label_store is None:
+            return
+        # Worker threads may keep adding paths; only remove the ones written here
+        paths = list(self._store_dirty)
+        self._store_dirty.difference_update(paths)
+        try:
+            if paths:
+                self.label_store.upsert([self._label_store_record(path) for path in paths])
+            if revision is not None and self.label_store.get_meta("revision") != revision:
+                # The store now corresponds to the revision CSV being written
+                self.label_store.set_meta("revision", revision)
+        except sqlite3.Error as e:
+            print(f"WARNING: Cannot update label store: {e}")
+
+    def _import_into_label_store(self, revision):
+        """Replace the store contents with the labels just loaded from the revision CSV"""
+        if self.label_store is None:
+            return
+        self._store_dirty.clear()
+        paths = set(self.labels) | set(self.ocr_readable) | set(self.false_noread) | set(self.comments)
+        try:
+            self.label_store.replace_all([self._label_store_record(path) for path in paths], revision)
+        except sqlite3.Error as e:
+            print(f"WARNING: Cannot import labels into label store: {e}")
+
+    def _load_label_store(self):
+        """Load the label dictionaries from the store instead of parsing the revision CSV"""
+        for stored_path, label, ocr_readable, false_noread, comment in self.label_store.rows():
+            image_path = self._resolve_csv_path(stored_path)
+            if label is not None:
+                self.labels[image_path] = label
+            self.ocr_readable[image_path] = bool(ocr_readable)
+            self.false_noread[image_path] = bool(false_noread)
+            if comment:
+                self.comments[image_path] = comment
 
     def save_csv(self):
+        """Write a full snapshot of the labels to the revision CSV (in the background)"""
         if not self.csv_filename:
             return
+        self._flush_label_store(os.path.basename(self.csv_filename))
             
         try:
-            with open(self.csv_filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                # Write header
-                writer.writerow(['image_path', 'image_label', 'OCR_Readable', 'False_NoRead', 'Comment', 'session_number', 'session_label', 'session_OCR_readable', 'session_index'])
-                
-                # Calculate current session labels
-                session_labels_dict = self.calculate_session_labels()
-                
-                # Calculate session OCR readable status
-                session_ocr_readable_dict = self.calculate_session_ocr_readable_status()
-                
-                for path, label in self.labels.items():
-                    # Convert absolute path to relative path from the selected folder
-                    if hasattr(self, 'folder_path') and self.folder_path:
-                        try:
-                            # Normalize both paths before calculating relative path
-                            normalized_path = os.path.normpath(path)
-                            normalized_folder = os.path.normpath(self.folder_path)
-                            relative_path = os.path.relpath(normalized_path, normalized_folder)
-                        except ValueError:
-                            # If relpath fails (e.g., different drives), use just the filename
-                            relative_path = os.path.basename(path)
-                    else:
-                        relative_path = os.path.basename(path)
-                    
-                    session_id = self.get_session_number(path)
-                    session_label = session_labels_dict.get(session_id, "no label") if session_id else "no label"
-                    session_ocr_readable = session_ocr_readable_dict.get(session_id, False) if session_id else False
-                    # session_index functionality removed
-                    ocr_readable = self.ocr_readable.get(path, False)
-                    false_noread = self.false_noread.get(path, False)
-                    comment = self.comments.get(path, "")
-                    writer.writerow([relative_path, label, ocr_readable, false_noread, comment, session_id or "", session_label, session_ocr_readable, ""])
-            
-            # Also generate statistics CSV file
-            self.save_stats_csv()
+            # Header
+            rows = [['image_path', 'image_label', 'OCR_Readable', 'False_NoRead', 'Comment', 'session_number', 'session_label', 'session_OCR_readable', 'session_index']]
             
-        except PermissionError as e:
-            print(f"ERROR: Permission denied when saving CSV: {self.csv_filename}")
-            print("Possible solutions:")
-            print("1. Close Excel if the file is open")
-            print("2. Check if OneDrive is syncing the folder")
-            print("3. Try running as administrator")
-            print("4. Choose a different folder location")
-            # Show message to user
-            try:
-                messagebox.showerror("File Save Error", 
-                    f"Cannot save file:\n{os.path.basename(self.csv_filename)}\n\n"
-                    f"The file might be open in Excel or another program.\n"
-                    f"Please close any programs using this file and try again.")
-            except:
-                pass
+            # Calculate current session labels
+            session_labels_dict = self.calculate_session_labels()
+            
+            # Calculate session OCR readable status
+            session_ocr_readable_dict = self.calculate_session_ocr_readable_status()
+            
+            for path, label in self.labels.items():
+                # Convert absolute path to relative path from the selected folder
+                relative_path = self._csv_relative_path(path)
                 
+                session_id = self.get_session_number(path)
+                session_label = session_labels_dict.get(session_id, "no label") if session_id else "no label"
+                session_ocr_readable = session_ocr_readable_dict.get(session_id, False) if session_id else False
+                # session_index functionality removed
+                ocr_readable = self.ocr_readable.get(path, False)
+                false_noread = self.false_noread.get(path, False)
+                comment = self.comments.get(path, "")
+                rows.append([relative_path, label, ocr_readable, false_noread, comment, session_id or "", session_label, session_ocr_readable, ""])
+            
+            # The snapshot contains every journaled change: set the journal aside and
+            # drop it once the snapshot is on disk (compaction)
+            journal = rotation = None
+            if self.label_journal is not None and self.label_journal.path == self.csv_filename + ".journal":
+                journal = self.label_journal
+                rotation = journal.rotate()
+            self._last_compaction = captured = time.time()
+            
+            csv_filename = self.csv_filename
+            shared_deltas = self.shared_deltas
+            def on_written():
+                # Runs on the writer thread once the CSV has been replaced
+                if journal is not None:
+                    journal.discard_rotated(rotation)
+                if shared_deltas is not None and self._is_latest_revision(csv_filename):
+                    # The next folder load starts from this snapshot: the own delta file can shrink
+                    shared_deltas.snapshot_written(captured)
+                try:
+                    LabelSidecar.write(csv_filename, rows[1:])
+                except (OSError, ValueError) as e:
+                    # A missing or stale sidecar only means the next open parses the CSV
+                    print(f"WARNING: Cannot write {os.path.basename(csv_filename)}{LABEL_SIDECAR_SUFFIX}: {e}")
+            
+            self.snapshot_writer.submit(self.csv_filename, rows, on_written)
+            
+            # The statistics CSV follows on its own (throttled) schedule
+            self.request_stats_csv()
+            
         except Exception as e:
             print(f"ERROR: Unexpected error saving CSV: {str(e)}")
             try:
@@ -3265,6 +6384,92 @@ class ImageLabelTool:
             except:
                 pass
 
+    def _poll_snapshot_status(self):
+        """Show the outcome of finished background CSV writes, then check again later"""
+        self.snapshot_writer.drain_statuses()
+        self._snapshot_status_job = self.root.after(SNAPSHOT_STATUS_POLL_MS, self._poll_snapshot_status)
+
+    def _on_snapshot_status(self, target, error):
+        """Show the outcome of a background CSV write in the status bar (Tk thread)"""
+        filename = os.path.basename(target)
+        if error is None:
+            self._failed_snapshots.discard(target)
+            if not self._failed_snapshots:
+                self.save_status_var.set(f"💾 Saved {datetime.now().strftime('%H:%M:%S')}")
+                self.save_status_label.config(fg="#757575")
+            return
+        
+        if target not in self._failed_snapshots:
+            self._failed_snapshots.add(target)
+            print(f"ERROR: Cannot save {target}: {error}")
+            print("Possible solutions:")
+            print("1. Close Excel if the file is open")
+            print("2. Check if OneDrive is syncing the folder")
+            print("3. Try running as administrator")
+            print("4. Choose a different folder location")
+        self.save_status_var.set(f"⚠️ Cannot save {filename} (open in Excel or syncing?) - {error}")
+        self.save_status_label.config(fg="#D32F2F")
+
+    def request_stats_csv(self):
+        """Mark the statistics CSV as outdated; it is regenerated within STATS_CSV_INTERVAL_S"""
+        self._stats_csv_dirty = True
+        if STATS_CSV_INTERVAL_S > 0 and self._stats_csv_job is None:
+            self._stats_csv_job = self.root.after(int(STATS_CSV_INTERVAL_S * 1000), self._flush_stats_csv)
+
+    def _flush_stats_csv(self):
+        """Write the statistics CSV if labels changed since it was last written"""
+        if self._stats_csv_job is not None:
+            self.root.after_cancel(self._stats_csv_job)
+            self._stats_csv_job = None
+        if self._stats_csv_dirty:
+            self.save_stats_csv()
+
+    def export_stats_csv(self):
+        """Export button: write the statistics CSV immediately"""
+        if not self.csv_filename:
+            messagebox.showwarning("Export Stats", "Select a folder first.")
+            return
+        self._stats_csv_dirty = True
+        self._flush_stats_csv()
+        self.save_status_var.set("📊 Statistics CSV exported")
+        self.save_status_label.config(fg="#757575")
+
+    def export_label_tables(self):
+        """Export button: stream the image and session tables to export_<timestamp>_* files"""
+        if not self.folder_path:
+            messagebox.showwarning("Export Data", "Select a folder first.")
+            return
+        if self._export_running:
+            return
+        # Session labels need the live dictionaries: compute them here, stream the rest
+        exporter = LabelExporter(self.records.columns(), self.calculate_session_labels(), self._csv_relative_path)
+        base_path = os.path.join(self.folder_path, f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        self._export_running = True
+        self.save_status_var.set("📤 Exporting labels...")
+        threading.Thread(target=self._run_label_export, args=(exporter, base_path), daemon=True).start()
+
+    def _run_label_export(self, exporter, base_path):
+        """Write the export tables (background thread)"""
+        written, error = [], None
+        try:
+            written = exporter.write(base_path)
+        except Exception as e:  # Including pyarrow's ArrowInvalid / ArrowTypeError
+            print(f"ERROR: Data export failed: {e}")
+            error = str(e) or type(e).__name__
+        finally:
+            # Always re-enable Export Data
+            self.root.after(0, self._on_label_export_done, written, error)
+
+    def _on_label_export_done(self, written, error):
+        self._export_running = False
+        if error is not None:
+            self.save_status_var.set(f"⚠️ Export failed: {error}")
+            self.save_status_label.config(fg="#D32F2F")
+            return
+        names = ", ".join(os.path.basename(path) for path in written)
+        self.save_status_var.set(f"📤 Exported {names}")
+        self.save_status_label.config(fg="#757575")
+
     def save_stats_csv(self):
         """Generate a statistics CSV file with all counting and parcel information"""
         if not self.csv_filename:
@@ -3285,44 +6490,15 @@ class ImageLabelTool:
         # Calculate all statistics
         stats_data = self.calculate_comprehensive_stats()
         
-        try:
-            with open(stats_filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                
-                # Write statistics header
-                writer.writerow(['category', 'metric', 'value', 'description'])
-                
-                # Write all statistics
-                for category, metrics in stats_data.items():
-                    for metric, data in metrics.items():
-                        writer.writerow([category, metric, data['value'], data['description']])
-            
-            print(f"Stats CSV saved successfully: {stats_filename}")
-            
-        except PermissionError as e:
-            print(f"ERROR: Permission denied when saving stats CSV: {stats_filename}")
-            print("Possible solutions:")
-            print("1. Close Excel if the file is open")
-            print("2. Check if OneDrive is syncing the folder")
-            print("3. Try running as administrator")
-            print("4. Choose a different folder location")
-            # Try to show a message box to the user
-            try:
-                messagebox.showerror("File Save Error", 
-                    f"Cannot save stats file:\n{os.path.basename(stats_filename)}\n\n"
-                    f"The file might be open in Excel or another program.\n"
-                    f"Please close any programs using this file and try again.")
-            except:
-                pass  # If messagebox fails, just continue
-                
-        except Exception as e:
-            print(f"ERROR: Unexpected error saving stats CSV: {str(e)}")
-            try:
-                messagebox.showerror("File Save Error", 
-                    f"Cannot save stats file:\n{os.path.basename(stats_filename)}\n\n"
-                    f"Error: {str(e)}")
-            except:
-                pass
+        # Statistics header followed by all statistics
+        rows = [['category', 'metric', 'value', 'description']]
+        for category, metrics in stats_data.items():
+            for metric, data in metrics.items():
+                rows.append([category, metric, data['value'], data['description']])
+        
+        # Written (and retried if locked) by the background snapshot writer
+        self.snapshot_writer.submit(stats_filename, rows)
+        self._stats_csv_dirty = False
 
     def calculate_comprehensive_stats(self):
         """Calculate comprehensive statistics for the stats CSV"""
@@ -3333,19 +6509,10 @@ class ImageLabelTool:
             'System_Info': {}
         }
         
-        # Image counting statistics
-        image_counts = {label: 0 for label in LABELS}
-        total_images = 0
-        
-        if hasattr(self, 'all_image_paths') and self.all_image_paths:
-            total_images = len(self.all_image_paths)
-            for path in self.all_image_paths:
-                if path in self.labels and self.labels[path] != "(Unclassified)":
-                    label = self.labels[path]
-                    if label in image_counts:
-                        image_counts[label] += 1
-                else:
-                    image_counts["(Unclassified)"] += 1
+        # Image counts from the record store's counters; sessions come from the session index
+        image_counts = self._image_counts()[0]
+        sessions = self._session_groups()  # session_id -> paths, in image order
+        total_images = len(getattr(self, 'all_image_paths', None) or [])
         
         # Store image count statistics
         for label, count in image_counts.items():
@@ -3359,17 +6526,25 @@ class ImageLabelTool:
             'description': 'Total number of images in dataset'
         }
         
-        # Calculate session statistics
-        session_labels_dict = self.calculate_session_labels()
+        # Calculate session statistics (images per session label, as before)
         session_counts = {}
-        unique_sessions = set()
-        
-        for path in self.all_image_paths if hasattr(self, 'all_image_paths') else []:
-            session_id = self.get_session_number(path)
-            if session_id:
-                unique_sessions.add(session_id)
+        cache = self._session_label_cache()
+        if cache is not None:
+            # Listed in the order the labels first occur among the sessions, as the scan does
+            remaining = {label for label, images in cache.label_images.items() if images}
+            for session_id in sessions:
+                if not remaining:
+                    break
+                label = cache.labels.get(session_id)
+                if label in remaining:
+                    remaining.discard(label)
+                    session_label = "no label" if label is None else label
+                    session_counts[session_label] = session_counts.get(session_label, 0) + cache.label_images[label]
+        else:
+            session_labels_dict = self.calculate_session_labels(sessions)
+            for session_id, session_paths in sessions.items():
                 session_label = session_labels_dict.get(session_id, "no label")
-                session_counts[session_label] = session_counts.get(session_label, 0) + 1
+                session_counts[session_label] = session_counts.get(session_label, 0) + len(session_paths)
         
         # Store session statistics
         for label, count in session_counts.items():
@@ -3379,15 +6554,12 @@ class ImageLabelTool:
             }
         
         stats['Session_Counts']['total_unique_sessions'] = {
-            'value': len(unique_sessions),
+            'value': len(sessions),
             'description': 'Total number of unique sessions'
         }
         
         # Add total number of sessions (including duplicates/all session entries)
-        total_session_entries = 0
-        for path in self.all_image_paths if hasattr(self, 'all_image_paths') else []:
-            if self.get_session_number(path):
-                total_session_entries += 1
+        total_session_entries = sum(session_counts.values())
         
         stats['Session_Counts']['total_session_entries'] = {
             'value': total_session_entries,
@@ -4064,19 +7236,7 @@ class ImageLabelTool:
             canvas = None
 
     def update_counts(self):
-        counts = {label: 0 for label in LABELS}
-        
-        # Count all images, including unclassified ones
-        if hasattr(self, 'all_image_paths') and self.all_image_paths:
-            for path in self.all_image_paths:
-                if path in self.labels and self.labels[path] != "(Unclassified)":
-                    # Image has a real classification
-                    label = self.labels[path]
-                    if label in counts:
-                        counts[label] += 1
-                else:
-                    # Image is unclassified
-                    counts["(Unclassified)"] += 1
+        counts, _, ocr_readable_count, false_noread_count = self._image_counts()
         
         # Multi-line format for better readability
         lines = []
@@ -4085,11 +7245,9 @@ class ImageLabelTool:
         
         # Add OCR readable count as separate line
         if hasattr(self, 'all_image_paths') and self.all_image_paths:
-            ocr_readable_count = len([path for path in self.all_image_paths if self.ocr_readable.get(path, False)])
             lines.append(f"  OCR recovered: {ocr_readable_count}")
             
             # Add False NoRead count as separate line
-            false_noread_count = len([path for path in self.all_image_paths if self.false_noread.get(path, False)])
             lines.append(f"  False NoRead: {false_noread_count}")
         
         self.count_var.set("\n".join(lines))
@@ -4099,6 +7257,46 @@ class ImageLabelTool:
         # Update warning message
         self.update_warning_message()
 
+    def _image_counts(self):
+        """
+        ({label: images} for LABELS, classified images, OCR readable, False NoRead) over
+        all_image_paths, from the record store's counters when the label dicts are its views
+        """
+        paths = getattr(self, 'all_image_paths', None) or []
+        if not self._uses_record_store():
+            return self._count_images(paths)
+        records = self.records
+        if not records.lists(paths):
+            # The image list was replaced without telling the store
+            records.list_paths(paths)
+        listed, label_counts, ocr_readable_count, false_noread_count = records.listed_counts()
+        classified = sum(count for label, count in label_counts.items() if label != "(Unclassified)")
+        counts = {label: label_counts.get(label, 0) for label in LABELS}
+        counts["(Unclassified)"] = listed - classified  # Including images without a label entry
+        result = (counts, classified, ocr_readable_count, false_noread_count)
+        if VERIFY_IMAGE_COUNTS:
+            recount = self._count_images(paths)
+            if recount != result:
+                print(f"WARNING: Image counters {result} differ from a full recount {recount}")
+                return recount
+        return result
+
+    def _count_images(self, paths):
+        """The same counts as _image_counts() by scanning the label dictionaries"""
+        counts = {label: 0 for label in LABELS}
+        classified = ocr_readable_count = false_noread_count = 0
+        for path in paths:
+            label = self.labels.get(path, "(Unclassified)")
+            if label != "(Unclassified)":
+                classified += 1
+                if label in counts:
+                    counts[label] += 1
+            else:
+                counts["(Unclassified)"] += 1
+            ocr_readable_count += bool(self.ocr_readable.get(path, False))
+            false_noread_count += bool(self.false_noread.get(path, False))
+        return counts, classified, ocr_readable_count, false_noread_count
+
     def update_progress_display(self):
         """Update the progress counter showing classified vs total images"""
         if not hasattr(self, 'all_image_paths') or not self.all_image_paths:
@@ -4106,16 +7304,16 @@ class ImageLabelTool:
             return
         
         total_images = len(self.all_image_paths)
-        classified_images = len([path for path in self.all_image_paths if path in self.labels and self.labels[path] != "(Unclassified)"])
+        counts, classified_images, _, _ = self._image_counts()
         unclassified_images = total_images - classified_images
         
         # Multi-line format for better readability
 
         # Integrity check: No_label + read_failure + incomplete + unreadable == classified_images
-        no_label = sum(1 for path in self.all_image_paths if path in self.labels and self.labels[path] == "no label")
-        read_failure = sum(1 for path in self.all_image_paths if path in self.labels and self.labels[path] == "read failure")
-        incomplete = sum(1 for path in self.all_image_paths if path in self.labels and self.labels[path] == "incomplete")
-        unreadable = sum(1 for path in self.all_image_paths if path in self.labels and self.labels[path] == "unreadable")
+        no_label = counts["no label"]
+        read_failure = counts["read failure"]
+        incomplete = counts["incomplete"]
+        unreadable = counts["unreadable"]
         integrity_sum = no_label + read_failure + incomplete + unreadable
         integrity_ok = (integrity_sum == classified_images)
 
@@ -4168,38 +7366,22 @@ class ImageLabelTool:
 
     def get_session_number(self, image_path):
         """Extract the group ID from filename using ID (first part) + Timestamp (last part)"""
-        filename = os.path.basename(image_path)
-        filename_without_ext = os.path.splitext(filename)[0]
-        
-        # Split by underscore to get parts
-        parts = filename_without_ext.split('_')
-        if len(parts) >= 2:
-            # Get ID (first part) and timestamp (last part)
-            id_part = parts[0]
-            timestamp_part = parts[-1]
-            # Return concatenated ID + timestamp as unique group identifier
-            group_id = f"{id_part}_{timestamp_part}"
-            return group_id
-        elif len(parts) == 1:
-            # If only one part, use it as both ID and timestamp
-            return parts[0]
-        else:
-            # If no underscore, use the entire filename as identifier
-            return filename_without_ext
+        return FilenameRecord.of(image_path).session_id
 
-    def calculate_session_labels(self):
-        """Calculate session labels based on the labeling rules and return a dict"""
+    def calculate_session_labels(self, sessions=None):
+        """
+        Calculate session labels based on the labeling rules and return a dict.
+        sessions (session_id -> paths) may be passed by callers that already grouped the images.
+        """
         if not hasattr(self, 'all_image_paths') or not self.all_image_paths:
             return {}
 
-        # Group images by their unique identifier (ID + Timestamp combination)
-        sessions = {}
-        for path in self.all_image_paths:
-            session_id = self.get_session_number(path)
-            if session_id:
-                if session_id not in sessions:
-                    sessions[session_id] = []
-                sessions[session_id].append(path)
+        if sessions is None:
+            cache = self._session_label_cache()
+            if cache is not None:
+                return dict(cache.labels)
+            # Images grouped by their unique identifier (ID + Timestamp combination)
+            sessions = self._session_groups()
 
         # Calculate session labels based on rules with new 7-category system
         session_labels_dict = {}
@@ -4225,14 +7407,12 @@ class ImageLabelTool:
         if not hasattr(self, 'all_image_paths') or not self.all_image_paths:
             return 0
         
-        # Group images by session
-        sessions = {}
-        for path in self.all_image_paths:
-            session_id = self.get_session_number(path)
-            if session_id:
-                if session_id not in sessions:
-                    sessions[session_id] = []
-                sessions[session_id].append(path)
+        cache = self._session_label_cache()
+        if cache is not None:
+            return cache.ocr_readable_sessions
+        
+        # Images grouped by session
+        sessions = self._session_groups()
         
         # Count sessions with at least one OCR readable image
         ocr_readable_sessions = 0
@@ -4249,14 +7429,12 @@ class ImageLabelTool:
         if not hasattr(self, 'all_image_paths') or not self.all_image_paths:
             return 0
         
-        # Group images by session
-        sessions = {}
-        for path in self.all_image_paths:
-            session_id = self.get_session_number(path)
-            if session_id:
-                if session_id not in sessions:
-                    sessions[session_id] = []
-                sessions[session_id].append(path)
+        cache = self._session_label_cache()
+        if cache is not None:
+            return cache.false_noread_sessions
+        
+        # Images grouped by session
+        sessions = self._session_groups()
         
         # Count sessions only when every image in the session is flagged False NoRead
         false_noread_sessions = 0
@@ -4273,30 +7451,26 @@ class ImageLabelTool:
 
     def calculate_session_category_counts(self, session_labels_dict=None):
         """Return consistent session category totals for analysis and log displays."""
-        if session_labels_dict is None:
-            session_labels_dict = self.calculate_session_labels()
+        cache = self._session_label_cache() if session_labels_dict is None else None
+        if cache is not None:
+            # Sessions per label, maintained as labels change
+            label_counts = cache.label_counts
+        else:
+            if session_labels_dict is None:
+                session_labels_dict = self.calculate_session_labels()
+            label_counts = {}
+            for label in session_labels_dict.values():
+                label_counts[label] = label_counts.get(label, 0) + 1
 
         counts = {
-            'total_sessions': len(session_labels_dict),
-            'sessions_no_code': 0,
-            'sessions_read_failure': 0,
-            'sessions_unreadable': 0,
-            'sessions_false_noread': 0,
-            'sessions_unlabeled': 0
+            'total_sessions': sum(label_counts.values()),
+            'sessions_no_code': label_counts.get("no label", 0),
+            'sessions_read_failure': label_counts.get("read failure", 0),
+            'sessions_unreadable': label_counts.get("unreadable", 0),
+            'sessions_false_noread': label_counts.get("FalseNoRead", 0),
+            'sessions_unlabeled': label_counts.get("unlabeled", 0)
         }
 
-        for label in session_labels_dict.values():
-            if label == "no label":
-                counts['sessions_no_code'] += 1
-            elif label == "read failure":
-                counts['sessions_read_failure'] += 1
-            elif label == "unreadable":
-                counts['sessions_unreadable'] += 1
-            elif label == "FalseNoRead":
-                counts['sessions_false_noread'] += 1
-            elif label == "unlabeled":
-                counts['sessions_unlabeled'] += 1
-
         counts['adjusted_failed_sessions'] = max(counts['total_sessions'] - counts['sessions_false_noread'], 0)
         return counts
 
@@ -4334,14 +7508,8 @@ class ImageLabelTool:
         if not hasattr(self, 'all_image_paths') or not self.all_image_paths:
             return {}
         
-        # Group images by session
-        sessions = {}
-        for path in self.all_image_paths:
-            session_id = self.get_session_number(path)
-            if session_id:
-                if session_id not in sessions:
-                    sessions[session_id] = []
-                sessions[session_id].append(path)
+        # Images grouped by session
+        sessions = self._session_groups()
         
         # Calculate OCR readable status for each session
         session_ocr_readable_dict = {}
@@ -4357,6 +7525,10 @@ class ImageLabelTool:
         if not hasattr(self, 'all_image_paths') or not self.all_image_paths:
             return 0
         
+        cache = self._session_label_cache()
+        if cache is not None:
+            return cache.ocr_readable_non_failure_sessions
+        
         session_labels_dict = self.calculate_session_labels()
         session_ocr_readable_dict = self.calculate_session_ocr_readable_status()
         
@@ -4376,8 +7548,7 @@ class ImageLabelTool:
             self.session_count_var.set("")
             return
 
-        session_labels_dict = self.calculate_session_labels()
-        session_counts = self.calculate_session_category_counts(session_labels_dict)
+        session_counts = self.calculate_session_category_counts()
 
         # Count sessions by different categories
         total_sessions = session_counts['total_sessions']
@@ -4451,8 +7622,7 @@ class ImageLabelTool:
             return
 
         # Get current session statistics
-        session_labels_dict = self.calculate_session_labels()
-        session_counts = self.calculate_session_category_counts(session_labels_dict)
+        session_counts = self.calculate_session_category_counts()
         actual_sessions = session_counts['total_sessions']
         sessions_no_code = session_counts['sessions_no_code']
         sessions_read_failure = session_counts['sessions_read_failure']
@@ -4505,23 +7675,24 @@ class ImageLabelTool:
         min_id = float('inf')
         valid_ids_found = False
         
-        for path in self.all_image_paths:
-            filename = os.path.basename(path)
-            filename_without_ext = os.path.splitext(filename)[0]
-            
-            # Split by underscore to get parts
-            parts = filename_without_ext.split('_')
-            if len(parts) >= 1:
+        index = self._indexed_folder()
+        if index is not None:
+            # IDs were parsed when the files were indexed
+            id_range = index.id_range()
+            if id_range:
+                min_id, max_id = id_range
+                valid_ids_found = True
+        else:
+            for path in self.all_image_paths:
                 try:
                     # Get ID (first part before first underscore) and convert to number
-                    id_part = parts[0]
-                    id_number = int(id_part)
-                    max_id = max(max_id, id_number)
-                    min_id = min(min_id, id_number)
-                    valid_ids_found = True
+                    id_number = int(FilenameRecord.of(path).trigger)
                 except ValueError:
                     # Skip files where the first part is not a number
                     continue
+                max_id = max(max_id, id_number)
+                min_id = min(min_id, id_number)
+                valid_ids_found = True
         
         if valid_ids_found and max_id >= min_id:
             # Calculate total sessions as the range: max_id - min_id + 1
@@ -4539,54 +7710,33 @@ class ImageLabelTool:
         if event.widget == self.root:
             # Update image display if images are loaded
             if hasattr(self, 'image_paths') and self.image_paths:
-                # Use after_idle to ensure the window has finished resizing
-                self.root.after_idle(self.show_image)
+                # Coalesce the stream of Configure events while the window is being resized
+                self.request_render()
 
-    def apply_histogram_equalization(self, img):
-        """Apply histogram equalization to enhance image contrast"""
+    def apply_histogram_equalization(self, img, mode="lab"):
+        """
+        Apply CLAHE (Contrast Limited Adaptive Histogram Equalization) to enhance contrast.
+        
+        mode 'lab' equalizes only the lightness channel of LAB, keeping colours;
+        mode 'gray' equalizes a single grayscale channel (monochrome cameras).
+        Grayscale input images always take the single-channel path.
+        """
         try:
-            # Convert PIL image to numpy array for OpenCV processing
-            import numpy as np
+            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
             
-            # Convert to RGB if not already (PIL images are RGB by default)
+            if mode == "gray" or img.mode in ("L", "I;16", "I", "F"):
+                # Single channel: one CLAHE pass on the grayscale image
+                gray = np.array(img.convert('L'))
+                return Image.fromarray(clahe.apply(gray))
+            
+            # Convert to RGB if not already (e.g. palette or RGBA images)
             if img.mode != 'RGB':
                 img = img.convert('RGB')
             
-            # Convert PIL image to numpy array
-            img_array = np.array(img)
-            
-            # Convert RGB to BGR for OpenCV (OpenCV uses BGR)
-            img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-            
-            # Convert to grayscale for histogram equalization
-            gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-            
-            # Apply histogram equalization
-            equalized = cv2.equalizeHist(gray)
-            
-            # Convert back to BGR color by replicating the equalized grayscale to all channels
-            # This creates a grayscale image with better contrast
-            equalized_bgr = cv2.cvtColor(equalized, cv2.COLOR_GRAY2BGR)
-            
-            # For color images, apply CLAHE (Contrast Limited Adaptive Histogram Equalization) to each channel
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-            
-            # Split BGR channels and apply CLAHE to each
-            b, g, r = cv2.split(img_bgr)
-            b_eq = clahe.apply(b)
-            g_eq = clahe.apply(g)
-            r_eq = clahe.apply(r)
-            
-            # Merge channels back
-            equalized_color = cv2.merge([b_eq, g_eq, r_eq])
-            
-            # Convert back to RGB for PIL
-            equalized_rgb = cv2.cvtColor(equalized_color, cv2.COLOR_BGR2RGB)
-            
-            # Convert numpy array back to PIL image
-            equalized_img = Image.fromarray(equalized_rgb)
-            
-            return equalized_img
+            # Equalize the L channel of LAB once instead of each colour channel separately
+            lab = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2LAB)
+            lab[:, :, 0] = clahe.apply(lab[:, :, 0])
+            return Image.fromarray(cv2.cvtColor(lab, cv2.COLOR_LAB2RGB))
             
         except Exception as e:
             # If histogram equalization fails, return original image
@@ -4625,7 +7775,7 @@ class ImageLabelTool:
             # Start zoom from current fitted scale and increment it
             current_scale = getattr(self, 'current_scale_factor', 1.0)
             self.zoom_level = min(current_scale * 1.25, 5.0)  # Increment from current scale
-        self.show_image()  # No text blink for zoom operations
+        self.request_render()  # No text blink for zoom operations
 
     def zoom_out(self):
         """Decrease zoom level"""
@@ -4639,7 +7789,7 @@ class ImageLabelTool:
             # Start zoom from current fitted scale and decrement it
             current_scale = getattr(self, 'current_scale_factor', 1.0)
             self.zoom_level = max(current_scale / 1.25, 0.1)  # Decrement from current scale
-        self.show_image()  # No text blink for zoom operations
+        self.request_render()  # No text blink for zoom operations
 
     def mouse_wheel_zoom(self, event):
         """Handle mouse wheel zoom"""
@@ -4701,20 +7851,14 @@ class ImageLabelTool:
             if abs_x < 0 or abs_y < 0:
                 # Clamp coordinates to valid image area if click is in padding
                 path = self.image_paths[self.current_index]
-                img = Image.open(path)
-                orig_width, orig_height = img.size
+                orig_width, orig_height = self._get_image_size(path)
                 abs_x = max(0, min(abs_x, orig_width))
                 abs_y = max(0, min(abs_y, orig_height))
         else:
             # In fitted mode: need to account for centering offset and current scale
+            # (histogram equalization does not change the image size)
             path = self.image_paths[self.current_index]
-            img = Image.open(path)
-            
-            # Apply the same processing that will be used for display
-            if hasattr(self, 'histogram_eq_enabled') and self.histogram_eq_enabled.get():
-                img = self.apply_histogram_equalization(img)
-                
-            original_width, original_height = img.size
+            original_width, original_height = self._get_image_size(path)
             # Debug: uncomment for troubleshooting
             # print(f"🔍 FITTED DEBUG: Using processed image size ({original_width}x{original_height})")
             
@@ -4780,8 +7924,8 @@ class ImageLabelTool:
                 new_zoom = max(current_scale * zoom_factor, 0.1)
             self.zoom_level = new_zoom
         
-        # Redisplay image with new zoom
-        self.show_image()  # No text blink for zoom operations
+        # Redisplay image with new zoom (preview now, so the scroll region is ready for centering)
+        self.request_render(preview_now=True)  # No text blink for zoom operations
         
         # Center the clicked point in viewport after the image is redrawn
         # Use multiple delays to ensure proper timing
@@ -4791,6 +7935,7 @@ class ImageLabelTool:
             # Ensure canvas is updated first
             self.canvas.update_idletasks()
             self._center_image_point(abs_x, abs_y)
+            self._update_visible_tiles()
         
         # Allow more time for the image to be fully displayed before centering
         self.root.after(50, delayed_center)
@@ -4806,10 +7951,7 @@ class ImageLabelTool:
             
         # Get the actual current image dimensions to validate coordinates
         path = self.image_paths[self.current_index]
-        img = Image.open(path)
-        if hasattr(self, 'histogram_eq_enabled') and self.histogram_eq_enabled.get():
-            img = self.apply_histogram_equalization(img)
-        orig_width, orig_height = img.size
+        orig_width, orig_height = self._get_image_size(path)
         
         # Clamp coordinates to valid range
         image_x = max(0, min(image_x, orig_width))
@@ -4971,6 +8113,22 @@ class ImageLabelTool:
     def do_pan(self, event):
         """Perform panning with mouse drag"""
         self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self._update_visible_tiles()
+
+    def on_scrollbar_x(self, *args):
+        """Horizontal scrollbar command: scroll and fill in newly exposed tiles"""
+        self.canvas.xview(*args)
+        self._update_visible_tiles()
+
+    def on_scrollbar_y(self, *args):
+        """Vertical scrollbar command: scroll and fill in newly exposed tiles"""
+        self.canvas.yview(*args)
+        self._update_visible_tiles()
+
+    def _update_visible_tiles(self):
+        """Render the tiles that became visible after a pan, scroll or centering"""
+        if self.scale_1to1:
+            self.tile_renderer.update_visible()
 
     def detect_barcode_count(self, image_path):
         """Detect barcode in an image and return the count of detected barcodes"""
@@ -5131,25 +8289,34 @@ class ImageLabelTool:
         if not hasattr(self, 'folder_path') or not self.folder_path:
             return []
         
-        # Scan current folder for all image files
+        # Rescan the folder only if it changed since the last check
         try:
-            all_files = [f for f in os.listdir(self.folder_path)
-                        if f.lower().endswith((".png", ".jpg", ".jpeg", ".bmp", ".gif"))]
-            
-            current_image_paths = []
-            for f in all_files:
-                current_image_paths.append(os.path.join(self.folder_path, f))
-            
-            current_image_paths_set = set(current_image_paths)
+            index = self._indexed_folder()
+            if index is None:
+                index = self.folder_index
+                index.open(self.folder_path)
+                added = index.paths()
+            else:
+                added, _ = index.refresh()
             
             # Find new files (not in previously seen files)
-            new_files = current_image_paths_set - self.previously_seen_files
+            new_files = [path for path in added if path not in self.previously_seen_files]
             
             # Update our records
             if new_files:
                 self.previously_seen_files.update(new_files)
+                self.records.add_paths(new_files)
+                # Files may have been rewritten as well; re-check signatures on next access
+                self.image_cache.refresh_signatures()
                 # Also update all_image_paths to include new files
-                self.all_image_paths = sorted(current_image_paths)
+                session_index = self._synced_session_index()
+                counted = self.records.lists(self.all_image_paths)
+                self.all_image_paths = list(index.paths())
+                if session_index is not None:
+                    session_index.add(new_files, self.all_image_paths)
+                if counted:
+                    self.records.list_more(new_files, self.all_image_paths)
+                self.proxy_cache.build(new_files)
                 # Refresh the display if needed
                 self.apply_filter()
             
@@ -5225,6 +8392,8 @@ class ImageLabelTool:
         
         self.logger.info(f"Processing {total_images} unclassified images...")
         
+        results = []  # (path, label) not yet handed to the Tk thread
+        last_applied = time.time()
         for image_path in unclassified_images:
             # Update progress on UI thread
             self.root.after(0, self.update_auto_detect_progress, processed, total_images, os.path.basename(image_path))
@@ -5244,25 +8413,12 @@ class ImageLabelTool:
             filename = os.path.basename(image_path)
             self.logger.info(f"CLASSIFIED: {filename} → {label} (barcode count: {detection_result})")
             
-            # Update labels dictionary
-            if not hasattr(self, 'labels'):
-                self.labels = {}
-            if not hasattr(self, 'comments'):
-                self.comments = {}
-            self.labels[image_path] = label
-            
-            # If this is the currently displayed image, refresh the display immediately
-            if (hasattr(self, 'image_paths') and self.image_paths and 
-                self.current_index < len(self.image_paths) and 
-                image_path == self.image_paths[self.current_index]):
-                self.root.after(0, self.show_image)
-            
-            # Save to CSV immediately
-            self.root.after(0, self.save_csv)
-            
-            # Update statistics
-            self.root.after(0, self.update_total_stats)
-            self.root.after(0, self.update_session_stats)
+            # Labels are stored and saved by the Tk thread, one batch at a time
+            results.append((image_path, label))
+            if time.time() - last_applied >= AUTO_DETECT_APPLY_INTERVAL_S:
+                self.root.after(0, self._save_auto_detection_batch, results)
+                results = []
+                last_applied = time.time()
             
             # Small delay to show progress (and simulate processing time)
             time.sleep(0.1)
@@ -5279,15 +8435,38 @@ class ImageLabelTool:
         self.logger.info("-" * 50)
         
         # Final update
-        self.root.after(0, self.complete_auto_detection, total_images)
+        self.root.after(0, self.complete_auto_detection, total_images, results)
 
     def update_auto_detect_progress(self, processed, total, current_file):
         """Update the progress display for auto detection"""
         progress_text = f"Processing: {processed}/{total}\nCurrent: {current_file}"
         self.auto_detect_progress_var.set(progress_text)
 
-    def complete_auto_detection(self, total_processed):
+    def _apply_auto_detection(self, results):
+        """Store the (path, label) results of an auto detection worker (Tk thread)"""
+        paths = [path for path, _ in results]
+        for path, label in results:
+            self.labels[path] = label
+        self._mark_store_dirty(paths)
+        # If the currently displayed image was classified, refresh the display
+        if self.image_paths and self.current_index < len(self.image_paths):
+            return self.image_paths[self.current_index] in set(paths)
+        return False
+
+    def _save_auto_detection_batch(self, results):
+        """Store one batch of auto detection results and save it as one snapshot (Tk thread)"""
+        current_changed = self._apply_auto_detection(results)
+        self.save_csv()
+        self.update_counts()
+        self.update_total_stats()
+        self.update_session_stats()
+        if current_changed:
+            self.show_image()
+
+    def complete_auto_detection(self, total_processed, results):
         """Complete the auto classification process"""
+        self._apply_auto_detection(results)
+        
         # Re-enable all UI controls (no button to re-enable)
         self.enable_ui_controls()
         
@@ -5322,6 +8501,8 @@ class ImageLabelTool:
         
         self.logger.info(f"Processing {total_files} new unlabeled files...")
         
+        results = []  # (path, label) not yet handed to the Tk thread
+        last_applied = time.time()
         for file_path in new_files:
             # Update progress on UI thread
             filename = os.path.basename(file_path)
@@ -5341,18 +8522,12 @@ class ImageLabelTool:
             # Log the classification decision
             self.logger.info(f"NEW FILE CLASSIFIED: {filename} → {label} (barcode count: {detection_result})")
             
-            # Update labels dictionary
-            if not hasattr(self, 'labels'):
-                self.labels = {}
-            if not hasattr(self, 'comments'):
-                self.comments = {}
-            self.labels[file_path] = label
-            
-            # Save to CSV and update stats
-            self.root.after(0, self.save_csv)
-            self.root.after(0, self.update_counts)
-            self.root.after(0, self.update_total_stats)
-            self.root.after(0, self.update_session_stats)
+            # Labels are stored and saved by the Tk thread, one batch at a time
+            results.append((file_path, label))
+            if time.time() - last_applied >= AUTO_DETECT_APPLY_INTERVAL_S:
+                self.root.after(0, self._save_auto_detection_batch, results)
+                results = []
+                last_applied = time.time()
             
             # Small delay to show progress
             time.sleep(0.1)
@@ -5368,10 +8543,14 @@ class ImageLabelTool:
         self.logger.info("-" * 30)
         
         # Final update
-        self.root.after(0, self.complete_new_files_detection, total_files)
+        self.root.after(0, self.complete_new_files_detection, total_files, results)
 
-    def complete_new_files_detection(self, total_processed):
+    def complete_new_files_detection(self, total_processed, results):
         """Complete the new files auto classification process"""
+        # Store and save the last batch
+        if results:
+            self._save_auto_detection_batch(results)
+        
         # Update progress display
         self.auto_detect_progress_var.set(f"Completed processing {total_processed} new files!")
         
@@ -5543,7 +8722,7 @@ class ImageLabelTool:
                 self.root.update_idletasks()
             
             # Extract session ID from filename
-            session_id = self.extract_session_id_from_filename(filename)
+            session_id = self.extract_session_id_from_filename(image_path)
             if session_id:
                 # Get the classification for this image
                 classification = self.labels.get(image_path, 'unlabeled')
@@ -5577,7 +8756,7 @@ class ImageLabelTool:
             # Collect detailed data for each session
             for image_path in self.all_image_paths:
                 filename = os.path.basename(image_path)
-                session_id = self.extract_session_id_from_filename(filename)
+                session_id = self.extract_session_id_from_filename(image_path)
                 if session_id:
                     classification = self.labels.get(image_path, 'unlabeled')
                     if session_id not in session_data:
@@ -5754,32 +8933,11 @@ class ImageLabelTool:
 
     def extract_session_id_from_filename(self, filename):
         """Extract session ID from filename based on known patterns"""
-        # Remove file extension
-        name_without_ext = os.path.splitext(filename)[0]
-        
-        # Common patterns for session ID extraction
-        # Pattern 1: SessionID_TriggerID_... (e.g., "12345_001_image.jpg" -> session "12345")
-        # Pattern 2: Complex patterns like "12345_001_20240101_120000.jpg"
-        
-        parts = name_without_ext.split('_')
-        
-        if len(parts) >= 2:
-            # First part is typically the session ID
-            potential_session_id = parts[0]
-            
-            # Validate that it looks like a session ID (numeric or alphanumeric)
-            if potential_session_id and (potential_session_id.isdigit() or potential_session_id.isalnum()):
-                return potential_session_id
-        
-        # If standard pattern doesn't work, try other common patterns
-        # Some files might have format like "IMG_sessionID_triggerID.jpg"
-        if filename.upper().startswith('IMG_') and len(parts) >= 3:
-            return parts[1]  # Second part after IMG_
-        
-        # Fallback: return first part if it seems valid
-        if parts and parts[0] and (parts[0].isdigit() or parts[0].isalnum()):
-            return parts[0]
-        
+        # SessionID_TriggerID_... (e.g., "12345_001_image.jpg" -> session "12345"); "IMG_..." names
+        # give "IMG" like the old fallback did. The ID must be numeric or alphanumeric.
+        session_id = FilenameRecord.of(filename).trigger
+        if session_id and session_id.isalnum():
+            return session_id
         return None
 
     def determine_session_classification(self, image_classifications, session_image_paths=None):
@@ -5855,8 +9013,7 @@ class ImageLabelTool:
         
         # Find all images for the target session
         for image_path in self.all_image_paths:
-            filename = os.path.basename(image_path)
-            session_id = self.extract_session_id_from_filename(filename)
+            session_id = self.extract_session_id_from_filename(image_path)
             
             if session_id == str(target_session_id):
                 classification = self.labels.get(image_path, 'unlabeled')
@@ -5932,6 +9089,7 @@ class ImageLabelTool:
                 # Update the CSV to mark these as unclassified
                 for file_path in new_unlabeled_files:
                     self.labels[file_path] = "(Unclassified)"
+                self._mark_store_dirty(new_unlabeled_files)
                 self.save_csv()
                 self.update_counts()
                 # Refresh the UI to show the new images
@@ -5982,6 +9140,7 @@ class ImageLabelTool:
                 # Update the CSV to mark these as unclassified
                 for file_path in new_unlabeled_files:
                     self.labels[file_path] = "(Unclassified)"
+                self._mark_store_dirty(new_unlabeled_files)
                 self.save_csv()
                 self.update_counts()
                 # Refresh the UI to show the new images
@@ -6076,8 +9235,14 @@ class ImageLabelTool:
                 
                 # Update the all_image_paths list with new images
                 if new_images:
+                    session_index = self._synced_session_index()
+                    counted = self.records.lists(self.all_image_paths)
                     self.all_image_paths.extend(new_images)
                     self.all_image_paths.sort(key=self.get_image_sort_key)
+                    if session_index is not None:
+                        session_index.add(new_images, self.all_image_paths)
+                    if counted:
+                        self.records.list_more(new_images, self.all_image_paths)
             else:
                 # If all_image_paths doesn't exist, all current images are "new"
                 new_images = current_image_paths
@@ -6120,6 +9285,7 @@ class ImageLabelTool:
                 # Update the CSV to mark these as unclassified
                 for file_path in new_unlabeled_files:
                     self.labels[file_path] = "(Unclassified)"
+                self._mark_store_dirty(new_unlabeled_files)
                 self.save_csv()
                 self.update_counts()
                 # Refresh the UI to show the new images
@@ -6251,6 +9417,7 @@ class ImageLabelTool:
             if not hasattr(self, 'comments'):
                 self.comments = {}
             self.labels[image_path] = label
+            self._mark_store_dirty([image_path])
             
             # If this is the currently displayed image, refresh the display immediately
             if (hasattr(self, 'image_paths') and self.image_paths and 
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the parse-once filename records
+"""
+import os
+import image_label_tool
+from image_label_tool import FilenameRecord
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+def make_app(paths):
+    """App object without a window, with the label state __init__ sets up for paths"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.all_image_paths = list(paths)
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+def reference_sort_key(image_path):
+    """get_image_sort_key before the filename records"""
+    parts = os.path.basename(image_path).split('_')
+    if len(parts) >= 2:
+        trigger_id = int(parts[0]) if parts[0].isdigit() else 0
+        sub_image_count = int(parts[1]) if parts[1].isdigit() else 0
+        return (trigger_id, sub_image_count)
+    return (0, 0)
+
+
+def reference_session_number(image_path):
+    """get_session_number before the filename records"""
+    parts = os.path.splitext(os.path.basename(image_path))[0].split('_')
+    return f"{parts[0]}_{parts[-1]}" if len(parts) >= 2 else parts[0]
+
+
+def reference_trigger_id(image_path):
+    """Numeric ID as auto_detect_total_groups and the folder index parsed it before"""
+    try:
+        return int(os.path.splitext(os.path.basename(image_path))[0].split('_')[0])
+    except ValueError:
+        return None
+
+
+NAMES = ["0000000042_0003_001_20240101.jpg", "0000000042_0003_001_20240101_120000.png", "0000000007.jpg",
+         "0000000007_0001.jpg", "IMG_0001_0002.jpg", "abc_def.bmp", "no_digits_here_x.gif", "_0001_x.jpg",
+         "0000000001_000x_001_20240101.jpeg", " 12_0001_001_20240101.jpg", "+3_0001_001_20240101.jpg",
+         "\u0661\u0662_0001_001_20240101.jpg"]
+
+
+def test_records_match_old_parsers():
+    """Every field equals what the separate parsers computed"""
+    print("Testing filename records...")
+    FilenameRecord.forget()
+    app = make_app([])
+    for name in NAMES:
+        path = os.path.join("/data", name)
+        record = FilenameRecord.of(path)
+        assert app.get_image_sort_key(path) == reference_sort_key(path), name
+        assert app.get_session_number(path) == reference_session_number(path), name
+        stem = os.path.splitext(name)[0].split('_')
+        assert record.trigger_id == reference_trigger_id(path), name
+        assert app.extract_session_id_from_filename(path) == (stem[0] if stem[0].isalnum() else None), name
+    record = FilenameRecord.of("/data/0000000042_0003_001_20240101.jpg")
+    assert (record.trigger_id, record.sub_image, record.camera, record.timestamp) == (42, 3, "001", "20240101")
+    assert app.extract_date_from_filename("0000000042_0003_001_20240101.jpg") == "01-01-2024"
+    print(f"✓ {len(NAMES)} filenames parsed like before")
+
+
+def test_parsed_once():
+    """Repeated lookups return the memoized record; forget() starts over"""
+    FilenameRecord.forget()
+    path = "/data/0000000001_0001_001_20240101.jpg"
+    app = make_app([path])
+    record = FilenameRecord.of(path)
+    app.get_image_sort_key(path), app.get_session_number(path), app._describe_image_file(path)
+    assert FilenameRecord.of(path) is record
+    parses = []
+    record.date(lambda: parses.append(1) or "01-01-2024")
+    assert record.date(lambda: parses.append(1)) == "01-01-2024" and len(parses) == 1
+    FilenameRecord.forget()
+    assert FilenameRecord.of(path) is not record
+    assert not hasattr(record, "__dict__")
+    print("✓ Each path parsed once (date on first use)")
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_records_match_old_parsers()
+        test_parsed_once()
+        print("\n🎉 FILENAME RECORD TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 FILENAME RECORD TEST FAILED: {e}")
+        sys.exit(1)
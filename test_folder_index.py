@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the persisted folder index and its incremental refresh
+"""
+import os
+import shutil
+import tempfile
+import time
+import image_label_tool
+
+
+def make_app():
+    return image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+
+
+def touch(folder, name):
+    with open(os.path.join(folder, name), "wb") as f:
+        f.write(b"\xff\xd8")
+
+
+def age_folder(folder):
+    """Backdate the folder mtime so it is outside the index's safety margin"""
+    past = time.time() - 60
+    os.utime(folder, (past, past))
+
+
+def test_reopen_parses_only_changed_files():
+    """A reopen with no changes parses nothing; added files are the only ones parsed"""
+    print("Testing folder index refresh...")
+    test_dir = tempfile.mkdtemp(prefix="folder_index_test_")
+    try:
+        folder = os.path.join(test_dir, "images")
+        os.makedirs(folder)
+        for trigger in (10, 2, 33):
+            for sub in (2, 1):
+                touch(folder, f"{trigger:010d}_{sub:04d}_001_20240101.jpg")
+        touch(folder, "revision_20240101_120000.csv")
+        touch(folder, "notes.txt")
+        age_folder(folder)
+
+        app = make_app()
+        described = []
+
+        def describe(path):
+            described.append(os.path.basename(path))
+            return app._describe_image_file(path)
+
+        index_dir = os.path.join(test_dir, "index")
+        index = image_label_tool.FolderIndex(describe, root_dir=index_dir)
+        added, removed = index.open(folder)
+        assert len(described) == 6 and len(added) == 6 and removed == []
+        expected = sorted((os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(".jpg")),
+                          key=app.get_image_sort_key)
+        assert index.paths() == expected, index.paths()
+        assert index.revision_files() == ["revision_20240101_120000.csv"]
+        assert index.id_range() == (2, 33)
+        assert index.entry(expected[0])[3] == "0000000002_20240101"
+        print(f"✓ First open: {len(described)} files parsed, sorted by trigger ID and sub-image")
+
+        # Reopen in a new process: nothing changed, so nothing is listed or parsed
+        described.clear()
+        original_scandir = image_label_tool.os.scandir
+        scans = []
+        image_label_tool.os.scandir = lambda path: (scans.append(path), original_scandir(path))[1]
+        try:
+            reopened = image_label_tool.FolderIndex(describe, root_dir=index_dir)
+            assert reopened.open(folder) == ([], [])
+            assert reopened.paths() == expected
+            assert described == [] and scans == [], (described, scans)
+            print("✓ Unchanged folder reopened without scanning")
+
+            # One new capture and one deleted: only the new file is parsed
+            touch(folder, "0000000005_0001_001_20240101.jpg")
+            os.remove(expected[-1])
+            added, removed = reopened.refresh()
+        finally:
+            image_label_tool.os.scandir = original_scandir
+        assert described == ["0000000005_0001_001_20240101.jpg"], described
+        assert added == [os.path.join(folder, "0000000005_0001_001_20240101.jpg")]
+        assert removed == [expected[-1]]
+        assert reopened.paths()[2] == added[0] and expected[-1] not in reopened.paths()
+        print(f"✓ Changed folder: {len(described)} file parsed, order updated")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_reopen_parses_only_changed_files()
+        print("\n🎉 FOLDER INDEX TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 FOLDER INDEX TEST FAILED: {e}")
+        sys.exit(1)
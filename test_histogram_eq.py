@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the cached, resolution-aware histogram equalization pipeline
+"""
+import os
+import shutil
+import tempfile
+import numpy as np
+from PIL import Image
+import image_label_tool
+
+
+def make_app():
+    """Create an app object for the render pipeline without building the Tk UI"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.image_cache = image_label_tool.ImageCache()
+    app.proxy_cache = image_label_tool.ProxyCache(root_dir=tempfile.mkdtemp(prefix="proxy_test_"))
+    return app
+
+
+def test_equalization_modes():
+    """Color mode keeps RGB, mono mode and grayscale input return one channel"""
+    print("Testing histogram equalization modes...")
+    app = make_app()
+    gradient = np.tile(np.linspace(60, 120, 256, dtype=np.uint8), (64, 1))
+    rgb = Image.fromarray(np.dstack([gradient, gradient, gradient]))
+
+    color = app.apply_histogram_equalization(rgb, "lab")
+    assert color.mode == "RGB" and color.size == rgb.size
+    mono = app.apply_histogram_equalization(rgb, "gray")
+    assert mono.mode == "L" and mono.size == rgb.size
+    gray_input = app.apply_histogram_equalization(Image.fromarray(gradient), "lab")
+    assert gray_input.mode == "L"
+
+    # CLAHE stretches the narrow 60..120 range
+    values = np.array(mono)
+    assert values.max() - values.min() > 60, (values.min(), values.max())
+    print(f"✓ Modes: lab -> {color.mode}, gray -> {mono.mode}, L input -> {gray_input.mode}")
+
+
+def test_fitted_equalization_runs_on_rendition_and_is_cached():
+    """With EQ on, the fitted path equalizes the downscaled image once and caches it"""
+    print("Testing fitted-mode equalization caching...")
+    test_dir = tempfile.mkdtemp(prefix="hist_eq_test_")
+    try:
+        path = os.path.join(test_dir, "0000000001_0001_001_20240101.jpg")
+        Image.new("RGB", (3200, 2400), (90, 120, 150)).save(path)
+
+        app = make_app()
+        calls = []
+        original_apply = app.apply_histogram_equalization
+
+        def recording_apply(img, mode="lab"):
+            calls.append(img.size)
+            return original_apply(img, mode)
+
+        app.apply_histogram_equalization = recording_apply
+
+        for _ in range(3):
+            display_img, original_size = app._render_fitted_image(path, (800, 600, "lab"))
+
+        assert original_size == (3200, 2400)
+        assert display_img.size == (800, 600)
+        assert calls == [(800, 600)], f"expected one equalization at display size, got {calls}"
+        # No full-resolution decode was cached for the fitted view
+        keys = list(app.image_cache._entries)
+        assert not any("decoded" in key for key in keys), keys
+        print(f"✓ Equalized once at {calls[0]}, cache: {app.image_cache.stats()}")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_equalization_modes()
+        test_fitted_equalization_runs_on_rendition_and_is_cached()
+        print("\n🎉 HISTOGRAM EQ TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 HISTOGRAM EQ TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the memory-budgeted image cache
+"""
+import os
+import shutil
+import tempfile
+from PIL import Image, JpegImagePlugin
+import image_label_tool
+
+
+def test_lru_eviction_by_bytes():
+    """Entries are evicted least-recently-used first once the byte budget is exceeded"""
+    print("Testing byte-budgeted LRU eviction...")
+    # Each 100x100 RGB image is 30,000 bytes; budget fits two of them
+    cache = image_label_tool.ImageCache(budget_bytes=70000)
+    images = {name: Image.new("RGB", (100, 100)) for name in ("a", "b", "c")}
+
+    cache.put(("a",), images["a"])
+    cache.put(("b",), images["b"])
+    assert cache.get(("a",)) is images["a"]  # "a" becomes most recently used
+    cache.put(("c",), images["c"])
+
+    assert cache.get(("b",)) is None, "least recently used entry should be evicted"
+    assert cache.get(("a",)) is images["a"]
+    assert cache.get(("c",)) is images["c"]
+    assert cache.current_bytes == 60000
+    print(f"✓ Evicted by bytes: {cache.stats()}")
+
+    # An entry larger than the whole budget is never stored
+    cache.put(("huge",), Image.new("RGB", (200, 200)))
+    assert cache.get(("huge",)) is None
+    assert cache.get(("a",)) is not None
+    print("✓ Oversized entries are skipped")
+
+
+def test_hit_miss_counters_and_signatures():
+    """Repeated access is served from memory and keys follow the file signature"""
+    print("Testing hit/miss counters and file signatures...")
+    test_dir = tempfile.mkdtemp(prefix="image_cache_test_")
+    try:
+        path = os.path.join(test_dir, "0000000001_0001_001_20240101.jpg")
+        Image.new("RGB", (64, 48), (10, 20, 30)).save(path)
+
+        cache = image_label_tool.ImageCache()
+        decodes = []
+
+        def decode():
+            decodes.append(path)
+            img = Image.open(path)
+            img.load()
+            return img
+
+        for _ in range(3):
+            cache.get_or_create(cache.key(path, "decoded"), decode)
+
+        stats = cache.stats()
+        assert len(decodes) == 1, "file should be decoded only once"
+        assert stats["hits"] == 2 and stats["misses"] == 1, stats
+        print(f"✓ Decoded once, counters: {stats}")
+
+        # Rewriting the file changes its signature once signatures are refreshed
+        Image.new("RGB", (64, 50), (10, 20, 30)).save(path)
+        cache.refresh_signatures()
+        img = cache.get_or_create(cache.key(path, "decoded"), decode)
+        assert len(decodes) == 2 and img.size == (64, 50)
+        print("✓ Changed file is decoded again after refresh_signatures()")
+
+        cache.evict_path(path)
+        assert cache.stats()["entries"] == 0
+        print("✓ evict_path() drops every rendition of a file")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_fitted_render_uses_reduced_jpeg_decode():
+    """Fitted renditions of JPEGs come from a DCT-scaled draft but report the original size"""
+    print("Testing reduced-resolution JPEG decode for fitted mode...")
+    test_dir = tempfile.mkdtemp(prefix="image_cache_test_")
+    try:
+        path = os.path.join(test_dir, "0000000001_0001_001_20240101.jpg")
+        Image.new("RGB", (4000, 3000), (90, 120, 150)).save(path)
+
+        # The render pipeline does not need Tk, so skip the GUI constructor
+        app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+        app.image_cache = image_label_tool.ImageCache()
+        app.proxy_cache = image_label_tool.ProxyCache(root_dir=os.path.join(test_dir, "proxies"))
+
+        draft_sizes = []
+        original_draft = JpegImagePlugin.JpegImageFile.draft
+
+        def recording_draft(img, mode, size):
+            draft_sizes.append(size)
+            return original_draft(img, mode, size)
+
+        JpegImagePlugin.JpegImageFile.draft = recording_draft
+        try:
+            display_img, original_size = app._render_fitted_image(path, (800, 600, False))
+        finally:
+            JpegImagePlugin.JpegImageFile.draft = original_draft
+
+        assert original_size == (4000, 3000), original_size
+        assert display_img.size == (800, 600), display_img.size
+        assert draft_sizes and draft_sizes[0] == (800, 600), draft_sizes
+        # The image size is cached as a side effect, so zoom helpers do not reopen the file
+        assert app._get_image_size(path) == (4000, 3000)
+        print(f"✓ Draft requested at {draft_sizes[0]}, displayed {display_img.size} of {original_size}")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_lru_eviction_by_bytes()
+        test_hit_miss_counters_and_signatures()
+        test_fitted_render_uses_reduced_jpeg_decode()
+        print("\n🎉 IMAGE CACHE TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 IMAGE CACHE TEST FAILED: {e}")
+        sys.exit(1)
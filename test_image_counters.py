@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the event-driven image counters of the counts and progress panels
+"""
+import random
+import image_label_tool
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+class Var:
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def make_app(paths):
+    """App object without a window, with the label state __init__ sets up for paths"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.all_image_paths = list(paths)
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+class FakeLabel:
+    def config(self, **kwargs):
+        pass
+
+
+def test_counters_match_recount():
+    """Counters follow every write and agree with a full recount, without scanning"""
+    print("Testing image counters...")
+    app = make_app(f"/data/{trigger:010d}_{sub:04d}_001_20240101.jpg"
+                   for trigger in range(1, 500) for sub in range(1, 4))
+    rng = random.Random(9)
+    # Labels of files no longer in the folder stay in the CSV but are not counted
+    app.labels["/data/0000099999_0001_001_20240101.jpg"] = "read failure"
+
+    def no_scan(paths):
+        raise AssertionError("counts were recomputed by scanning the images")
+
+    recount = app._count_images
+    app._count_images = no_scan
+    for step in range(2000):
+        path = rng.choice(app.all_image_paths)
+        kind = rng.random()
+        if kind < 0.5:
+            app.labels[path] = rng.choice(image_label_tool.LABELS + ["custom"])
+        elif kind < 0.65:
+            app.ocr_readable[path] = rng.random() < 0.5
+        elif kind < 0.8:
+            app.false_noread[path] = rng.random() < 0.5
+        else:
+            getattr(app, rng.choice(["labels", "ocr_readable", "false_noread"])).pop(path, None)
+        if step % 100 == 0:
+            assert app._image_counts() == recount(app.all_image_paths), step
+    counts, classified, ocr_readable_count, false_noread_count = app._image_counts()
+    print(f"✓ 2000 writes: {classified} classified, {ocr_readable_count} OCR, {false_noread_count} False NoRead"
+          " - equal to a full recount")
+
+    # Panels read the counters
+    app.count_var, app.progress_var = Var(), Var()
+    app.progress_label = FakeLabel()
+    app.update_warning_message = lambda: None
+    app.update_counts()
+    app.update_progress_display()
+    assert f"  no label: {counts['no label']}" in app.count_var.get()
+    assert f"{classified}/{len(app.all_image_paths)} classified" in app.progress_var.get()
+    assert "(OK)" in app.progress_var.get() or "custom" in app.labels.values()
+    print("✓ Counts and progress panels updated without a scan")
+
+    # A new image list (new files appended, or replaced) is counted again
+    app.all_image_paths.append("/data/0000000500_0001_001_20240101.jpg")
+    app._count_images = recount
+    assert app._image_counts() == recount(app.all_image_paths)
+    app.all_image_paths = app.all_image_paths[:100]
+    assert app._image_counts() == recount(app.all_image_paths)
+    print("✓ Changed image list recounted")
+
+
+def test_debug_check_reports_drift():
+    """With VERIFY_IMAGE_COUNTS the recount wins over corrupted counters"""
+    app = make_app(["/data/0000000001_0001_001_20240101.jpg"])
+    app.labels[app.all_image_paths[0]] = "no label"
+    app.records._listed_label_counts[app.records._label_code("no label")] += 5  # Simulated drift
+    image_label_tool.VERIFY_IMAGE_COUNTS = True
+    try:
+        counts, classified, _, _ = app._image_counts()
+    finally:
+        image_label_tool.VERIFY_IMAGE_COUNTS = False
+    assert counts["no label"] == 1 and classified == 1
+    print("✓ Integrity check against a full recount")
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_counters_match_recount()
+        test_debug_check_reports_drift()
+        print("\n🎉 IMAGE COUNTER TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 IMAGE COUNTER TEST FAILED: {e}")
+        sys.exit(1)
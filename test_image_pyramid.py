@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the background image pyramid used for zoomed-out tiles
+"""
+import time
+from PIL import Image
+import image_label_tool
+from test_tile_renderer import FakeCanvas, run_with_fake_photoimage
+
+
+def wait_for_levels(builder, key, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        levels = builder.levels(key)
+        if levels is not None:
+            return levels
+        time.sleep(0.02)
+    return None
+
+
+def test_pyramid_levels_built_in_background():
+    """Levels halve in size down to the tile size and are stored in the image cache"""
+    print("Testing pyramid construction...")
+    cache = image_label_tool.ImageCache()
+    builder = image_label_tool.PyramidBuilder(cache, min_size=256)
+    source = Image.new("RGB", (4096, 3072), (50, 100, 150))
+    key = ("big.jpg", 1, 2, "decoded", None)
+    cache.put(key, source)
+
+    try:
+        builder.request(key, lambda: source)
+        levels = wait_for_levels(builder, key)
+        assert levels is not None, "pyramid was not built"
+        sizes = [level.size for level in levels]
+        assert sizes == [(2048, 1536), (1024, 768), (512, 384)], sizes
+        print(f"✓ Levels: {sizes}")
+
+        # Evicting the decoded image drops its pyramid as well
+        cache.evict_path("big.jpg")
+        assert builder.levels(key) is None
+        assert cache.stats()["bytes"] == 0
+        print("✓ Pyramid evicted together with the decoded image")
+    finally:
+        builder.shutdown()
+
+
+def test_nearest_level_selection():
+    """The smallest level still covering the displayed size is chosen"""
+    print("Testing nearest level selection...")
+    source = Image.new("L", (4000, 4000))
+    levels = (Image.new("L", (2000, 2000)), Image.new("L", (1000, 1000)), Image.new("L", (500, 500)))
+    pick = image_label_tool.PyramidBuilder.nearest_level
+
+    assert pick(source, levels, 2.0) is source
+    assert pick(source, levels, 1.0) is source
+    assert pick(source, levels, 0.5) is levels[0]
+    assert pick(source, levels, 0.4) is levels[0]
+    assert pick(source, levels, 0.2) is levels[1]
+    assert pick(source, levels, 0.1) is levels[2]
+    assert pick(source, None, 0.1) is source
+    print("✓ Zoom 0.4 -> 2000px level, 0.2 -> 1000px level, 0.1 -> 500px level")
+
+
+def test_tiles_resample_from_level():
+    """Zoomed-out tiles read from the pyramid level, not the full-resolution source"""
+    print("Testing tile rendering from a pyramid level...")
+
+    def run():
+        canvas = FakeCanvas(600, 400)
+        renderer = image_label_tool.TileRenderer(canvas, tile_size=256)
+        source = Image.new("RGB", (4000, 4000), (255, 0, 0))
+        # A differently coloured level proves where the pixels come from
+        level = Image.new("RGB", (1000, 1000), (0, 0, 255))
+
+        renderer.set_image(source, ("a.jpg", None), 0.25, (0, 0), levels=(level,))
+        renderer.update_visible()
+        tiles = [data["image"].image for data in canvas.items.values()]
+        assert tiles and all(tile.getpixel((10, 10)) == (0, 0, 255) for tile in tiles)
+        assert all(tile.size == (256, 256) for tile in tiles)
+        print(f"✓ {len(tiles)} tiles rendered from the 1000px level")
+    run_with_fake_photoimage(run)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_pyramid_levels_built_in_background()
+        test_nearest_level_selection()
+        test_tiles_resample_from_level()
+        print("\n🎉 IMAGE PYRAMID TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 IMAGE PYRAMID TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the columnar image record store and its dict-like views
+"""
+import random
+import sys
+import threading
+import tracemalloc
+import image_label_tool
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+def make_app(paths):
+    """App object without a window, with the label state __init__ sets up for paths"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.all_image_paths = list(paths)
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+def make_paths(count):
+    return [f"/data/{trigger:010d}_{sub:04d}_001_20240101.jpg"
+            for trigger in range(1, count // 4 + 1) for sub in range(1, 5)]
+
+
+def test_views_behave_like_dicts():
+    """Random edits give the same contents through the views as through plain dicts"""
+    print("Testing record store views...")
+    app = make_app([])
+    paths = make_paths(400)
+    app._reset_image_records(paths)
+    reference = {name: {} for name in ("labels", "ocr_readable", "false_noread", "comments")}
+    rng = random.Random(3)
+    for _ in range(3000):
+        path = rng.choice(paths + ["/elsewhere/0000009999_0001_001_20240102.jpg"])
+        name = rng.choice(list(reference))
+        if rng.random() < 0.2:
+            reference[name].pop(path, None)
+            getattr(app, name).pop(path, None)
+        else:
+            value = {"labels": lambda: rng.choice(image_label_tool.LABELS + ["custom"]),
+                     "comments": lambda: rng.choice(["smear", "tilted", "dark"])}.get(name, lambda: rng.random() < 0.5)()
+            reference[name][path] = value
+            getattr(app, name)[path] = value
+    for name, expected in reference.items():
+        view = getattr(app, name)
+        assert view == expected and len(view) == len(expected), name
+        assert set(view) == set(expected) and all(view.get(p, "x") == expected.get(p, "x") for p in paths), name
+        assert all(p in paths or p.startswith("/elsewhere") for p in view)
+    print(f"✓ 3000 random edits match plain dicts ({len(app.records)} registered images)")
+
+    assert app.records.session_of(paths[5]) == app.get_session_number(paths[5])
+    assert app.records.trigger_of(paths[5]) == 2
+    assert app.records.trigger_of("/data/notes_a.jpg") is None
+    print("✓ Session and trigger columns parsed at registration")
+
+    app._reset_image_records(paths[:4])
+    assert len(app.labels) == 0 and len(app.records) == 4
+    print("✓ Folder switch empties every column")
+
+
+def test_batch_load_matches_writes():
+    """A CSV batch load gives the same views and counters as writing row by row"""
+    print("Testing batch load...")
+    rng = random.Random(4)
+    paths = make_paths(400)
+    rows = [(path, rng.choice(image_label_tool.LABELS + ["custom"]), rng.random() < 0.3, rng.random() < 0.3,
+             rng.choice(["", "smear"])) for path in paths[:300] + ["/elsewhere/0000009999_0001_001_20240102.jpg"]]
+    stores = []
+    for batch in (False, True):
+        app = make_app([])
+        app.all_image_paths = paths
+        app._reset_image_records(paths)
+        app.comments[paths[0]] = "old"
+        app.false_noread[paths[1]] = True
+        events = []
+        app.records.listener = events.append
+        if batch:
+            app.records.load(rows)
+            assert events == [None], "the listener is told once"
+        else:
+            for path, label, ocr_readable, false_noread, comment in rows:
+                app.labels[path], app.ocr_readable[path] = label, ocr_readable
+                app.false_noread[path], app.comments[path] = false_noread, comment
+        stores.append(app)
+    for name in ("labels", "ocr_readable", "false_noread", "comments"):
+        assert getattr(stores[0], name) == getattr(stores[1], name), name
+        assert len(getattr(stores[0], name)) == len(getattr(stores[1], name)), name
+    assert stores[0].records.listed_counts() == stores[1].records.listed_counts()
+    assert stores[1]._image_counts() == stores[1]._count_images(paths)
+    print(f"✓ {len(rows)} rows loaded in one batch, counters recounted")
+
+
+def test_concurrent_writes():
+    """Detection workers registering images while the UI labels others lose nothing"""
+    app = make_app([])
+    paths = make_paths(4000)
+    app._reset_image_records()
+
+    def label(chunk):
+        for path in chunk:
+            app.labels[path] = "no label"
+
+    threads = [threading.Thread(target=label, args=(paths[i::4],)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(app.labels) == len(paths) == len(app.records)
+    assert all(app.labels[path] == "no label" for path in paths)
+    print("✓ Concurrent registration from 4 threads")
+
+
+def test_memory_per_image():
+    """The store holds more per image than the four path-keyed dicts, in less memory"""
+    paths = make_paths(100000)
+
+    def measure(build):
+        tracemalloc.start()
+        kept = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        return size
+
+    def with_dicts():
+        # As filled by loading a revision CSV: every row has all four columns
+        columns = [{}, {}, {}, {}]
+        for path in paths:
+            columns[0][path] = "no label"
+            columns[1][path] = False
+            columns[2][path] = False
+            columns[3][path] = ""
+        return columns
+
+    def with_store():
+        store = image_label_tool.ImageRecordStore(lambda path: (path[6:16] + "_20240101", int(path[6:16])))
+        store.add_paths(paths)
+        for path in paths:
+            store.labels[path] = "no label"
+            store.ocr_readable[path] = False
+            store.false_noread[path] = False
+            store.comments[path] = ""
+        return store
+
+    dict_bytes = measure(with_dicts)
+    store_bytes = measure(with_store)
+    print(f"✓ {len(paths)} images: dicts {dict_bytes // len(paths)} B/image, "
+          f"store {store_bytes // len(paths)} B/image (incl. session/trigger columns)")
+    assert store_bytes < dict_bytes, (store_bytes, dict_bytes)
+
+if __name__ == "__main__":
+    try:
+        test_views_behave_like_dicts()
+        test_batch_load_matches_writes()
+        test_concurrent_writes()
+        test_memory_per_image()
+        print("\n🎉 IMAGE RECORD TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 IMAGE RECORD TEST FAILED: {e}")
+        sys.exit(1)
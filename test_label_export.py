@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the streamed JSON Lines / Parquet export of image and session tables
+"""
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import image_label_tool
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+class Var:
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def make_app(folder, csv_name="revision_20240101_120000.csv"):
+    """App object without a window, with the label state __init__ sets up, for four images in folder"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.folder_path = folder
+    app.csv_filename = os.path.join(folder, csv_name)
+    app.all_image_paths = [os.path.normpath(os.path.join(folder, f"0000000001_000{i}_001_20240101.jpg"))
+                           for i in range(1, 5)]
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+class FakeLabel:
+    def config(self, **kwargs):
+        pass
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_export_tables():
+    """The export has one row per image and per session, matching save_csv's data"""
+    print("Testing label export...")
+    folder = tempfile.mkdtemp(prefix="label_export_test_")
+    original_batch = image_label_tool.EXPORT_BATCH_ROWS
+    image_label_tool.EXPORT_BATCH_ROWS = 7  # Several batches per table
+    try:
+        app = make_app(folder)
+        rng = random.Random(11)
+        app.all_image_paths = [os.path.join(folder, f"{trigger:010d}_{sub:04d}_001_20240101.jpg")
+                               for trigger in range(1, 30) for sub in range(1, rng.randint(2, 5))]
+        app._reset_image_records(app.all_image_paths)
+        for path in app.all_image_paths:
+            if rng.random() < 0.8:
+                app.labels[path] = rng.choice(image_label_tool.LABELS[1:])
+                app.false_noread[path] = rng.random() < 0.3
+                app.ocr_readable[path] = rng.random() < 0.2
+        app.comments[app.all_image_paths[0]] = "smear, \"tilted\""
+        app.save_status_var = Var()
+        app.save_status_label = FakeLabel()
+        app.root.after = lambda ms, func, *args: func(*args)
+
+        app.export_label_tables()
+        deadline = time.time() + 10
+        while app._export_running and time.time() < deadline:
+            time.sleep(0.01)
+        assert not app._export_running and app.save_status_var.get().startswith("📤 Exported"), \
+            app.save_status_var.get()
+        exports = sorted(name for name in os.listdir(folder) if name.startswith("export_"))
+        expected = ["_images.jsonl", "_sessions.jsonl"]
+        if image_label_tool.HAS_PYARROW:
+            expected += ["_images.parquet", "_sessions.parquet"]
+        assert sorted(name[22:] for name in exports) == sorted(expected), exports
+        base = os.path.join(folder, exports[0][:22])
+
+        images = read_jsonl(base + "_images.jsonl")
+        assert [row["image_path"] for row in images] == [os.path.basename(p) for p in app.all_image_paths]
+        for row, path in zip(images, app.all_image_paths):
+            assert row["label"] == app.labels.get(path, "(Unclassified)")
+            assert row["false_noread"] == app.false_noread.get(path, False)
+            assert row["session_id"] == app.get_session_number(path)
+            assert row["trigger_id"] == int(os.path.basename(path)[:10])
+        assert images[0]["comment"] == "smear, \"tilted\""
+        print(f"✓ {len(images)} image rows")
+
+        sessions = read_jsonl(base + "_sessions.jsonl")
+        session_labels = app.calculate_session_labels()
+        assert [row["session_id"] for row in sessions] == list(dict.fromkeys(map(app.get_session_number,
+                                                                                app.all_image_paths)))
+        for row in sessions:
+            paths = [p for p in app.all_image_paths if app.get_session_number(p) == row["session_id"]]
+            assert row["session_label"] == session_labels.get(row["session_id"], "no label")  # as in save_csv
+            assert row["images"] == len(paths)
+            assert row["false_noread_images"] == sum(app.false_noread.get(p, False) for p in paths)
+            assert row["session_ocr_readable"] == any(app.ocr_readable.get(p, False) for p in paths)
+            assert row["read_failure_images"] == sum(app.labels.get(p) == "read failure" for p in paths)
+            assert row["unclassified_images"] == sum(p not in app.labels for p in paths)
+        print(f"✓ {len(sessions)} session rows with the session labels of the revision CSV")
+
+        if image_label_tool.HAS_PYARROW:
+            table = image_label_tool.pq.read_table(base + "_images.parquet")
+            assert table.num_rows == len(images) and str(table.schema.field("trigger_id").type) == "int64"
+            print("✓ Typed Parquet tables")
+        assert not [name for name in os.listdir(folder) if name.endswith(".tmp")]
+    finally:
+        image_label_tool.EXPORT_BATCH_ROWS = original_batch
+        shutil.rmtree(folder)
+
+
+def test_failed_export_reenables_button():
+    """Any exception in the export thread is reported and Export Data works again"""
+    print("Testing failed export...")
+    folder = tempfile.mkdtemp(prefix="label_export_test_")
+    original_session_rows = image_label_tool.LabelExporter.session_rows
+    try:
+        app = make_app(folder)
+        app.labels[app.all_image_paths[0]] = "no label"
+        app.save_status_var = Var()
+        app.save_status_label = FakeLabel()
+        app.root.after = lambda ms, func, *args: func(*args)
+
+        def broken_rows(self):
+            yield from ()
+            raise TypeError("unexpected record")
+
+        image_label_tool.LabelExporter.session_rows = broken_rows
+        app.export_label_tables()
+        deadline = time.time() + 10
+        while app._export_running and time.time() < deadline:
+            time.sleep(0.01)
+        assert not app._export_running
+        assert app.save_status_var.get() == "⚠️ Export failed: unexpected record", app.save_status_var.get()
+        assert not [name for name in os.listdir(folder) if name.endswith(".tmp")]
+        print("✓ TypeError reported, export re-enabled, no temp files left")
+    finally:
+        image_label_tool.LabelExporter.session_rows = original_session_rows
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_export_tables()
+        test_failed_export_reenables_button()
+        print("\n🎉 LABEL EXPORT TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 LABEL EXPORT TEST FAILED: {e}")
+        sys.exit(1)
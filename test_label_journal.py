@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the append-only label journal and its replay on load
+"""
+import csv
+import os
+import shutil
+import tempfile
+import image_label_tool
+
+
+class FakeRoot:
+    """Records after() jobs without running them (no display needed)"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, ms, func):
+        self.jobs.append(func)
+        return f"after#{len(self.jobs)}"
+
+    def after_cancel(self, job):
+        pass
+
+
+def make_app(folder, csv_name="revision_20240101_120000.csv"):
+    """Create an app object without a window, with the label state __init__ sets up"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = FakeRoot()
+    app._init_label_state()
+    app.folder_path = folder
+    app.csv_filename = os.path.join(folder, csv_name)
+    app.all_image_paths = [os.path.normpath(os.path.join(folder, f"0000000001_000{i}_001_20240101.jpg"))
+                           for i in range(1, 5)]
+    app._reset_image_records(app.all_image_paths)
+    app.snapshots = 0
+    original_save_csv = app.save_csv
+
+    def counting_save_csv():
+        app.snapshots += 1
+        original_save_csv()
+
+    app.save_csv = counting_save_csv
+    app.save_stats_csv = lambda: None
+    return app
+
+
+def read_csv_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))[1:]
+
+
+def test_changes_are_journaled_not_rewritten():
+    """Per-action saves append to the journal; the CSV is only written as a snapshot"""
+    print("Testing journaled saves...")
+    folder = tempfile.mkdtemp(prefix="label_journal_test_")
+    try:
+        app = make_app(folder)
+        paths = app.all_image_paths
+
+        app.set_image_fields(paths[0], label="no label")
+        app.save_changes()
+        assert app.snapshots == 1, "the first change writes the base snapshot"
+        assert os.path.exists(app.csv_filename), "the base snapshot is on disk before journaling"
+        csv_size = os.path.getsize(app.csv_filename)
+
+        for i in range(20):
+            app.set_image_fields(paths[1], comment=f"typing {i}")
+            app.save_changes()
+        app.set_image_fields(paths[2], label="read failure", false_noread=True)
+        app.set_image_fields(paths[3], label="unreadable", ocr_readable=True)
+        app.save_changes()
+        app.snapshot_writer.flush(timeout=5)
+
+        assert app.snapshots == 1, "journaled actions must not rewrite the CSV"
+        assert os.path.getsize(app.csv_filename) == csv_size
+        assert app.label_journal.event_count == 23, app.label_journal.event_count
+        assert app.root.jobs, "a delayed fsync is scheduled for the tail of the burst"
+        print(f"✓ 23 changes appended, CSV written once ({app.label_journal.event_count} journal lines)")
+    finally:
+        app._close_label_journal()
+        shutil.rmtree(folder)
+
+
+def test_replay_after_crash_and_compaction():
+    """Loading replays the journal over the snapshot; compaction folds it into the CSV"""
+    print("Testing journal replay and compaction...")
+    folder = tempfile.mkdtemp(prefix="label_journal_test_")
+    try:
+        app = make_app(folder)
+        paths = app.all_image_paths
+        app.set_image_fields(paths[0], label="no label")
+        app.set_image_fields(paths[1], label="read failure", false_noread=True, comment="blurry")
+        app.set_image_fields(paths[1], comment="")
+        app.set_image_fields(paths[2], label="incomplete", ocr_readable=True)
+        app.save_changes()
+        # Simulate a crash: the process ends without compaction
+        app.label_journal.close()
+
+        reloaded = make_app(folder)
+        reloaded._load_csv_file(reloaded.csv_filename)
+        assert reloaded.labels[paths[0]] == "no label"
+        assert reloaded.labels[paths[1]] == "read failure" and reloaded.false_noread[paths[1]] is True
+        assert paths[1] not in reloaded.comments or reloaded.comments[paths[1]] == ""
+        assert reloaded.labels[paths[2]] == "incomplete" and reloaded.ocr_readable[paths[2]] is True
+        print("✓ Snapshot + journal replayed after a crash")
+
+        # A torn last line is ignored
+        with open(reloaded.csv_filename + ".journal", "a", encoding="utf-8") as f:
+            f.write('{"path": "0000000001_0004_001_20240101.jpg", "lab')
+        torn = make_app(folder)
+        torn._load_csv_file(torn.csv_filename)
+        assert paths[3] not in torn.labels
+        print("✓ Interrupted journal write skipped")
+
+        # Compaction: the snapshot holds everything and the journal is removed
+        torn.set_image_fields(paths[3], label="unreadable")
+        torn.save_csv()
+        assert torn.snapshot_writer.flush(timeout=5)
+        assert not os.path.exists(torn.csv_filename + ".journal")
+        assert not os.path.exists(torn.csv_filename + ".journal.old")
+        rows = {row[0]: row[1] for row in read_csv_rows(torn.csv_filename)}
+        assert rows[os.path.basename(paths[1])] == "read failure"
+        assert rows[os.path.basename(paths[3])] == "unreadable"
+        print(f"✓ Compacted into snapshot: {len(rows)} rows, journal removed")
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_events_during_pending_snapshot_are_kept():
+    """Changes made while a snapshot is still being written survive that write"""
+    print("Testing journal rotation during a pending snapshot...")
+    folder = tempfile.mkdtemp(prefix="label_journal_test_")
+    try:
+        journal_path = os.path.join(folder, "revision_20240101_120000.csv.journal")
+        journal = image_label_tool.LabelJournal(journal_path)
+        journal.append("a.jpg", label="no label")
+        first = journal.rotate()       # snapshot 1 submitted
+        journal.append("b.jpg", label="unreadable")
+        second = journal.rotate()      # snapshot 2 submitted before snapshot 1 finished
+        journal.append("c.jpg", label="incomplete")
+        journal.close()
+
+        journal.discard_rotated(first)  # snapshot 1 written: does not contain b.jpg
+        records = [r["path"] for r in image_label_tool.LabelJournal.replay(journal_path)]
+        assert records == ["a.jpg", "b.jpg", "c.jpg"], records
+        journal.discard_rotated(second)  # snapshot 2 written: only c.jpg is newer
+        records = [r["path"] for r in image_label_tool.LabelJournal.replay(journal_path)]
+        assert records == ["c.jpg"], records
+        print("✓ Rotated events discarded only by the snapshot that contains them")
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_compaction_threshold():
+    """The snapshot is rewritten once JOURNAL_COMPACT_EVENTS changes have accumulated"""
+    print("Testing compaction threshold...")
+    folder = tempfile.mkdtemp(prefix="label_journal_test_")
+    original_limit = image_label_tool.JOURNAL_COMPACT_EVENTS
+    image_label_tool.JOURNAL_COMPACT_EVENTS = 10
+    try:
+        app = make_app(folder)
+        for i in range(25):
+            app.set_image_fields(app.all_image_paths[i % 4], comment=f"note {i}")
+            app.save_changes()
+        assert app.snapshot_writer.flush(timeout=5)
+        # Base snapshot + one compaction per 10 journaled events
+        assert app.snapshots == 3, app.snapshots
+        assert app.label_journal.event_count < 10
+        print(f"✓ {app.snapshots} snapshots for 25 changes")
+    finally:
+        image_label_tool.JOURNAL_COMPACT_EVENTS = original_limit
+        app._close_label_journal()
+        shutil.rmtree(folder)
+
+
+def test_first_snapshot_failure_keeps_edits():
+    """No journal is opened until the snapshot it builds on exists; edits wait for it"""
+    print("Testing a failed first snapshot...")
+    folder = tempfile.mkdtemp(prefix="label_journal_test_")
+    original_timeout = image_label_tool.JOURNAL_FIRST_SNAPSHOT_TIMEOUT_S
+    image_label_tool.JOURNAL_FIRST_SNAPSHOT_TIMEOUT_S = 0.3
+    try:
+        app = make_app(folder)
+        paths = app.all_image_paths
+        writer = app.snapshot_writer
+        writer.retry_delays = (0.05,)
+        original_write = writer._write
+
+        def failing_write(target, rows):
+            raise PermissionError("folder is read-only")
+
+        writer._write = failing_write
+        app.set_image_fields(paths[0], label="no label")
+        app.save_changes()
+        app.set_image_fields(paths[1], label="unreadable")
+        app.save_changes()
+        assert app.label_journal is None
+        assert not os.path.exists(app.csv_filename + ".journal"), "no journal without its snapshot"
+        assert not os.path.exists(app.csv_filename)
+        print("✓ Journal not opened while the first snapshot cannot be written")
+
+        writer._write = original_write
+        assert writer.flush(timeout=5)
+        rows = {row[0]: row[1] for row in read_csv_rows(app.csv_filename)}
+        assert rows[os.path.basename(paths[0])] == "no label"
+        assert rows[os.path.basename(paths[1])] == "unreadable"
+        app.set_image_fields(paths[2], label="incomplete")
+        app.save_changes()
+        assert app.label_journal is not None and app.label_journal.event_count == 1
+        print("✓ Pending edits written by the retried snapshot, journaling resumes afterwards")
+    finally:
+        image_label_tool.JOURNAL_FIRST_SNAPSHOT_TIMEOUT_S = original_timeout
+        app._close_label_journal()
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_changes_are_journaled_not_rewritten()
+        test_replay_after_crash_and_compaction()
+        test_events_during_pending_snapshot_are_kept()
+        test_compaction_threshold()
+        test_first_snapshot_failure_keeps_edits()
+        print("\n🎉 LABEL JOURNAL TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 LABEL JOURNAL TEST FAILED: {e}")
+        sys.exit(1)
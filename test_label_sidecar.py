@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the binary fast-reopen copy of the revision CSV
+"""
+import os
+import shutil
+import tempfile
+import image_label_tool
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+def make_app(folder, csv_name="revision_20240101_120000.csv"):
+    """App object without a window, with the label state __init__ sets up, for four images in folder"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.folder_path = folder
+    app.csv_filename = os.path.join(folder, csv_name)
+    app.all_image_paths = [os.path.normpath(os.path.join(folder, f"0000000001_000{i}_001_20240101.jpg"))
+                           for i in range(1, 5)]
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+def load_without_csv_parsing(folder):
+    """Load the revision CSV, recording whether the csv module was used"""
+    app = make_app(folder)
+    parsed = []
+    original_reader = image_label_tool.csv.reader
+    image_label_tool.csv.reader = lambda *args, **kwargs: (parsed.append(True), original_reader(*args, **kwargs))[1]
+    try:
+        app._load_csv_file(app.csv_filename)
+    finally:
+        image_label_tool.csv.reader = original_reader
+    return app, bool(parsed)
+
+
+def test_sidecar_roundtrip_and_validation():
+    """Reopen reads the sidecar; a CSV changed behind its back is parsed again"""
+    print("Testing binary label snapshot...")
+    folder = tempfile.mkdtemp(prefix="label_sidecar_test_")
+    try:
+        app = make_app(folder)
+        paths = app.all_image_paths
+        app.set_image_fields(paths[0], label="read failure", false_noread=True, comment="  smudged ")
+        app.set_image_fields(paths[1], label="unreadable", ocr_readable=True)
+        app.set_image_fields(paths[2], label="no label")
+        app.save_csv()
+        assert app.snapshot_writer.flush(timeout=5)
+        app._close_label_journal()
+        assert os.path.exists(app.csv_filename + image_label_tool.LABEL_SIDECAR_SUFFIX)
+
+        from_csv = make_app(folder)
+        # Parse the CSV itself for reference
+        os.rename(app.csv_filename + ".bin", app.csv_filename + ".bin.off")
+        from_csv._load_csv_file(from_csv.csv_filename)
+        os.rename(app.csv_filename + ".bin.off", app.csv_filename + ".bin")
+
+        from_sidecar, parsed = load_without_csv_parsing(folder)
+        assert not parsed, "the CSV should not be parsed while the sidecar is current"
+        for name in ("labels", "ocr_readable", "false_noread", "comments"):
+            assert getattr(from_sidecar, name) == getattr(from_csv, name), name
+        assert from_sidecar.comments[paths[0]] == "smudged"
+        print(f"✓ {len(from_sidecar.labels)} rows loaded from the sidecar, identical to the CSV")
+
+        # Journaled changes are still replayed on top of the sidecar
+        from_sidecar.set_image_fields(paths[3], label="incomplete")
+        from_sidecar.save_changes()
+        from_sidecar._close_label_journal()
+        reloaded, parsed = load_without_csv_parsing(folder)
+        assert not parsed and reloaded.labels[paths[3]] == "incomplete"
+        print("✓ Journal replayed over the sidecar")
+
+        # Editing the CSV (e.g. in Excel) invalidates the sidecar
+        with open(app.csv_filename, "a", encoding="utf-8") as f:
+            f.write("0000000001_0004_001_20240101.jpg,unreadable,False,False,,,,,\n")
+        edited, parsed = load_without_csv_parsing(folder)
+        assert parsed, "a modified CSV must be parsed"
+        assert edited.labels[paths[3]] == "incomplete", "journal still applies after the CSV rows"
+        print("✓ Stale sidecar ignored after the CSV changed")
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_too_many_labels():
+    """More distinct labels than one code byte holds is a ValueError, not an OverflowError"""
+    folder = tempfile.mkdtemp(prefix="label_sidecar_test_")
+    try:
+        csv_path = os.path.join(folder, "revision_20240101_120000.csv")
+        open(csv_path, "w").close()
+        rows = [[f"{i:010d}_0001_001_20240101.jpg", f"label {i}", False, False, ""] for i in range(257)]
+        image_label_tool.LabelSidecar.write(csv_path, rows[:256])
+        try:
+            image_label_tool.LabelSidecar.write(csv_path, rows)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("257 distinct labels were written")
+        print("✓ 256 distinct labels written, 257 rejected with ValueError")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_sidecar_roundtrip_and_validation()
+        test_too_many_labels()
+        print("\n🎉 LABEL SIDECAR TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 LABEL SIDECAR TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the optional SQLite label store and its use when reopening a folder
+"""
+import logging
+import os
+import shutil
+import tempfile
+import image_label_tool
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+def make_app(folder, csv_name="revision_20240101_120000.csv"):
+    """App object without a window, with the label state __init__ sets up, for four images in folder"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.folder_path = folder
+    app.csv_filename = os.path.join(folder, csv_name)
+    app.all_image_paths = [os.path.normpath(os.path.join(folder, f"0000000001_000{i}_001_20240101.jpg"))
+                           for i in range(1, 5)]
+    app._reset_image_records(app.all_image_paths)
+    app.snapshots = 0
+    original_save_csv = app.save_csv
+
+    def counting_save_csv():
+        app.snapshots += 1
+        original_save_csv()
+
+    app.save_csv = counting_save_csv
+    return app
+
+
+def open_folder(folder, csv_name):
+    """Simulate select_folder() (which starts a new revision CSV) with the label store enabled"""
+    app = make_app(folder, csv_name=csv_name)
+    app._open_label_store(folder)
+    app.load_csv()
+    return app
+
+
+def test_store_queries():
+    """Session queries are answered from the indexed columns"""
+    print("Testing label store queries...")
+    folder = tempfile.mkdtemp(prefix="label_store_test_")
+    try:
+        store = image_label_tool.LabelStore(os.path.join(folder, "labels.sqlite"))
+        store.upsert([
+            ("1_1_001_20240101.jpg", "1_20240101", "1", "read failure", 0, 0, ""),
+            ("1_2_001_20240101.jpg", "1_20240101", "1", "no label", 0, 0, ""),
+            ("2_1_001_20240101.jpg", "2_20240101", "2", "read failure", 0, 1, ""),
+            ("3_1_001_20240101.jpg", "3_20240101", "3", "unreadable", 1, 0, "dirty"),
+        ])
+        assert store.sessions(label="read failure") == ["1_20240101", "2_20240101"]
+        assert store.sessions(label="read failure", false_noread=False) == ["1_20240101"]
+        assert store.sessions(ocr_readable=True) == ["3_20240101"]
+        assert store.label_counts() == {"read failure": 2, "no label": 1, "unreadable": 1}
+        journal_mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert journal_mode == "wal", journal_mode
+        plan = " ".join(row[-1] for row in store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT DISTINCT session_id FROM images WHERE label = ? AND false_noread = ?",
+            ("read failure", 0)))
+        assert "idx_images_label" in plan, plan
+        store.close()
+        print(f"✓ Read-failure sessions via index ({plan})")
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_reopen_uses_store():
+    """The first open imports the CSV; later opens load from the store unless a newer CSV exists"""
+    print("Testing folder reopen through the label store...")
+    folder = tempfile.mkdtemp(prefix="label_store_test_")
+    original_enabled = image_label_tool.USE_LABEL_STORE
+    image_label_tool.USE_LABEL_STORE = True
+    try:
+        first = make_app(folder)
+        paths = first.all_image_paths
+        first.set_image_fields(paths[0], label="read failure", false_noread=True)
+        first.set_image_fields(paths[1], label="no label", comment="check")
+        first.save_changes()
+        first._close_label_journal()
+        first.snapshot_writer.flush(timeout=5)
+
+        # The CSV was written without the store: it is imported on open
+        second = open_folder(folder, "revision_20240102_090000.csv")
+        assert second.labels == first.labels
+        assert {p: c for p, c in second.comments.items() if c} == first.comments
+        assert second.label_store.get_meta("revision") == "revision_20240101_120000.csv"
+        print(f"✓ Imported {len(second.label_store)} rows from the revision CSV")
+
+        # Changes (including auto-detection, which sets labels directly) go to the store in batches
+        second.set_image_fields(paths[2], label="unreadable", ocr_readable=True)
+        second.labels[paths[3]] = "read failure"
+        second._mark_store_dirty([paths[3]])
+        second.save_csv()
+        second.snapshot_writer.flush(timeout=5)
+        assert second.label_store.sessions(label="read failure") == ["0000000001_20240101"]
+        second._close_label_journal()
+        second._close_label_store()
+
+        # Reopen: the store matches the newest revision CSV, so the CSV is not parsed
+        parsed = []
+        original_load = image_label_tool.ImageLabelTool._load_csv_file
+        image_label_tool.ImageLabelTool._load_csv_file = lambda self, fp: parsed.append(fp)
+        try:
+            third = open_folder(folder, "revision_20240103_090000.csv")
+        finally:
+            image_label_tool.ImageLabelTool._load_csv_file = original_load
+        assert parsed == [], parsed
+        assert third.labels == second.labels
+        assert third.ocr_readable[paths[2]] is True and third.false_noread[paths[0]] is True
+        assert third.comments == {paths[1]: "check"}
+        third._close_label_store()
+        print("✓ Reopened from the store without parsing the CSV")
+    finally:
+        image_label_tool.USE_LABEL_STORE = original_enabled
+        shutil.rmtree(folder)
+
+
+class Var:
+    def set(self, value):
+        self.value = value
+
+
+class RecordingRoot:
+    """Queues after() calls so the test decides when the Tk thread runs them"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, ms, func, *args):
+        self.jobs.append((func, args))
+
+    def after_cancel(self, job):
+        pass
+
+    def run_jobs(self):
+        while self.jobs:
+            func, args = self.jobs.pop(0)
+            func(*args)
+
+
+def test_auto_detection_results_applied_in_one_batch():
+    """The detection worker leaves the labels to the Tk thread, which stores and saves them once"""
+    print("Testing batched auto detection results...")
+    folder = tempfile.mkdtemp(prefix="label_store_test_")
+    original_sleep = image_label_tool.time.sleep
+    image_label_tool.time.sleep = lambda seconds: None
+    original_enabled = image_label_tool.USE_LABEL_STORE
+    image_label_tool.USE_LABEL_STORE = True
+    try:
+        app = make_app(folder)
+        app._open_label_store(folder)
+        app.root = RecordingRoot()
+        app.auto_detect_progress_var = Var()
+        app.logger = logging.getLogger("auto_detection_test")
+        for name in ("enable_ui_controls", "update_progress_display", "update_counts",
+                     "update_total_stats", "update_session_stats", "show_image"):
+            setattr(app, name, lambda: None)
+        app.auto_detect_function = lambda path: 0 if path.endswith("0001_001_20240101.jpg") else 2
+        paths = app.all_image_paths
+
+        app.process_auto_detection(list(paths))
+        assert app.labels == {} and app.snapshots == 0, "the worker thread does not touch the labels"
+        app.root.run_jobs()
+        assert app.labels == {paths[0]: "no label", **{p: "read failure" for p in paths[1:]}}, app.labels
+        assert app.snapshots == 1, app.snapshots
+        assert app.label_store.label_counts() == {"no label": 1, "read failure": 3}
+        print(f"✓ {len(paths)} results stored by the Tk thread, {app.snapshots} snapshot")
+    finally:
+        image_label_tool.time.sleep = original_sleep
+        image_label_tool.USE_LABEL_STORE = original_enabled
+        app.snapshot_writer.flush(timeout=5)
+        app._close_label_store()
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_store_queries()
+        test_reopen_uses_store()
+        test_auto_detection_results_applied_in_one_batch()
+        print("\n🎉 LABEL STORE TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 LABEL STORE TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script to verify background prefetching of neighbouring images
+"""
+import threading
+import time
+import image_label_tool
+
+
+def make_recording_render():
+    """Return a render function that records which paths were decoded"""
+    rendered = []
+    lock = threading.Lock()
+
+    def render(path, params):
+        with lock:
+            rendered.append(path)
+        return (f"frame:{path}", params)
+
+    return render, rendered
+
+
+def wait_for(prefetcher, keys, timeout=2.0):
+    """Wait until all futures for keys have completed"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with prefetcher._lock:
+            futures = [prefetcher._futures.get(key) for key in keys]
+        if all(f is None or f.done() for f in futures):
+            return
+        time.sleep(0.01)
+
+
+def test_prefetch_neighbours():
+    """Neighbours of the current index are prepared and handed back by take()"""
+    print("Testing neighbour prefetch...")
+    render, rendered = make_recording_render()
+    prefetcher = image_label_tool.ImagePrefetcher(render, max_workers=2, radius=2)
+    paths = [f"img_{i}.jpg" for i in range(10)]
+    params = (800, 600, False)
+
+    try:
+        prefetcher.schedule(paths, 5, params)
+        wait_for(prefetcher, [(p, params) for p in paths])
+
+        assert sorted(rendered) == sorted(["img_3.jpg", "img_4.jpg", "img_6.jpg", "img_7.jpg"]), rendered
+        print(f"✓ Prefetched: {sorted(rendered)}")
+
+        frame = prefetcher.take("img_6.jpg", params)
+        assert frame == ("frame:img_6.jpg", params)
+        print("✓ take() returns the prepared frame")
+
+        # A frame is handed out only once; the current image is never prefetched
+        assert prefetcher.take("img_6.jpg", params) is None
+        assert prefetcher.take("img_5.jpg", params) is None
+        # Different render parameters (e.g. after a resize) do not match
+        assert prefetcher.take("img_7.jpg", (1024, 768, False)) is None
+        print("✓ Stale or missing frames return None")
+    finally:
+        prefetcher.shutdown()
+
+
+def test_prefetch_cancel():
+    """Cancelled work is dropped and never rendered"""
+    print("Testing prefetch cancellation...")
+    gate = threading.Event()
+    rendered = []
+
+    def slow_render(path, params):
+        gate.wait(2.0)
+        rendered.append(path)
+        return path
+
+    prefetcher = image_label_tool.ImagePrefetcher(slow_render, max_workers=1, radius=3)
+    paths = [f"img_{i}.jpg" for i in range(20)]
+    params = (800, 600, False)
+
+    try:
+        prefetcher.schedule(paths, 0, params)
+        # Jump far away: everything around index 0 that has not started is cancelled
+        prefetcher.schedule(paths, 15, params)
+        gate.set()
+        wait_for(prefetcher, [(p, params) for p in paths])
+
+        stale = [p for p in rendered if p in ("img_2.jpg", "img_3.jpg")]
+        assert not stale, f"stale frames were rendered: {stale}"
+        print(f"✓ Rendered after jump: {sorted(rendered)}")
+
+        prefetcher.cancel()
+        assert prefetcher.take("img_16.jpg", params) is None
+        print("✓ cancel() drops prepared frames")
+    finally:
+        prefetcher.shutdown()
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_prefetch_neighbours()
+        test_prefetch_cancel()
+        print("\n🎉 PREFETCH TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 PREFETCH TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the persistent on-disk proxy cache
+"""
+import os
+import shutil
+import tempfile
+from PIL import Image
+import image_label_tool
+
+
+def make_folder(test_dir, count=3, size=(4000, 3000)):
+    folder = os.path.join(test_dir, "images")
+    os.makedirs(folder)
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"{i:010d}_0001_001_20240101.jpg")
+        Image.new("RGB", size, (20 * i, 100, 150)).save(path)
+        paths.append(path)
+    return folder, paths
+
+
+def signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def test_build_and_lookup():
+    """Proxies are built in the background and chosen by the size the canvas needs"""
+    print("Testing proxy build and lookup...")
+    test_dir = tempfile.mkdtemp(prefix="proxy_cache_test_")
+    try:
+        folder, paths = make_folder(test_dir)
+        proxies = image_label_tool.ProxyCache(root_dir=os.path.join(test_dir, "cache"))
+        proxies.open_folder(folder)
+        proxies.build(paths).result(timeout=30)
+
+        proxy_path, original_size = proxies.lookup(paths[0], signature(paths[0]), (800, 600))
+        assert original_size == (4000, 3000)
+        assert proxy_path.endswith("_screen.jpg"), proxy_path
+        assert Image.open(proxy_path).size == (1920, 1440)
+        print(f"✓ 800x600 canvas -> {os.path.basename(proxy_path)}")
+
+        thumb_path, _ = proxies.lookup(paths[0], signature(paths[0]), (200, 200))
+        assert thumb_path.endswith("_thumb.jpg") and Image.open(thumb_path).size == (256, 192)
+        assert proxies.lookup(paths[0], signature(paths[0]), (3000, 2000)) is None
+        print("✓ Small boxes use the thumbnail, large canvases fall back to the original")
+
+        # The manifest survives a restart
+        reopened = image_label_tool.ProxyCache(root_dir=os.path.join(test_dir, "cache"))
+        reopened.open_folder(folder)
+        assert reopened.lookup(paths[1], signature(paths[1]), (800, 600)) is not None
+        print("✓ Manifest reloaded from disk")
+
+        # A rewritten original invalidates its proxies until they are rebuilt
+        Image.new("RGB", (2000, 1000)).save(paths[1])
+        assert reopened.lookup(paths[1], signature(paths[1]), (800, 600)) is None
+        reopened.build([paths[1]]).result(timeout=30)
+        _, original_size = reopened.lookup(paths[1], signature(paths[1]), (800, 600))
+        assert original_size == (2000, 1000)
+        proxy_files = [f for f in os.listdir(reopened.cache_dir) if f != reopened.MANIFEST]
+        assert len(proxy_files) == 6, proxy_files
+        print("✓ Changed file rebuilt, stale proxies removed")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_fitted_view_reads_proxy():
+    """The fitted render uses the proxy and still reports the original size"""
+    print("Testing fitted render from proxy...")
+    test_dir = tempfile.mkdtemp(prefix="proxy_cache_test_")
+    try:
+        folder, paths = make_folder(test_dir, count=1)
+        app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+        app.image_cache = image_label_tool.ImageCache()
+        app.proxy_cache = image_label_tool.ProxyCache(root_dir=os.path.join(test_dir, "cache"))
+        app.proxy_cache.open_folder(folder)
+        app.proxy_cache.build(paths).result(timeout=30)
+
+        opened = []
+        original_open = image_label_tool.Image.open
+
+        def recording_open(fp, *args, **kwargs):
+            opened.append(fp)
+            return original_open(fp, *args, **kwargs)
+
+        image_label_tool.Image.open = recording_open
+        try:
+            display_img, original_size = app._render_fitted_image(paths[0], (800, 600, None))
+        finally:
+            image_label_tool.Image.open = original_open
+
+        assert original_size == (4000, 3000)
+        assert display_img.size == (800, 600)
+        assert paths[0] not in opened, "original should not be read when a proxy fits"
+        print(f"✓ Rendered from {os.path.basename(opened[0])}")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_build_and_lookup()
+        test_fitted_view_reads_proxy()
+        print("\n🎉 PROXY CACHE TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 PROXY CACHE TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script to verify coalesced two-pass rendering during zoom and resize bursts
+"""
+from PIL import Image
+import image_label_tool
+from test_tile_renderer import FakeCanvas, run_with_fake_photoimage
+
+
+class FakeRoot:
+    """Manual clock standing in for Tk's after/after_idle (no display needed)"""
+
+    def __init__(self):
+        self.now = 0
+        self.jobs = {}
+        self.next_id = 1
+
+    def after(self, ms, func):
+        job = f"after#{self.next_id}"
+        self.next_id += 1
+        self.jobs[job] = (self.now + ms, func)
+        return job
+
+    def after_idle(self, func):
+        return self.after(0, func)
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def advance(self, ms):
+        """Move the clock forward, running due jobs in order"""
+        target = self.now + ms
+        while True:
+            due = [(when, job) for job, (when, _) in self.jobs.items() if when <= target]
+            if not due:
+                break
+            when, job = min(due)
+            self.now = when
+            _, func = self.jobs.pop(job)
+            func()
+        self.now = target
+
+
+def test_burst_is_coalesced():
+    """A fast wheel spin paints one preview per idle point and a single final render"""
+    print("Testing render request coalescing...")
+    root = FakeRoot()
+    calls = []
+    scheduler = image_label_tool.RenderScheduler(root, lambda: calls.append("preview"),
+                                                 lambda: calls.append("final"), settle_ms=150)
+
+    # Ten wheel events, 20ms apart
+    for _ in range(10):
+        scheduler.request()
+        scheduler.request()  # two events delivered before Tk goes idle
+        root.advance(20)
+
+    assert "final" not in calls, "final render must wait for input to settle"
+    assert calls == ["preview"] * 10, calls
+    root.advance(150)
+    assert calls.count("final") == 1 and calls[-1] == "final", calls
+    assert not scheduler.pending()
+    print(f"✓ 20 requests -> {calls.count('preview')} previews, 1 final render")
+
+    # preview_now paints synchronously; cancel() drops the queued final pass
+    calls.clear()
+    scheduler.request(preview_now=True)
+    assert calls == ["preview"]
+    scheduler.cancel()
+    root.advance(500)
+    assert calls == ["preview"], calls
+    print("✓ preview_now and cancel() behave")
+
+
+def test_draft_tiles_are_upgraded():
+    """Preview tiles use cheap resampling and are replaced on the final pass"""
+    print("Testing draft tile upgrade...")
+
+    def run():
+        canvas = FakeCanvas(600, 400)
+        renderer = image_label_tool.TileRenderer(canvas, tile_size=256)
+        source = Image.new("RGB", (1000, 800))
+
+        renderer.set_image(source, ("a.jpg", None), 2.0, (0, 0), draft=True)
+        renderer.update_visible()
+        tiles = len(canvas.items)
+        assert all(tile[2] for tile in renderer._tiles.values())
+
+        renderer.set_image(source, ("a.jpg", None), 2.0, (0, 0))
+        renderer.update_visible()
+        assert len(canvas.items) == tiles, "draft items should be replaced, not duplicated"
+        assert not any(tile[2] for tile in renderer._tiles.values())
+        print(f"✓ {tiles} draft tiles re-rendered at full quality")
+    run_with_fake_photoimage(run)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_burst_is_coalesced()
+        test_draft_tiles_are_upgraded()
+        print("\n🎉 RENDER SCHEDULER TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 RENDER SCHEDULER TEST FAILED: {e}")
+        sys.exit(1)
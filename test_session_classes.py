@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the vectorized session classification against determine_session_classification
+"""
+import random
+import time
+import image_label_tool
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+def make_app(paths):
+    """App object without a window, with the label state __init__ sets up for paths"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.all_image_paths = list(paths)
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+def test_matches_determine_session_classification():
+    """Every session gets exactly the label determine_session_classification gives it"""
+    print("Testing vectorized session classification...")
+    rng = random.Random(13)
+    app = make_app(f"/data/{trigger:010d}_{sub:04d}_001_20240101.jpg"
+                   for trigger in range(1, 3000) for sub in range(1, rng.randint(2, 5)))
+    # Small sessions with few labels cover every branch (all False NoRead, only custom labels, ...)
+    for path in app.all_image_paths:
+        if rng.random() < 0.7:
+            app.labels[path] = rng.choice(image_label_tool.LABELS + ["custom"])
+        if rng.random() < 0.4:
+            app.false_noread[path] = rng.random() < 0.7
+        if rng.random() < 0.2:
+            app.ocr_readable[path] = True
+
+    label_codes, flags, session_codes, label_names, session_ids = app.records.arrays(listed_only=True)
+    per_label, ocr_readable, false_noread, classes = image_label_tool.session_classes(
+        label_codes, flags, session_codes, label_names, len(session_ids))
+    sessions = app._session_groups()
+    seen = set()
+    for code, session_id in enumerate(session_ids):
+        paths = sessions.get(session_id)
+        if not paths:
+            continue
+        labels = [app.labels.get(p, "(Unclassified)") for p in paths]
+        classified = [label for label in labels if label != "(Unclassified)"]
+        expected = app.determine_session_classification(classified, session_image_paths=paths) if classified else None
+        actual = image_label_tool.SESSION_CLASSES[classes[code]] if classes[code] >= 0 else None
+        assert actual == expected, (session_id, labels, [app.false_noread.get(p) for p in paths], actual, expected)
+        assert per_label[code].sum() == len(paths)
+        assert ocr_readable[code] == sum(app.ocr_readable.get(p, False) for p in paths)
+        assert false_noread[code] == sum(app.false_noread.get(p, False) for p in paths)
+        seen.add(expected)
+    assert seen == {None, *image_label_tool.SESSION_CLASSES}, seen
+    print(f"✓ {len(sessions)} sessions, all {len(seen)} outcomes identical to determine_session_classification")
+
+    # The session label cache rebuilds with the vectorized path and matches the per-session one
+    cache = app._session_label_cache()
+    batch = (dict(cache.labels), dict(cache.label_counts), cache.ocr_readable_sessions,
+             cache.false_noread_sessions, cache.ocr_readable_non_failure_sessions)
+    cache.classify_all = None
+    cache.mark_path(None)
+    cache.refresh()
+    assert batch == (dict(cache.labels), dict(cache.label_counts), cache.ocr_readable_sessions,
+                     cache.false_noread_sessions, cache.ocr_readable_non_failure_sessions)
+    print("✓ Batch rebuild of the session label cache equals per-session classification")
+
+
+def test_million_images():
+    """Classifying 1M images is a matter of milliseconds"""
+    np = image_label_tool.np
+    count = 1000000
+    rng = np.random.default_rng(1)
+    label_names = list(image_label_tool.LABELS) + ["custom"]
+    label_codes = rng.integers(-1, len(label_names), count).astype(np.int8)
+    flags = rng.choice(np.array([16, 16 | 12, 16 | 3], dtype=np.uint8), count)
+    session_codes = (np.arange(count) // 4).astype(np.int32)
+
+    start = time.perf_counter()
+    per_label, _, _, classes = image_label_tool.session_classes(
+        label_codes, flags, session_codes, label_names, count // 4)
+    elapsed = time.perf_counter() - start
+    assert per_label.sum() == count and len(classes) == count // 4
+    print(f"✓ {count} images / {count // 4} sessions classified in {elapsed * 1000:.0f} ms")
+    assert elapsed < 2.0, elapsed
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_matches_determine_session_classification()
+        test_million_images()
+        print("\n🎉 SESSION CLASSIFICATION TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 SESSION CLASSIFICATION TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the session index shared by the statistics
+"""
+import os
+import shutil
+import tempfile
+import image_label_tool
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+def make_app(folder, csv_name="revision_20240101_120000.csv"):
+    """App object without a window, with the label state __init__ sets up, for four images in folder"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.folder_path = folder
+    app.csv_filename = os.path.join(folder, csv_name)
+    app.all_image_paths = [os.path.normpath(os.path.join(folder, f"0000000001_000{i}_001_20240101.jpg"))
+                           for i in range(1, 5)]
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+def grouped_from_scratch(app):
+    sessions = {}
+    for path in app.all_image_paths:
+        sessions.setdefault(app.get_session_number(path), []).append(path)
+    return sessions
+
+
+def test_statistics_do_not_regroup():
+    """Once built, labeling and statistics never parse session IDs again"""
+    print("Testing session index...")
+    app = make_app("/data")
+    app.all_image_paths = [f"/data/{trigger:010d}_{sub:04d}_001_20240101.jpg"
+                           for trigger in range(1, 300) for sub in range(1, 4)]
+    app._reset_image_records(app.all_image_paths)
+    assert app._session_groups() == grouped_from_scratch(app)
+
+    calls = []
+    original = app.get_session_number
+    app.get_session_number = lambda path: (calls.append(path), original(path))[1]
+    for path in app.all_image_paths[::5]:
+        app.labels[path] = "read failure"
+        app.false_noread[path] = True
+    app.calculate_session_labels()
+    app.calculate_sessions_with_ocr_readable()
+    app.calculate_sessions_with_false_noread()
+    app.calculate_session_ocr_readable_status()
+    app.calculate_comprehensive_stats()
+    assert calls == [], f"{len(calls)} session IDs parsed again"
+    print(f"✓ {len(app._session_groups())} sessions grouped once, 5 statistics computed without regrouping")
+
+
+def test_new_files_extend_the_index():
+    """Files found by scan_for_new_images are added to their sessions in display order"""
+    print("Testing incremental session index update...")
+    folder = tempfile.mkdtemp(prefix="session_index_test_")
+    try:
+        app = make_app(folder)
+        for path in app.all_image_paths:
+            open(path, "wb").close()
+        index = app.session_index = image_label_tool.SessionIndex(app.get_session_number, app.get_image_sort_key)
+        index.rebuild(app.all_image_paths)
+
+        # A late sub-image of the existing session and a new session
+        for name in ("0000000001_0000_001_20240101.jpg", "0000000002_0001_001_20240101.jpg"):
+            open(os.path.join(folder, name), "wb").close()
+        new_images = app.scan_for_new_images()
+        assert len(new_images) == 2
+        assert app.session_index is index and index.describes(app.all_image_paths)
+        assert app._session_groups() == grouped_from_scratch(app), app._session_groups()
+        assert app._session_groups()["0000000001_20240101"][0].endswith("0000000001_0000_001_20240101.jpg")
+        print("✓ New files added to the index incrementally")
+
+        # A replaced image list is detected and regrouped
+        app.all_image_paths = app.all_image_paths[:3]
+        assert app._session_groups() == grouped_from_scratch(app)
+        assert app.session_index is not index
+        print("✓ Replaced image list regrouped")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_statistics_do_not_regroup()
+        test_new_files_extend_the_index()
+        print("\n🎉 SESSION INDEX TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 SESSION INDEX TEST FAILED: {e}")
+        sys.exit(1)
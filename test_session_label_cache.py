@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the incrementally maintained session labels and counters
+"""
+import os
+import random
+import shutil
+import tempfile
+import image_label_tool
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+def make_app(folder, csv_name="revision_20240101_120000.csv"):
+    """App object without a window, with the label state __init__ sets up, for four images in folder"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.folder_path = folder
+    app.csv_filename = os.path.join(folder, csv_name)
+    app.all_image_paths = [os.path.normpath(os.path.join(folder, f"0000000001_000{i}_001_20240101.jpg"))
+                           for i in range(1, 5)]
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+def session_statistics(app):
+    return (app.calculate_session_labels(), app.calculate_session_category_counts(),
+            app.calculate_sessions_with_ocr_readable(), app.calculate_sessions_with_false_noread(),
+            app.calculate_ocr_readable_non_failure_sessions())
+
+
+def full_scan_statistics(app):
+    """The same statistics from plain dicts, i.e. by classifying every session again"""
+    scan = make_app(app.folder_path)
+    scan.all_image_paths = app.all_image_paths
+    scan.labels, scan.ocr_readable = dict(app.labels), dict(app.ocr_readable)
+    scan.false_noread, scan.comments = dict(app.false_noread), dict(app.comments)
+    return session_statistics(scan)
+
+
+def test_counters_follow_every_change():
+    """After any mix of edits the cached counters equal a full reclassification"""
+    print("Testing session label cache...")
+    folder = tempfile.mkdtemp(prefix="session_label_cache_test_")
+    app = make_app(folder)
+    rng = random.Random(5)
+    app.all_image_paths = [f"{folder}/{trigger:010d}_{sub:04d}_001_20240101.jpg"
+                           for trigger in range(1, 400) for sub in range(1, rng.randint(2, 6))]
+    app._reset_image_records(app.all_image_paths)
+    assert session_statistics(app) == full_scan_statistics(app)
+
+    classified = []
+    cache = app._session_labels
+    original = cache.classify
+    cache.classify = lambda paths: (classified.append(paths), original(paths))[1]
+    for step in range(600):
+        path = rng.choice(app.all_image_paths)
+        kind = rng.random()
+        classified.clear()
+        if kind < 0.5:
+            app.set_image_fields(path, label=rng.choice(image_label_tool.LABELS))
+        elif kind < 0.7:
+            app.set_image_fields(path, false_noread=rng.random() < 0.5)
+        elif kind < 0.85:
+            app.ocr_readable[path] = rng.random() < 0.5  # Direct writes (detection workers) count too
+        else:
+            app.labels.pop(path, None)
+        app.calculate_session_category_counts()
+        assert len(classified) <= 1, f"{len(classified)} sessions reclassified for one change"
+        if step % 50 == 0:
+            assert session_statistics(app) == full_scan_statistics(app), step
+    assert app._session_labels is cache
+    print("✓ 600 edits: counters match a full reclassification, one session reclassified per edit")
+
+    # Labels loaded in bulk (CSV, journal replay) are picked up as well
+    app.labels.update((path, "read failure") for path in app.all_image_paths[::3])
+    assert session_statistics(app) == full_scan_statistics(app)
+    counts = app.calculate_session_category_counts()
+    assert counts['total_sessions'] == sum(counts[key] for key in ('sessions_no_code', 'sessions_read_failure',
+                                                                   'sessions_unreadable', 'sessions_false_noread',
+                                                                   'sessions_unlabeled'))
+    print(f"✓ Bulk update: {counts['total_sessions']} sessions, {counts['sessions_read_failure']} read failure")
+    app._close_label_journal()
+    shutil.rmtree(folder)
+
+
+def test_new_images_reclassify_their_session():
+    """An unflagged image joining a False NoRead session changes the session counters"""
+    app = make_app("/data")
+    app.all_image_paths = [f"/data/0000000001_000{sub}_001_20240101.jpg" for sub in (1, 2)]
+    app._reset_image_records(app.all_image_paths)
+    for path in app.all_image_paths:
+        app.labels[path] = "read failure"
+        app.false_noread[path] = True
+    assert app.calculate_sessions_with_false_noread() == 1
+    new_path = "/data/0000000001_0003_001_20240101.jpg"
+    app.all_image_paths.append(new_path)
+    app.session_index.add([new_path], app.all_image_paths)
+    assert app.calculate_sessions_with_false_noread() == 0
+    assert session_statistics(app) == full_scan_statistics(app)
+    print("✓ New image reclassifies its session")
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_counters_follow_every_change()
+        test_new_images_reclassify_their_session()
+        print("\n🎉 SESSION LABEL CACHE TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 SESSION LABEL CACHE TEST FAILED: {e}")
+        sys.exit(1)
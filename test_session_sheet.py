@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the session contact sheet helpers (grouping, thumbnails, bulk labeling)
+"""
+import os
+import shutil
+import tempfile
+from PIL import Image
+import image_label_tool
+
+
+def make_app(test_dir):
+    """Create an app object without building the Tk UI, with UI refreshes recorded"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.image_cache = image_label_tool.ImageCache()
+    app.proxy_cache = image_label_tool.ProxyCache(root_dir=os.path.join(test_dir, "cache"))
+    app._init_label_state()
+    app.calls = []
+    for name in ("save_csv", "update_counts", "update_session_stats", "update_total_stats",
+                 "update_progress_display", "update_current_label_status", "show_image"):
+        setattr(app, name, lambda name=name: app.calls.append(name))
+
+    class FilterVar:
+        def get(self):
+            return "All images"
+    app.filter_var = FilterVar()
+    return app
+
+
+def test_session_grouping_and_bulk_label():
+    """All sub-images of a session are labeled with one save and one stats refresh"""
+    print("Testing session grouping and bulk labeling...")
+    test_dir = tempfile.mkdtemp(prefix="session_sheet_test_")
+    try:
+        app = make_app(test_dir)
+        session_a = [f"/data/0000000001_000{i}_001_20240101.jpg" for i in range(1, 7)]
+        session_b = ["/data/0000000002_0001_001_20240101.jpg", "/data/0000000002_0002_001_20240101.jpg"]
+        app.all_image_paths = session_a + session_b
+        app.image_paths = list(app.all_image_paths)
+        app.current_index = 7
+        app.false_noread[session_a[0]] = True
+        app.labels[session_a[0]] = "read failure"
+
+        assert app.get_session_image_paths(session_a[3]) == session_a
+        assert app.get_session_image_paths(session_b[0]) == session_b
+        print(f"✓ Session of {os.path.basename(session_a[3])}: {len(session_a)} images")
+
+        app.apply_labels(session_a, "no label")
+        assert all(app.labels[p] == "no label" for p in session_a)
+        assert app.false_noread[session_a[0]] is False, "False NoRead only applies to read failures"
+        assert session_b[0] not in app.labels
+        assert app.calls.count("save_csv") == 1 and app.calls.count("update_session_stats") == 1, app.calls
+        # The current image (session B) was not relabeled, so it is not redrawn
+        assert "show_image" not in app.calls
+        print(f"✓ 6 images labeled with one save: {app.calls}")
+
+        # Relabeling with the same value is a no-op
+        app.calls.clear()
+        app.apply_labels(session_a, "no label")
+        assert app.calls == []
+        app.apply_labels([session_b[1]], "unreadable")
+        assert "show_image" in app.calls, "relabeling the current image redraws it"
+        print("✓ No-op and current-image cases handled")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_thumbnail_prefers_proxy():
+    """Sheet thumbnails come from the proxy cache when it has the image"""
+    print("Testing session sheet thumbnails...")
+    test_dir = tempfile.mkdtemp(prefix="session_sheet_test_")
+    try:
+        folder = os.path.join(test_dir, "images")
+        os.makedirs(folder)
+        path = os.path.join(folder, "0000000001_0001_001_20240101.jpg")
+        Image.new("RGB", (3000, 2000), (200, 10, 10)).save(path)
+
+        app = make_app(test_dir)
+        thumb = app._load_session_thumbnail(path)
+        assert max(thumb.size) == image_label_tool.SESSION_SHEET_THUMB_SIZE
+        print(f"✓ Thumbnail from original: {thumb.size}")
+
+        app.image_cache.clear()
+        app.proxy_cache.open_folder(folder)
+        app.proxy_cache.build([path]).result(timeout=30)
+        opened = []
+        original_open = image_label_tool.Image.open
+        image_label_tool.Image.open = lambda fp, *a, **k: (opened.append(fp), original_open(fp, *a, **k))[1]
+        try:
+            thumb = app._load_session_thumbnail(path)
+            app._load_session_thumbnail(path)
+        finally:
+            image_label_tool.Image.open = original_open
+        assert len(opened) == 1 and opened[0].endswith("_thumb.jpg"), opened
+        assert thumb.size == (256, 171), thumb.size
+        print("✓ Thumbnail read once from the proxy and cached")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_session_grouping_and_bulk_label()
+        test_thumbnail_prefers_proxy()
+        print("\n🎉 SESSION SHEET TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 SESSION SHEET TEST FAILED: {e}")
+        sys.exit(1)
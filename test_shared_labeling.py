@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test script to verify per-operator delta files, their timestamp merge and the work split
+"""
+import os
+import shutil
+import tempfile
+import time
+import image_label_tool
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+def make_app(folder, csv_name="revision_20240101_120000.csv"):
+    """App object without a window, with the label state __init__ sets up, for four images in folder"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.folder_path = folder
+    app.csv_filename = os.path.join(folder, csv_name)
+    app.all_image_paths = [os.path.normpath(os.path.join(folder, f"0000000001_000{i}_001_20240101.jpg"))
+                           for i in range(1, 5)]
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+def test_merge_latest_change_wins():
+    """Each operator sees the other's changes; for every field the latest change wins"""
+    print("Testing delta merge between operators...")
+    folder = tempfile.mkdtemp(prefix="shared_labeling_test_")
+    try:
+        alice = image_label_tool.SharedLabelDeltas(folder, "pc1-alice")
+        bob = image_label_tool.SharedLabelDeltas(folder, "pc2-bob")
+        assert alice.poll() == [] and bob.poll() == []
+
+        alice.append("a.jpg", label="no label", comment="first look")
+        time.sleep(0.01)
+        bob.append("a.jpg", label="read failure")
+        bob.append("b.jpg", label="unreadable")
+
+        merged = alice.poll()
+        assert merged == [{"path": "a.jpg", "label": "read failure"}, {"path": "b.jpg", "label": "unreadable"}], merged
+        # Bob's own label is newer than Alice's; only her comment is new to him
+        merged = bob.poll()
+        assert merged == [{"path": "a.jpg", "comment": "first look"}], merged
+        assert alice.poll() == [] and bob.poll() == []
+        print("✓ Later label wins on both sides, untouched fields still merge")
+
+        # A line still being written is picked up once it is complete
+        with open(bob.path, "a", encoding="utf-8") as f:
+            f.write('{"path": "c.jpg", "time": 9999999999, "lab')
+        assert alice.poll() == []
+        with open(bob.path, "a", encoding="utf-8") as f:
+            f.write('el": "incomplete"}\n')
+        assert alice.poll() == [{"path": "c.jpg", "label": "incomplete"}]
+        print("✓ Only complete new lines are read")
+
+        # A new instance replays every delta file, including its own from earlier runs
+        alice.close()
+        restarted = image_label_tool.SharedLabelDeltas(folder, "pc1-alice")
+        final = {}
+        for record in restarted.poll():
+            final.setdefault(record["path"], {}).update(record)
+        assert final["a.jpg"]["label"] == "read failure" and final["a.jpg"]["comment"] == "first look"
+        assert final["c.jpg"]["label"] == "incomplete"
+        restarted.close()
+        bob.close()
+        print("✓ Restart replays all operators' deltas")
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_labels_flow_between_apps_and_work_is_split():
+    """A label set in one instance appears in the other; sessions are split between operators"""
+    print("Testing live labels and work split...")
+    folder = tempfile.mkdtemp(prefix="shared_labeling_test_")
+    try:
+        first = make_app(folder, csv_name="revision_20240101_120000.csv")
+        second = make_app(folder, csv_name="revision_20240101_120500.csv")
+        first.shared_deltas = image_label_tool.SharedLabelDeltas(folder, "pc1-alice")
+        second.shared_deltas = image_label_tool.SharedLabelDeltas(folder, "pc2-bob")
+        first._merge_shared_deltas()
+        second._merge_shared_deltas()
+
+        path = first.all_image_paths[0]
+        first.set_image_fields(path, label="read failure", false_noread=True)
+        first.save_changes()
+        changed = second._merge_shared_deltas()
+        assert changed == {path}
+        assert second.labels[path] == "read failure" and second.false_noread[path] is True
+        print("✓ Label from the first instance merged into the second")
+
+        operators = first.shared_deltas.active_operators()
+        assert operators == ["pc1-alice", "pc2-bob"], operators
+        sessions = [f"{trigger:010d}_20240101" for trigger in range(1, 101)]
+        owners = [first.shared_deltas.owner_of(session, operators) for session in sessions]
+        mine = [s for s, owner in zip(sessions, owners) if owner == "pc1-alice"]
+        theirs = [s for s, owner in zip(sessions, owners) if owner == "pc2-bob"]
+        assert mine and theirs and len(mine) + len(theirs) == len(sessions)
+        assert owners == [second.shared_deltas.owner_of(session, operators) for session in sessions]
+        print(f"✓ 100 sessions split {len(mine)}/{len(theirs)}, identically on both PCs")
+        first._close_label_journal()
+        second._close_label_journal()
+        first.shared_deltas.close()
+        second.shared_deltas.close()
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_earlier_records_and_snapshot_cutoff():
+    """Own records from earlier runs are merged; records the snapshot already holds are not"""
+    print("Testing restart replay and the snapshot cutoff...")
+    folder = tempfile.mkdtemp(prefix="shared_labeling_test_")
+    try:
+        earlier = image_label_tool.SharedLabelDeltas(folder, "pc1-alice")
+        earlier.append("a.jpg", label="no label")
+        earlier.close()
+
+        # A change made before the first poll does not hide the earlier run's records
+        restarted = image_label_tool.SharedLabelDeltas(folder, "pc1-alice")
+        restarted.append("b.jpg", label="unreadable")
+        assert restarted.poll() == [{"path": "a.jpg", "label": "no label"}]
+        restarted.close()
+        print("✓ Records from an earlier run merged after an early change")
+
+        with open(os.path.join(folder, "labels_pc2-bob.delta.jsonl"), "w", encoding="utf-8") as f:
+            f.write('{"path": "d.jpg", "time": 1000.0, "label": "read failure"}\n')
+            f.write(f'{{"path": "c.jpg", "time": {time.time()}, "label": "incomplete"}}\n')
+        loaded = image_label_tool.SharedLabelDeltas(folder, "pc3-carol")
+        loaded.covered_until = time.time() - 60
+        merged = {record["path"]: record["label"] for record in loaded.poll()}
+        assert merged == {"a.jpg": "no label", "b.jpg": "unreadable", "c.jpg": "incomplete"}, merged
+        loaded.close()
+        print("✓ Records older than the loaded snapshot skipped")
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_own_deltas_compacted_after_snapshot():
+    """A written snapshot lets the own delta file drop old records; readers follow the rewrite"""
+    print("Testing delta compaction...")
+    folder = tempfile.mkdtemp(prefix="shared_labeling_test_")
+    try:
+        app = make_app(folder)
+        app.shared_deltas = image_label_tool.SharedLabelDeltas(folder, "pc1-alice")
+        bob = image_label_tool.SharedLabelDeltas(folder, "pc2-bob")
+        deltas = app.shared_deltas
+        with open(deltas.path, "w", encoding="utf-8") as f:
+            for i in range(50):
+                f.write(f'{{"path": "old{i}.jpg", "time": {1000.0 + i}, "label": "no label"}}\n')
+        path = app.all_image_paths[0]
+        app.set_image_fields(path, label="read failure")
+        app.save_changes()
+        assert len(bob.poll()) == 51
+
+        app.save_csv()
+        assert app.snapshot_writer.flush(timeout=5)
+        app._merge_shared_deltas()
+        with open(deltas.path, encoding="utf-8") as f:
+            remaining = f.readlines()
+        assert len(remaining) == 1 and "read failure" in remaining[0], remaining
+        print("✓ Records covered by the snapshot dropped from the own delta file")
+
+        assert bob.poll() == [], "re-reading the compacted file changes nothing"
+        app.set_image_fields(path, comment="checked")
+        app.save_changes()
+        merged = bob.poll()
+        assert merged == [{"path": "0000000001_0001_001_20240101.jpg", "comment": "checked"}], merged
+        print("✓ Other operators keep merging after the rewrite")
+
+        # A newer revision from another PC would be loaded instead: nothing is dropped
+        open(os.path.join(folder, "revision_20990101_000000.csv"), "w").close()
+        with open(deltas.path, "a", encoding="utf-8") as f:
+            f.write('{"path": "old.jpg", "time": 1000.0, "label": "no label"}\n')
+        app.save_csv()
+        assert app.snapshot_writer.flush(timeout=5)
+        app._merge_shared_deltas()
+        with open(deltas.path, encoding="utf-8") as f:
+            assert len(f.readlines()) == 3
+        print("✓ No compaction while a later revision exists")
+        app._close_label_journal()
+        deltas.close()
+        bob.close()
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_merge_latest_change_wins()
+        test_labels_flow_between_apps_and_work_is_split()
+        test_earlier_records_and_snapshot_cutoff()
+        test_own_deltas_compacted_after_snapshot()
+        print("\n🎉 SHARED LABELING TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 SHARED LABELING TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the background CSV snapshot writer (coalescing, atomic replace, retry)
+"""
+import csv
+import os
+import shutil
+import tempfile
+import threading
+import time
+import tkinter
+import image_label_tool
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+class Var:
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def make_app(folder, csv_name="revision_20240101_120000.csv"):
+    """App object without a window, with the label state __init__ sets up, for four images in folder"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.folder_path = folder
+    app.csv_filename = os.path.join(folder, csv_name)
+    app.all_image_paths = [os.path.normpath(os.path.join(folder, f"0000000001_000{i}_001_20240101.jpg"))
+                           for i in range(1, 5)]
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+class FakeLabel:
+    def config(self, **kwargs):
+        pass
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def test_burst_is_coalesced():
+    """Saves submitted while a write is in flight collapse into one follow-up write"""
+    print("Testing snapshot coalescing...")
+    folder = tempfile.mkdtemp(prefix="snapshot_writer_test_")
+    writer = image_label_tool.SnapshotWriter()
+    original_write = image_label_tool.SnapshotWriter._write
+    gate = threading.Event()
+    writes = []
+
+    def slow_write(target, rows):
+        gate.wait(5)
+        writes.append(rows[-1][0])
+        original_write(target, rows)
+
+    writer._write = slow_write
+    try:
+        target = os.path.join(folder, "revision.csv")
+        for i in range(20):
+            writer.submit(target, [["filename"], [f"version {i}"]])
+        gate.set()
+        assert writer.flush(timeout=5)
+        # The first submit may already be in flight; everything else is coalesced
+        assert writes[-1] == "version 19" and len(writes) <= 2, writes
+        assert read_rows(target) == [["filename"], ["version 19"]]
+        assert [f for f in os.listdir(folder) if f.endswith(".tmp")] == []
+        print(f"✓ 20 saves -> {len(writes)} writes, no temp files left")
+    finally:
+        writer.shutdown()
+        shutil.rmtree(folder)
+
+
+def test_locked_target_is_retried():
+    """A target that cannot be replaced keeps its old content until a retry succeeds"""
+    print("Testing retry on a locked target...")
+    folder = tempfile.mkdtemp(prefix="snapshot_writer_test_")
+    statuses = []
+    written = []
+    writer = image_label_tool.SnapshotWriter(on_status=lambda target, error: statuses.append(error),
+                                             retry_delays=(0.01, 0.02))
+    original_replace = image_label_tool.os.replace
+    failures = [3]
+
+    def locked_replace(src, dst):
+        if failures[0] > 0:
+            failures[0] -= 1
+            raise PermissionError(13, "The process cannot access the file", dst)
+        original_replace(src, dst)
+
+    image_label_tool.os.replace = locked_replace
+    try:
+        target = os.path.join(folder, "revision.csv")
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write("old\n")
+        writer.submit(target, [["new"]], on_written=lambda: written.append(True))
+        assert writer.flush(timeout=5)
+        assert read_rows(target) == [["new"]]
+        assert written == [True], "on_written only runs once the snapshot is on disk"
+        assert statuses == [], "outcomes wait for the Tk thread to drain them"
+        writer.drain_statuses()
+        assert len(statuses) == 4 and all(statuses[:3]) and statuses[-1] is None, statuses
+        assert [f for f in os.listdir(folder) if f.endswith(".tmp")] == []
+        print(f"✓ Written after 3 locked attempts: {statuses[0]}")
+    finally:
+        image_label_tool.os.replace = original_replace
+        writer.shutdown()
+        shutil.rmtree(folder)
+
+
+def test_flush_with_real_tcl_thread():
+    """The Tk thread can wait in flush() for two targets: the writer never calls into Tcl"""
+    print("Testing flush from the Tk thread...")
+    folder = tempfile.mkdtemp(prefix="snapshot_writer_test_")
+    app = make_app(folder)
+    app.root = tkinter.Tcl()  # A real (threaded) interpreter; after() from another thread would block
+    app.save_status_var, app.save_status_label = Var(), FakeLabel()
+    app._poll_snapshot_status()
+    try:
+        targets = [os.path.join(folder, name) for name in ("revision.csv", "stats.csv")]
+        for target in targets:  # As on closing: the revision CSV and the stats CSV
+            app.snapshot_writer.submit(target, [["filename"], [os.path.basename(target)]])
+        start = time.time()
+        assert app.snapshot_writer.flush(timeout=5)
+        assert time.time() - start < 2, time.time() - start
+        assert all(read_rows(target)[1] == [os.path.basename(target)] for target in targets)
+        time.sleep(image_label_tool.SNAPSHOT_STATUS_POLL_MS / 1000 + 0.1)
+        app.root.update()  # The poll shows the outcome on the Tk thread
+        assert app.save_status_var.get().startswith("💾 Saved"), app.save_status_var.get()
+        print(f"✓ Two targets flushed in {time.time() - start:.2f}s, status shown by the Tk thread")
+    finally:
+        app.root.after_cancel(app._snapshot_status_job)
+        app.snapshot_writer.shutdown()
+        shutil.rmtree(folder)
+
+
+def test_failing_callback_is_not_a_failed_write():
+    """An error in on_written is logged; the snapshot is not written again"""
+    print("Testing a failing on_written callback...")
+    folder = tempfile.mkdtemp(prefix="snapshot_writer_test_")
+    statuses = []
+    writes = []
+    writer = image_label_tool.SnapshotWriter(on_status=lambda target, error: statuses.append(error),
+                                             retry_delays=(0.01,))
+    original_write = image_label_tool.SnapshotWriter._write
+
+    def counting_write(target, rows):
+        writes.append(target)
+        original_write(target, rows)
+
+    def discard_rotated():
+        raise PermissionError(13, "The process cannot access the file", "revision.csv.journal.old")
+
+    writer._write = counting_write
+    try:
+        target = os.path.join(folder, "revision.csv")
+        writer.submit(target, [["new"]], on_written=discard_rotated)
+        assert writer.flush(timeout=5)
+        time.sleep(0.05)  # A retry would have been due by now
+        assert writer.flush(timeout=5)
+        assert writes == [target], writes
+        writer.drain_statuses()
+        assert statuses == [None], statuses
+        print("✓ Written once, reported as saved")
+    finally:
+        writer.shutdown()
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_burst_is_coalesced()
+        test_locked_target_is_retried()
+        test_flush_with_real_tcl_thread()
+        test_failing_callback_is_not_a_failed_write()
+        print("\n🎉 SNAPSHOT WRITER TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 SNAPSHOT WRITER TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the throttled statistics CSV and its single-pass computation
+"""
+import csv
+import os
+import random
+import shutil
+import tempfile
+import image_label_tool
+
+
+class FakeRoot:
+    """Records after() jobs without running them (no display needed)"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, ms, func, *args):
+        self.jobs.append(func)
+        return f"after#{len(self.jobs)}"
+
+    def after_cancel(self, job):
+        pass
+
+
+def make_app(folder, csv_name="revision_20240101_120000.csv"):
+    """App object without a window, with the label state __init__ sets up, for four images in folder"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = FakeRoot()
+    app._init_label_state()
+    app.folder_path = folder
+    app.csv_filename = os.path.join(folder, csv_name)
+    app.all_image_paths = [os.path.normpath(os.path.join(folder, f"0000000001_000{i}_001_20240101.jpg"))
+                           for i in range(1, 5)]
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+def reference_session_counts(app):
+    """Session part of the statistics as computed before (one get_session_number per pass)"""
+    session_labels_dict = app.calculate_session_labels()
+    session_counts, unique_sessions, entries = {}, set(), 0
+    for path in app.all_image_paths:
+        session_id = app.get_session_number(path)
+        if session_id:
+            unique_sessions.add(session_id)
+            entries += 1
+            label = session_labels_dict.get(session_id, "no label")
+            session_counts[label] = session_counts.get(label, 0) + 1
+    return session_counts, len(unique_sessions), entries
+
+
+def plain_dict_stats(app, stats):
+    """The statistics of the same labels in plain dicts (full scans), with stats' timestamp"""
+    scan = make_app(app.folder_path)
+    scan.all_image_paths = app.all_image_paths
+    scan.labels, scan.ocr_readable = dict(app.labels), dict(app.ocr_readable)
+    scan.false_noread, scan.comments = dict(app.false_noread), dict(app.comments)
+    scanned = scan.calculate_comprehensive_stats()
+    scanned["System_Info"]["timestamp"] = stats["System_Info"]["timestamp"]
+    return scanned
+
+
+def test_stats_match_full_rescan():
+    """The single-pass statistics equal the per-image rescans they replace"""
+    print("Testing statistics computation...")
+    app = make_app("/data")
+    rng = random.Random(7)
+    app.all_image_paths = [f"/data/{trigger:010d}_{sub:04d}_001_2024010{trigger % 3}.jpg"
+                           for trigger in range(1, 200) for sub in range(1, rng.randint(2, 7))]
+    for path in app.all_image_paths:
+        if rng.random() < 0.8:
+            app.labels[path] = rng.choice(image_label_tool.LABELS)
+            app.false_noread[path] = rng.random() < 0.3
+    stats = app.calculate_comprehensive_stats()
+    assert stats == plain_dict_stats(app, stats)
+
+    session_counts, unique_sessions, entries = reference_session_counts(app)
+    expected = {f"sessions_{label}": count for label, count in session_counts.items()}
+    actual = {metric: data["value"] for metric, data in stats["Session_Counts"].items()
+              if metric.startswith("sessions_")}
+    assert actual == expected and list(actual) == list(expected), (actual, expected)
+    assert stats["Session_Counts"]["total_unique_sessions"]["value"] == unique_sessions
+    assert stats["Session_Counts"]["total_session_entries"]["value"] == entries
+    unclassified = sum(1 for p in app.all_image_paths if app.labels.get(p, "(Unclassified)") == "(Unclassified)")
+    assert stats["Image_Counts"]["(Unclassified)"]["value"] == unclassified
+    print(f"✓ {len(app.all_image_paths)} images, {unique_sessions} sessions: identical statistics")
+
+    # Once edits are folded into the counters, no image is looked at again
+    for path in app.all_image_paths[::7]:
+        app.labels[path] = "read failure"
+    stats = app.calculate_comprehensive_stats()
+
+    def no_scan(*args):
+        raise AssertionError("statistics rescanned the images")
+
+    for name in ("_count_images", "_classify_session", "get_session_number"):
+        setattr(app, name, no_scan)
+    app._session_labels.classify = no_scan
+    app.labels.get = app.labels.__getitem__ = no_scan
+    rescanned = app.calculate_comprehensive_stats()
+    rescanned["System_Info"]["timestamp"] = stats["System_Info"]["timestamp"]
+    assert rescanned == stats
+    del app._count_images, app._classify_session, app.get_session_number, app.labels.get
+    scanned = plain_dict_stats(app, stats)
+    assert stats == scanned
+    # The CSV rows come out in the same (first occurrence) order as with the scan
+    assert list(stats["Session_Counts"]) == list(scanned["Session_Counts"]), list(stats["Session_Counts"])
+    print("✓ Statistics read from the image and session counters")
+
+
+def test_stats_csv_is_throttled():
+    """Label saves only mark the stats CSV outdated; it is written once per interval"""
+    print("Testing stats CSV throttling...")
+    folder = tempfile.mkdtemp(prefix="stats_csv_test_")
+    try:
+        app = make_app(folder)
+        computed = []
+        original = app.calculate_comprehensive_stats
+        app.calculate_comprehensive_stats = lambda: (computed.append(1), original())[1]
+
+        for path in app.all_image_paths:
+            app.set_image_fields(path, label="no label")
+            app.save_csv()
+        assert computed == [], "saving labels must not recompute statistics"
+        stats_jobs = [job for job in app.root.jobs if getattr(job, "__name__", "") == "_flush_stats_csv"]
+        assert len(stats_jobs) == 1, app.root.jobs
+
+        stats_jobs[0]()  # the interval elapsed
+        assert app.snapshot_writer.flush(timeout=5)
+        assert len(computed) == 1
+        stats_path = os.path.join(folder, "stats_20240101_120000.csv")
+        with open(stats_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["category", "metric", "value", "description"]
+        assert ["Image_Counts", "no label", "4", "Number of images classified as no label"] in rows
+        print(f"✓ {len(app.all_image_paths)} saves -> 1 stats computation, {len(rows) - 1} metrics")
+
+        # Nothing changed since: closing does not write it again
+        app._flush_stats_csv()
+        assert len(computed) == 1
+        print("✓ Unchanged statistics are not rewritten")
+    finally:
+        app._close_label_journal()
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_stats_match_full_rescan()
+        test_stats_csv_is_throttled()
+        print("\n🎉 STATS CSV TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 STATS CSV TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test script to verify viewport-only tiled rendering for 1:1 and zoomed views
+"""
+from PIL import Image
+import image_label_tool
+
+
+class FakeCanvas:
+    """Minimal stand-in for tk.Canvas that records tile items (no display needed)"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.scroll_x = 0
+        self.scroll_y = 0
+        self.items = {}
+        self.next_id = 1
+
+    def canvasx(self, x):
+        return self.scroll_x + x
+
+    def canvasy(self, y):
+        return self.scroll_y + y
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def create_image(self, x, y, anchor, image, tags=()):
+        item = self.next_id
+        self.next_id += 1
+        self.items[item] = {"pos": (x, y), "image": image, "state": "normal", "tags": tags}
+        return item
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def coords(self, item, x, y):
+        self.items[item]["pos"] = (x, y)
+
+    def delete(self, item_or_tag):
+        if item_or_tag in self.items:
+            del self.items[item_or_tag]
+        else:
+            for item in [i for i, data in self.items.items() if item_or_tag in data["tags"]]:
+                del self.items[item]
+
+    def visible_items(self):
+        return [data for data in self.items.values() if data["state"] == "normal"]
+
+
+class FakePhotoImage:
+    """Stand-in for ImageTk.PhotoImage that keeps the PIL tile it was given"""
+    created = 0
+
+    def __init__(self, img):
+        FakePhotoImage.created += 1
+        self.image = img
+
+    def width(self):
+        return self.image.width
+
+    def height(self):
+        return self.image.height
+
+    def paste(self, img):
+        assert img.size == self.image.size, "paste() needs matching geometry"
+        self.image = img
+
+
+def run_with_fake_photoimage(func):
+    """PhotoImage needs a Tk interpreter; hand back the PIL tile instead"""
+    original = image_label_tool.ImageTk.PhotoImage
+    image_label_tool.ImageTk.PhotoImage = FakePhotoImage
+    try:
+        func()
+    finally:
+        image_label_tool.ImageTk.PhotoImage = original
+
+
+def test_only_visible_tiles_are_rendered():
+    """A 500% zoom of a large image only renders the tiles covering the viewport"""
+    print("Testing viewport-only tile rendering...")
+
+    def run():
+        canvas = FakeCanvas(600, 400)
+        renderer = image_label_tool.TileRenderer(canvas, tile_size=256, cache_limit=40)
+        source = Image.new("RGB", (5000, 4000), (40, 80, 120))
+
+        renderer.set_image(source, ("a.jpg", None), 5.0, (300, 200))
+        renderer.update_visible()
+
+        # Viewport (0..600, 0..400) minus origin (300, 200) covers display x 0..300, y 0..200
+        assert len(canvas.items) == 2, f"expected 2 tiles, got {len(canvas.items)}"
+        sizes = sorted(data["image"].image.size for data in canvas.items.values())
+        assert sizes == [(256, 256), (256, 256)], sizes
+        print(f"✓ Rendered {len(canvas.items)} tiles instead of a 25000x20000 bitmap")
+
+        # Panning renders the newly exposed tiles and keeps the old ones cached
+        canvas.scroll_x = 2000
+        renderer.update_visible()
+        assert len(canvas.items) == 5, len(canvas.items)
+        print(f"✓ After pan: {len(canvas.items)} tiles cached")
+    run_with_fake_photoimage(run)
+
+
+def test_tiles_cached_per_zoom_and_bounded():
+    """Tiles of another zoom level are hidden, reused on return and evicted past the limit"""
+    print("Testing per-zoom tile cache...")
+
+    def run():
+        canvas = FakeCanvas(600, 400)
+        renderer = image_label_tool.TileRenderer(canvas, tile_size=256, cache_limit=12)
+        source = Image.new("RGB", (2000, 1500))
+
+        renderer.set_image(source, ("a.jpg", None), 1.0, (0, 0))
+        renderer.update_visible()
+        at_100 = len(canvas.items)
+
+        renderer.set_image(source, ("a.jpg", None), 2.0, (0, 0))
+        renderer.update_visible()
+        assert len(canvas.visible_items()) == at_100
+        assert len(canvas.items) == 2 * at_100, "previous zoom level should stay cached"
+
+        created_before = canvas.next_id
+        renderer.set_image(source, ("a.jpg", None), 1.0, (0, 0))
+        renderer.update_visible()
+        assert canvas.next_id == created_before, "returning to a zoom level should reuse tiles"
+        print(f"✓ {at_100} tiles per level reused when zooming back")
+
+        # Scrolling far away at the same zoom exceeds the cache limit
+        canvas.scroll_x, canvas.scroll_y = 1400, 1100
+        renderer.update_visible()
+        assert len(renderer._tiles) <= 12, len(renderer._tiles)
+        assert len(canvas.items) <= 12 + image_label_tool.TILE_POOL_LIMIT, len(canvas.items)
+        print(f"✓ Cache bounded to {len(renderer._tiles)} tiles")
+
+        # A different image clears everything
+        renderer.set_image(source, ("b.jpg", None), 1.0, (0, 0))
+        assert not canvas.items
+        print("✓ Switching images clears the tiles")
+    run_with_fake_photoimage(run)
+
+
+def test_evicted_tiles_are_reused():
+    """Panning refills pooled tiles in place instead of creating new Tk images"""
+    print("Testing tile reuse on pan...")
+
+    def run():
+        canvas = FakeCanvas(512, 512)
+        renderer = image_label_tool.TileRenderer(canvas, tile_size=256, cache_limit=9)
+        source = Image.new("RGB", (10000, 512))
+
+        renderer.set_image(source, ("a.jpg", None), 1.0, (0, 0))
+        # Warm up until the tile cache is full and tiles start being evicted
+        for step in range(0, 4):
+            canvas.scroll_x = step * 256
+            renderer.update_visible()
+        FakePhotoImage.created = 0
+        items_before = canvas.next_id
+        for step in range(4, 20):
+            canvas.scroll_x = step * 256
+            renderer.update_visible()
+
+        assert canvas.next_id == items_before, "pan should not create new canvas items"
+        assert FakePhotoImage.created == 0, FakePhotoImage.created
+        # The pasted pixels land where the tile is now shown
+        visible = [data for data in canvas.items.values() if data["state"] == "normal"]
+        assert {data["pos"][0] for data in visible} >= {19 * 256, 20 * 256}
+        print(f"✓ 16 pan steps, {len(canvas.items)} canvas items, no new PhotoImages")
+    run_with_fake_photoimage(run)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_only_visible_tiles_are_rendered()
+        test_tiles_cached_per_zoom_and_bounded()
+        test_evicted_tiles_are_reused()
+        print("\n🎉 TILE RENDERER TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 TILE RENDERER TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Test script to verify undo/redo of labeling actions
+"""
+import os
+import shutil
+import tempfile
+import image_label_tool
+
+
+class NoWindow:
+    """Stands in for the Tk root (no display needed): after() jobs are not run"""
+
+    def after(self, ms, func, *args):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+
+def make_app(folder, csv_name="revision_20240101_120000.csv"):
+    """App object without a window, with the label state __init__ sets up, for four images in folder"""
+    app = image_label_tool.ImageLabelTool.__new__(image_label_tool.ImageLabelTool)
+    app.root = NoWindow()
+    app._init_label_state()
+    app.folder_path = folder
+    app.csv_filename = os.path.join(folder, csv_name)
+    app.all_image_paths = [os.path.normpath(os.path.join(folder, f"0000000001_000{i}_001_20240101.jpg"))
+                           for i in range(1, 5)]
+    app._reset_image_records(app.all_image_paths)
+    return app
+
+
+class Var:
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def make_ui_app(folder):
+    """App with the label state of make_app() and recorded UI refreshes"""
+    app = make_app(folder)
+    app.image_paths = list(app.all_image_paths)
+    app.current_index = 0
+    app.filter_var = Var("All images")
+    app.save_status_var = Var()
+    app.shown = []
+    app.show_image = lambda: app.shown.append(app.image_paths[app.current_index])
+    for name in ("update_counts", "update_session_stats", "update_total_stats", "update_progress_display"):
+        setattr(app, name, lambda: None)
+    return app
+
+
+def test_undo_redo_actions():
+    """Undo reverts whole actions, newest first, and returns to the image they changed"""
+    print("Testing undo/redo...")
+    folder = tempfile.mkdtemp(prefix="undo_test_")
+    try:
+        app = make_ui_app(folder)
+        paths = app.all_image_paths
+
+        # Fast triage with auto-advance: three labels, then a flag on a read failure
+        app.set_image_fields(paths[0], label="no label")
+        app.save_changes()
+        app.set_image_fields(paths[1], label="read failure")
+        app.save_changes()
+        app.set_image_fields(paths[1], ocr_readable=False)  # unchanged: not an action
+        app.set_image_fields(paths[1], false_noread=True)
+        app.save_changes()
+        app.set_image_fields(paths[2], label="unreadable")
+        app.save_changes()
+        app.current_index = 3
+        assert len(app._undo_stack) == 4, list(app._undo_stack)
+
+        app.undo()
+        app.undo()
+        assert paths[2] not in app.labels or app.labels[paths[2]] == "(Unclassified)"
+        assert app.false_noread[paths[1]] is False and app.labels[paths[1]] == "read failure"
+        assert app.shown[-1] == paths[1] and app.current_index == 1, "undo shows the image it changed"
+        print(f"✓ Two undos: {app.save_status_var.get()}")
+
+        app.redo()
+        assert app.false_noread[paths[1]] is True
+        # A new action clears the redo history
+        app.set_image_fields(paths[3], label="incomplete")
+        app.save_changes()
+        app.redo()
+        assert app.save_status_var.get() == "Nothing to redo"
+        print("✓ Redo re-applies; a new action clears the redo stack")
+
+        # Undo goes through the journal like any edit
+        app._close_label_journal()
+        reloaded = make_app(folder)
+        reloaded._load_csv_file(reloaded.csv_filename)
+        for name in ("labels", "false_noread"):
+            assert {p: v for p, v in getattr(reloaded, name).items() if v not in ("(Unclassified)", False)} == \
+                {p: v for p, v in getattr(app, name).items() if v not in ("(Unclassified)", False)}, name
+        print("✓ Undone state persisted through the journal")
+    finally:
+        shutil.rmtree(folder)
+
+
+def test_comment_typing_is_one_action():
+    """A comment saved on every key press is undone in one step"""
+    print("Testing comment undo...")
+    folder = tempfile.mkdtemp(prefix="undo_test_")
+    try:
+        app = make_ui_app(folder)
+        path = app.all_image_paths[0]
+        for text in ("s", "sm", "sme", "smear"):
+            app.set_image_fields(path, comment=text)
+            app.save_changes()
+        assert len(app._undo_stack) == 1
+        app.undo()
+        assert path not in app.comments
+        app.redo()
+        assert app.comments[path] == "smear"
+        app._close_label_journal()
+        print("✓ 4 keystrokes -> 1 undo step")
+    finally:
+        shutil.rmtree(folder)
+
+
+class FakeCheckbox:
+    def config(self, **kwargs):
+        pass
+
+
+def test_relabel_false_noread_is_one_action():
+    """Relabeling a False NoRead read failure clears the flag in the same undoable action"""
+    print("Testing relabel of a False NoRead image...")
+    folder = tempfile.mkdtemp(prefix="undo_test_")
+    try:
+        app = make_ui_app(folder)
+        path = app.all_image_paths[0]
+        app.label_var, app.ocr_readable_var, app.false_noread_var = Var(), Var(False), Var(False)
+        app.false_noread_checkbox = FakeCheckbox()
+        app.scale_1to1 = False
+        app.update_current_label_status = app.update_comment_field_state = lambda: None
+
+        def show_image():
+            # The checkbox part of show_image
+            current = app.image_paths[app.current_index]
+            app.shown.append(current)
+            app.label_var.set(app.labels.get(current, "(Unclassified)"))
+            app.false_noread_var.set(app.false_noread.get(current, False))
+            app.update_false_noread_checkbox_state()
+
+        app.show_image = show_image
+        app.set_image_fields(path, label="read failure", false_noread=True)
+        app.save_changes()
+        show_image()
+        app.label_var.set("no label")
+        app.set_label_radio()
+        show_image()
+        assert app.labels[path] == "no label" and app.false_noread[path] is False
+        assert len(app._undo_stack) == 2, list(app._undo_stack)
+
+        app.undo()
+        assert app.labels[path] == "read failure" and app.false_noread[path] is True
+        assert len(app._undo_stack) == 1 and len(app._redo_stack) == 1, "showing the image added an action"
+        app.undo()
+        assert app.labels.get(path, "(Unclassified)") == "(Unclassified)" and not app.false_noread.get(path)
+        app.redo()
+        app.redo()
+        assert app.labels[path] == "no label" and app.false_noread[path] is False
+        assert app.save_status_var.get() == "↪ Redone: false_noread, label of " + image_label_tool.os.path.basename(path)
+        app._close_label_journal()
+        print("✓ Label and flag undone together, redo history kept")
+    finally:
+        shutil.rmtree(folder)
+
+
+class Stub:
+    """Accepts any method call (image caches, prefetcher of select_folder)"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def test_folder_switch_clears_history():
+    """Undo never replays the paths of the previous folder into a new one"""
+    print("Testing undo history on folder switch...")
+    folder, other = tempfile.mkdtemp(prefix="undo_test_"), tempfile.mkdtemp(prefix="undo_test_")
+    original_askdirectory = image_label_tool.filedialog.askdirectory
+    try:
+        app = make_ui_app(folder)
+        app.set_image_fields(app.all_image_paths[0], label="no label")
+        app.save_changes()
+        app.set_image_fields(app.all_image_paths[1], label="unreadable")
+        app.save_changes()
+        app.undo()
+        app.set_image_fields(app.all_image_paths[2], comment="pending")
+        assert app._undo_stack and app._redo_stack and app._pending_undo
+
+        app.prefetcher = app.pyramid_builder = app.image_cache = app.proxy_cache = Stub()
+        app.folder_path_var = Var()
+        app.root.after_idle = lambda func: None
+        app._open_label_store = app._open_shared_deltas = lambda folder: None
+        for name in ("load_csv", "auto_detect_total_groups", "apply_filter", "update_warning_message",
+                     "update_navigation_buttons", "update_log_file_button_state"):
+            setattr(app, name, lambda: None)
+        image_label_tool.filedialog.askdirectory = lambda: other
+        app.select_folder()
+        assert not app._undo_stack and not app._redo_stack and not app._pending_undo
+        app.undo()
+        app.redo()
+        assert app.save_status_var.get() == "Nothing to redo" and len(app.labels) == 0
+        print("✓ Undo/redo history cleared on folder switch")
+    finally:
+        image_label_tool.filedialog.askdirectory = original_askdirectory
+        app._close_label_journal()
+        app.snapshot_writer.flush(timeout=5)  # The stats CSV written on leaving the folder
+        shutil.rmtree(folder)
+        shutil.rmtree(other)
+
+
+if __name__ == "__main__":
+    import sys
+    try:
+        test_undo_redo_actions()
+        test_comment_typing_is_one_action()
+        test_relabel_false_noread_is_one_action()
+        test_folder_switch_clears_history()
+        print("\n🎉 UNDO TESTS PASSED!")
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n💥 UNDO TEST FAILED: {e}")
+        sys.exit(1)